@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import QPushButton, QHBoxLayout, QDialog, QListWidget, QDia
 from PyQt6.QtCore import Qt, QSettings
 import os
 import xml.etree.ElementTree as ET
+from fa_data_store import get_fa_data_store
 
 
 class ChartSubWindow(QMainWindow):
@@ -49,22 +50,13 @@ class ChartSubWindow(QMainWindow):
             self.load_data(self.current_quote, self.current_xml_file_path)  # Reload data with new selection
 
     def _get_available_time_periods(self, period_type):
-        periods = []
+        if not self.current_quote:
+            return []
         try:
-            tree = ET.parse(self.current_xml_file_path)
-            root = tree.getroot()
-            if not self.current_quote:
-                return []
-            quote = root.find(f".//quote[name='{self.current_quote}']")
-            data = quote.find(f"stat/{period_type}")
-            if data is not None:
-                fa = data.find(f"EPS")
-                if fa.tag:
-                    for elem in fa.findall("*"):
-                        periods.append(elem.tag)
+            periods = get_fa_data_store(self.current_xml_file_path).get_available_periods(self.current_quote, period_type, "EPS")
         except (FileNotFoundError, ET.ParseError):
             return []  # Handle errors gracefully
-        return sorted(list(periods), reverse=True)        
+        return sorted(periods, reverse=True)
 
     def _show_selection_dialog(self, title, items, current_selection):
         """
@@ -122,15 +114,13 @@ class ChartSubWindow(QMainWindow):
         self.current_quote = quote_name  # Store current quote and xml file path
         self.current_xml_file_path = xml_file_path
         try:
-            tree = ET.parse(xml_file_path)
-            root = tree.getroot()
-            
-            quote_element = root.find(f".//quote[name='{quote_name}']")
-            if quote_element is None:
+            # The shared store parses the file once and re-parses only when it changes on disk
+            quote_stats = get_fa_data_store(xml_file_path).get_quote_stats(quote_name)
+            if quote_stats is None:
                  print(f"Quote {quote_name} not found in XML")
                  return
             for fa, table in self.tables.items():
-                self._load_table_data(table, quote_element, fa)
+                self._load_table_data(table, quote_stats, fa)
         
         except FileNotFoundError:
             print(f"Error: XML file not found at {xml_file_path}")
@@ -145,13 +135,13 @@ class ChartSubWindow(QMainWindow):
                 table.setColumnCount(0)
                 table.setHorizontalHeaderLabels([])
 
-    def _load_table_data(self, table_widget, quote_element, fa):
-        yearly_data = quote_element.find(f"stat/yearly/{fa}")
-        quarterly_data = quote_element.find(f"stat/quarterly/{fa}")
+    def _load_table_data(self, table_widget, quote_stats, fa):
+        yearly_data = quote_stats.get("yearly", {}).get(fa)
+        quarterly_data = quote_stats.get("quarterly", {}).get(fa)
         
         yearly_values = []
         if yearly_data is not None:            
-            yearly_values = [(elem.tag, elem.text) for elem in yearly_data.findall("*") if elem.tag]
+            yearly_values = list(yearly_data.items())
             if self.selected_years:                
                 yearly_values = [(year, val) for year, val in yearly_values if year in self.selected_years]
             yearly_values.sort(key=lambda x: x[0])  # Ascending order
@@ -159,7 +149,7 @@ class ChartSubWindow(QMainWindow):
             
         quarterly_values = []
         if quarterly_data is not None:                        
-             quarterly_values = [(elem.tag, elem.text) for elem in quarterly_data.findall("*") if elem.tag]
+             quarterly_values = list(quarterly_data.items())
              if self.selected_quarters:  # Apply filter only for EPS
                  quarterly_values = [(quarter, val) for quarter, val in quarterly_values if quarter in self.selected_quarters]
              quarterly_values.sort(key=lambda x: x[0])  # Ascending order
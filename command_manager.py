@@ -1,47 +1,179 @@
 # t:\Work\xml_input_ui\command_manager.py
+import time
+from contextlib import contextmanager
+from commands import MacroCommand
+
+DEFAULT_MAX_UNDO_DEPTH = 500
+DEFAULT_MAX_UNDO_BYTES = 32 * 1024 * 1024 # Estimated, see Command.estimated_size()
+DEFAULT_MERGE_WINDOW_SECONDS = 1.0 # Edits of the same field further apart than this stay separate undo steps
 
 class CommandManager:
-    def __init__(self, editor_ref):
+    def __init__(self, editor_ref, max_depth=DEFAULT_MAX_UNDO_DEPTH, max_bytes=DEFAULT_MAX_UNDO_BYTES,
+                 merge_window=DEFAULT_MERGE_WINDOW_SECONDS):
+        """
+        Args:
+            editor_ref: The XmlReportEditor receiving callbacks (may be None).
+            max_depth: Maximum number of commands kept across undo and redo history (None for no limit).
+            max_bytes: Maximum estimated bytes retained by those commands (None for no limit).
+            merge_window: Seconds since the previous push within which an edit of the same field
+                merges into it (see Command.merge_with).
+        The oldest undo entries are evicted (and released) once either cap is exceeded.
+        """
         self.editor = editor_ref  # Reference to XmlReportEditor for callbacks
         self.undo_stack = []
         self.redo_stack = []
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self._command_sizes = {} # id(command) -> estimated size when it entered the history
+        self.retained_bytes = 0
+        self.merge_window = merge_window
+        self._merge_candidate = None # Last command pushed by execute; later edits of the same field merge into it
+        self._last_push_time = None # time.monotonic() of the last push, bounds merging to merge_window
+        self._transaction = None # MacroCommand collecting sub-commands while a transaction is open
+        self._transaction_depth = 0
+        self._deferred_callbacks = {} # key -> callable, run once when the transaction commits
+
+    def set_history_limits(self, max_depth=None, max_bytes=None):
+        """Changes the caps (None removes a limit) and evicts immediately if the history is now too large."""
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self._enforce_history_limits()
 
     def execute_command(self, command):
         command.execute()
-        self.undo_stack.append(command)
+        if self._transaction is not None:
+            # Editor callbacks are deferred until commit_transaction()
+            self._transaction.add(command)
+            return command
+        self._push_executed_command(command)
+        return command # Return for editor to handle post-execution UI if needed
+
+    def _push_executed_command(self, command):
+        top_command = self.undo_stack[-1] if self.undo_stack else None
+        now = time.monotonic()
+        within_merge_window = self._last_push_time is not None and now - self._last_push_time <= self.merge_window
+        self._last_push_time = now
+        if (top_command is not None and top_command is self._merge_candidate and within_merge_window
+                and top_command.merge_with(command)):
+            # Consecutive edit of the same field: one undo step, re-measured
+            self._forget_command_size(top_command)
+            if top_command.is_noop(): # e.g. A -> B -> A: nothing left to undo
+                self.undo_stack.pop()
+                self._merge_candidate = None
+            else:
+                self._track_command_size(top_command)
+        else:
+            self.undo_stack.append(command)
+            self._track_command_size(command)
+            self._merge_candidate = command
+        for discarded_command in self.redo_stack:
+            self._forget_command_size(discarded_command)
         self.redo_stack.clear()
+        self._enforce_history_limits()
         
         if self.editor:
             # Callbacks to editor
             self.editor._log_history(f"Executed: {command}")
+            self.editor._mark_quotes_modified(command.affected_quote_names())
             self.editor._set_dirty_flag(True)
             self.editor._update_undo_redo_actions_state()
-        return command # Return for editor to handle post-execution UI if needed
+
+    # --- Transactions ---
+    def in_transaction(self):
+        return self._transaction is not None
+
+    def begin_transaction(self, description=""):
+        """
+        Starts grouping executed commands into one MacroCommand (one undo step). Editor callbacks
+        (history log, dirty flag, undo/redo actions) and call_after_commit() callbacks run once,
+        at commit. Transactions nest; only the outermost commit records the macro.
+        """
+        if self._transaction is None:
+            self._transaction = MacroCommand(description)
+        self._transaction_depth += 1
+
+    def commit_transaction(self):
+        """Ends the current transaction level. Returns the recorded command, or None if nothing was recorded."""
+        if self._transaction is None:
+            return None
+        self._transaction_depth -= 1
+        if self._transaction_depth > 0:
+            return None
+        macro, self._transaction = self._transaction, None
+        deferred_callbacks, self._deferred_callbacks = self._deferred_callbacks, {}
+
+        recorded_command = None
+        if macro.commands:
+            # A single (possibly merged) sub-command does not need the macro wrapper
+            recorded_command = macro.commands[0] if len(macro.commands) == 1 else macro
+            self._push_executed_command(recorded_command)
+        for callback in deferred_callbacks.values():
+            callback()
+        return recorded_command
+
+    def rollback_transaction(self):
+        """Undoes every command executed in the current transaction (all nesting levels) and discards it."""
+        if self._transaction is None:
+            return
+        macro, self._transaction = self._transaction, None
+        self._transaction_depth = 0
+        self._deferred_callbacks = {}
+        macro.unexecute()
+        if self.editor:
+            self.editor._mark_quotes_modified(macro.affected_quote_names())
+            # Same UI fix-ups as an undo (e.g. clear a quote that was added inside the transaction)
+            self.editor._update_ui_after_undo(macro)
+            self.editor._update_undo_redo_actions_state()
+
+    @contextmanager
+    def transaction(self, description=""):
+        """with command_manager.transaction("Paste EPS column"): ... -- rolls back if the block raises."""
+        self.begin_transaction(description)
+        try:
+            yield
+        except BaseException:
+            self.rollback_transaction()
+            raise
+        self.commit_transaction()
+
+    def call_after_commit(self, callback, key=None):
+        """
+        Runs callback now, or once when the open transaction commits. Callbacks sharing a key
+        are coalesced, so e.g. a chart refresh requested by twenty edits happens once.
+        """
+        if self._transaction is None:
+            callback()
+            return
+        self._deferred_callbacks[key if key is not None else object()] = callback
 
     def undo(self):
-        if not self.can_undo():
+        if not self.can_undo() or self._transaction is not None:
             return None
         command = self.undo_stack.pop()
+        self._merge_candidate = None
         command.unexecute()
         self.redo_stack.append(command)
         
         if self.editor:
             # Callbacks to editor
             self.editor._log_history(f"Undone: {command}")
+            self.editor._mark_quotes_modified(command.affected_quote_names())
             self.editor._set_dirty_flag(True) # Undoing makes it dirty
             self.editor._update_undo_redo_actions_state()
         return command # Return for editor to handle post-unexecution UI
 
     def redo(self):
-        if not self.can_redo():
+        if not self.can_redo() or self._transaction is not None:
             return None
         command = self.redo_stack.pop()
+        self._merge_candidate = None
         command.execute()
         self.undo_stack.append(command)
         
         if self.editor:
             # Callbacks to editor
             self.editor._log_history(f"Redone: {command}")
+            self.editor._mark_quotes_modified(command.affected_quote_names())
             self.editor._set_dirty_flag(True) # Redoing makes it dirty
             self.editor._update_undo_redo_actions_state()
         return command # Return for editor to handle post-re-execution UI
@@ -55,5 +187,46 @@ class CommandManager:
     def clear_stacks(self):
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self._command_sizes.clear()
+        self.retained_bytes = 0
+        self._merge_candidate = None
         if self.editor: # Ensure editor ref exists (e.g. during initial setup)
-            self.editor._update_undo_redo_actions_state()
\ No newline at end of file
+            self.editor._update_undo_redo_actions_state()
+
+    def take_history(self):
+        """Detaches the undo/redo history (leaving the stacks empty) so it can be put back with restore_history()."""
+        history = (list(self.undo_stack), list(self.redo_stack))
+        self.clear_stacks()
+        return history
+
+    def restore_history(self, history):
+        """Replaces the undo/redo stacks with a history returned by take_history()."""
+        self.clear_stacks()
+        undo_commands, redo_commands = history
+        self.undo_stack.extend(undo_commands)
+        self.redo_stack.extend(redo_commands)
+        for command in self.undo_stack + self.redo_stack:
+            self._track_command_size(command)
+        if self.editor:
+            self.editor._update_undo_redo_actions_state()
+
+    def _track_command_size(self, command):
+        size = command.estimated_size()
+        self._command_sizes[id(command)] = size
+        self.retained_bytes += size
+
+    def _forget_command_size(self, command):
+        self.retained_bytes -= self._command_sizes.pop(id(command), 0)
+
+    def _history_too_large(self):
+        depth = len(self.undo_stack) + len(self.redo_stack)
+        if self.max_depth is not None and depth > self.max_depth:
+            return True
+        return self.max_bytes is not None and self.retained_bytes > self.max_bytes
+
+    def _enforce_history_limits(self):
+        # Always keep the newest undo entry: the editor may still act on the command just executed
+        while len(self.undo_stack) > 1 and self._history_too_large():
+            evicted_command = self.undo_stack.pop(0)
+            self._forget_command_size(evicted_command)
+            evicted_command.release() # Drop widget references and data snapshots
@@ -1,7 +1,30 @@
 # t:\Work\xml_input_ui\commands.py
+import sys
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from PyQt6.QtCore import QDate
 import data_utils
+from quote_model import QuoteModel, EpsYear
+
+def estimate_data_size(value, _seen=None):
+    """
+    Rough deep size in bytes of plain data (dicts and quote entry records, lists, tuples, sets, strings, numbers).
+    Anything else (widgets, the editor, QDate...) counts as 0: it is shared, not owned by a command.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        _seen.add(id(value))
+        return sys.getsizeof(value) + sum(estimate_data_size(k, _seen) + estimate_data_size(v, _seen)
+                                          for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        _seen.add(id(value))
+        return sys.getsizeof(value) + sum(estimate_data_size(item, _seen) for item in value)
+    return 0
 
 class Command(ABC):
     """Abstract base class for commands."""
@@ -16,9 +39,91 @@ class Command(ABC):
     def unexecute(self):
         pass
 
+    def affected_quote_names(self):
+        """
+        Names of the quotes whose data execute()/unexecute() change, used to track which quotes
+        need re-serializing on the next save. None means "unknown", i.e. any quote may have changed.
+        """
+        return None
+
+    def estimated_size(self):
+        """
+        Approximate bytes this command keeps alive while it sits in the undo/redo history.
+        Commands holding data snapshots override _retained_data() to include them.
+        """
+        return sys.getsizeof(self) + estimate_data_size(self._retained_data())
+
+    def _retained_data(self):
+        """The plain data owned by this command (not shared references such as all_quotes_data_ref)."""
+        return (self.description,)
+
+    def merge_with(self, other):
+        """
+        Tries to absorb other, a command executed right after this one, so both undo as one step.
+        Returns True if merged (other is then dropped); the default never merges.
+        """
+        return False
+
+    def is_noop(self):
+        """True if the command changes nothing, e.g. merged edits that ended at the original value."""
+        return False
+
+    def release(self):
+        """
+        Called when the command is evicted from history and will never run again:
+        drops widget/editor references and data snapshots, keeping only the description.
+        """
+        description = self.description
+        self.__dict__.clear()
+        self.description = description
+
     def __str__(self):
         return self.description if self.description else self.__class__.__name__
 
+class MacroCommand(Command):
+    """Groups sub-commands into a single undo step. Sub-commands run in order and undo in reverse."""
+    def __init__(self, description="", commands=None):
+        super().__init__(description)
+        self.commands = list(commands) if commands else []
+
+    def add(self, command):
+        """Appends an already-executed sub-command, merging it into the previous one when possible."""
+        if self.commands and self.commands[-1].merge_with(command):
+            if self.commands[-1].is_noop():
+                self.commands.pop()
+            return
+        self.commands.append(command)
+
+    def execute(self):
+        for command in self.commands:
+            command.execute()
+
+    def unexecute(self):
+        for command in reversed(self.commands):
+            command.unexecute()
+
+    def affected_quote_names(self):
+        quote_names = set()
+        for command in self.commands:
+            names = command.affected_quote_names()
+            if names is None:
+                return None
+            quote_names.update(names)
+        return tuple(quote_names)
+
+    def estimated_size(self):
+        return super().estimated_size() + sum(command.estimated_size() for command in self.commands)
+
+    def release(self):
+        for command in self.commands:
+            command.release()
+        super().release()
+
+    def __str__(self):
+        if self.description:
+            return self.description
+        return f"{len(self.commands)} changes"
+
 class ChangeRootDateCommand(Command):
     def __init__(self, date_edit_widget, all_quotes_data_ref, old_date_str, new_date_str, description="Change Global Date"):
         super().__init__(description)
@@ -29,6 +134,9 @@ class ChangeRootDateCommand(Command):
         self.description = f"Change Global Date from {old_date_str} to {new_date_str}"
 
 
+    def affected_quote_names(self):
+        return () # The date is written outside the quotes
+
     def execute(self):
         # Update the data model first
         if "date" in self.all_quotes_data_ref: # Assuming root date is stored at top level of all_quotes_data
@@ -49,11 +157,10 @@ class ChangeRootDateCommand(Command):
         self.date_edit_widget.blockSignals(False)
 
 class ChangeQuoteDetailCommand(Command):
-    def __init__(self, quote_details_widget, all_quotes_data_ref, quote_name_key, field_name, old_value, new_value):
+    def __init__(self, all_quotes_data_ref, quote_name_key, field_name, old_value, new_value):
         """
         Command to change a detail (name or price) of a quote.
         Args:
-            quote_details_widget: The QuoteDetailsWidget instance.
             all_quotes_data_ref: Reference to the main self.all_quotes_data.
             quote_name_key: The key of the quote in all_quotes_data_ref at the time of command creation.
                             For a name change, quote_name_key == old_value.
@@ -63,50 +170,52 @@ class ChangeQuoteDetailCommand(Command):
             new_value: The new value for the field.
         """
         super().__init__(description=f"Change {quote_name_key}'s {field_name} from '{old_value}' to '{new_value}'")
-        self.quote_details_widget = quote_details_widget
         self.all_quotes_data_ref = all_quotes_data_ref
         self.quote_name_key_at_creation = quote_name_key # The key used to find the quote initially
         self.field_name = field_name
         self.old_value = old_value
         self.new_value = new_value
     
+    def affected_quote_names(self):
+        if self.field_name == "name":
+            return (self.old_value, self.new_value)
+        return (self.quote_name_key_at_creation,)
+
+    def _retained_data(self):
+        return (self.description, self.old_value, self.new_value)
+
     def execute(self):
+        # The quote model announces the new value; the details widget observes the displayed quote
         if self.field_name == "name":
             # old_value is the original key, new_value is the new key
             if self.old_value in self.all_quotes_data_ref:
-                quote_data = self.all_quotes_data_ref.pop(self.old_value)
-                quote_data["name"] = self.new_value # Update the name field within the dict
-                self.all_quotes_data_ref[self.new_value] = quote_data
+                self.all_quotes_data_ref[self.new_value] = self.all_quotes_data_ref.pop(self.old_value)
+                QuoteModel.of(self.all_quotes_data_ref, self.new_value).set_detail("name", self.new_value) # Update the name field within the dict
             else: # Should not happen if editor logic is correct before command creation
                 print(f"Error: Quote key '{self.old_value}' not found during name change execute. Command: {self.description}")
                 return # Or raise an exception
         else: # field_name is "price"
             if self.quote_name_key_at_creation in self.all_quotes_data_ref:
-                self.all_quotes_data_ref[self.quote_name_key_at_creation][self.field_name] = self.new_value
+                QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key_at_creation).set_detail(self.field_name, self.new_value)
             else: # Should not happen
                 print(f"Error: Quote key '{self.quote_name_key_at_creation}' not found during price change execute. Command: {self.description}")
                 return # Or raise an exception
     
-        self.quote_details_widget.update_field_value(self.field_name, self.new_value, from_command=True)
-    
     def unexecute(self):
         if self.field_name == "name":
             # new_value is the current key (after execute), old_value is the key to revert to
             if self.new_value in self.all_quotes_data_ref:
-                quote_data = self.all_quotes_data_ref.pop(self.new_value)
-                quote_data["name"] = self.old_value # Revert the name field within the dict
-                self.all_quotes_data_ref[self.old_value] = quote_data
+                self.all_quotes_data_ref[self.old_value] = self.all_quotes_data_ref.pop(self.new_value)
+                QuoteModel.of(self.all_quotes_data_ref, self.old_value).set_detail("name", self.old_value) # Revert the name field within the dict
             else: # Should not happen
                 print(f"Error: Quote key '{self.new_value}' not found during name change unexecute. Command: {self.description}")
                 return # Or raise an exception
         else: # field_name is "price"
             if self.quote_name_key_at_creation in self.all_quotes_data_ref:
-                self.all_quotes_data_ref[self.quote_name_key_at_creation][self.field_name] = self.old_value
+                QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key_at_creation).set_detail(self.field_name, self.old_value)
             else: # Should not happen
                 print(f"Error: Quote key '{self.quote_name_key_at_creation}' not found during price change unexecute. Command: {self.description}")
                 return # Or raise an exception
-    
-        self.quote_details_widget.update_field_value(self.field_name, self.old_value, from_command=True)
 
 class AddQuoteCommand(Command):
     def __init__(self, all_quotes_data_ref, quote_name, quote_data_to_add, editor_ref):
@@ -116,6 +225,12 @@ class AddQuoteCommand(Command):
         self.quote_data_to_add = quote_data_to_add # This is the initial empty data structure for the quote
         self.editor_ref = editor_ref # Reference to XmlReportEditor instance, if needed for callbacks
 
+    def affected_quote_names(self):
+        return (self.quote_name,)
+
+    def _retained_data(self):
+        return (self.description, self.quote_data_to_add)
+
     def execute(self):
         self.all_quotes_data_ref[self.quote_name] = self.quote_data_to_add
         # The editor will handle displaying the new quote after command execution
@@ -133,6 +248,12 @@ class RemoveQuoteCommand(Command):
         self.removed_quote_data = removed_quote_data # Store the data for undo
         self.editor_ref = editor_ref
 
+    def affected_quote_names(self):
+        return (self.quote_name_to_remove,)
+
+    def _retained_data(self):
+        return (self.description, self.removed_quote_data)
+
     def execute(self):
         if self.quote_name_to_remove in self.all_quotes_data_ref:
             del self.all_quotes_data_ref[self.quote_name_to_remove]
@@ -143,11 +264,10 @@ class RemoveQuoteCommand(Command):
         # Editor needs to handle UI update (e.g. re-display this quote)
 
 class ChangeEPriceValueCommand(Command):
-    def __init__(self, eprice_section_widget, all_quotes_data_ref, quote_name_key, company_name, old_value, new_value):
+    def __init__(self, all_quotes_data_ref, quote_name_key, company_name, old_value, new_value):
         """
         Command to change an E-Price value for a specific company in a quote.
         Args:
-            eprice_section_widget: The EPriceSectionWidget instance.
             all_quotes_data_ref: Reference to the main self.all_quotes_data.
             quote_name_key: The name of the quote being modified.
             company_name: The name of the E-Price company.
@@ -155,47 +275,48 @@ class ChangeEPriceValueCommand(Command):
             new_value: The new E-Price value.
         """
         super().__init__(description=f"Change {quote_name_key}'s E-Price for {company_name} from '{old_value}' to '{new_value}'")
-        self.eprice_section_widget = eprice_section_widget
         self.all_quotes_data_ref = all_quotes_data_ref
         self.quote_name_key = quote_name_key
         self.company_name = company_name
         self.old_value = old_value
         self.new_value = new_value
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.old_value, self.new_value)
+
+    def merge_with(self, other):
+        if (type(other) is not type(self) or other.quote_name_key != self.quote_name_key
+                or other.company_name != self.company_name):
+            return False
+        self.new_value = other.new_value
+        self.description = f"Change {self.quote_name_key}'s E-Price for {self.company_name} from '{self.old_value}' to '{self.new_value}'"
+        return True
+
+    def is_noop(self):
+        return self.old_value == self.new_value
+
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "e_price" not in quote_data:
-                quote_data["e_price"] = []
-            
-            # Find and update the company, or add it if not present
-            found = False
-            for company_data in quote_data["e_price"]:
-                if company_data.get("name") == self.company_name:
-                    company_data["value"] = self.new_value
-                    found = True
-                    break
-            if not found: # Should not happen if UI is built from fixed list, but good for robustness
-                quote_data["e_price"].append({"name": self.company_name, "value": self.new_value})
-        
-        self.eprice_section_widget.update_company_value(self.company_name, self.new_value, from_command=True)
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            # Find and update the company, or add it if not present (should not happen if UI is built from fixed list).
+            # The E-Price widget observes the displayed quote's model, so it follows without being called here.
+            quote_model.set_entry_value("e_price", self.company_name, self.new_value)
 
     def unexecute(self):
         # Similar logic to execute, but sets old_value
-        # For simplicity, this assumes the entry always exists after execute. A more robust unexecute might remove it if old_value was empty.
-        if self.quote_name_key in self.all_quotes_data_ref and "e_price" in self.all_quotes_data_ref[self.quote_name_key]:
-            for company_data in self.all_quotes_data_ref[self.quote_name_key]["e_price"]:
-                if company_data.get("name") == self.company_name:
-                    company_data["value"] = self.old_value
-                    break
-        self.eprice_section_widget.update_company_value(self.company_name, self.old_value, from_command=True)
+        # For simplicity, the entry created by execute is kept. A more robust unexecute might remove it if old_value was empty.
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.set_entry_value("e_price", self.company_name, self.old_value)
 
 class ChangePEValueCommand(Command):
-    def __init__(self, pe_section_widget, all_quotes_data_ref, quote_name_key, company_name, old_value, new_value):
+    def __init__(self, all_quotes_data_ref, quote_name_key, company_name, old_value, new_value):
         """
         Command to change a PE value for a specific company in a quote.
         Args:
-            pe_section_widget: The PESectionWidget instance.
             all_quotes_data_ref: Reference to the main self.all_quotes_data.
             quote_name_key: The name of the quote being modified.
             company_name: The name of the PE company.
@@ -203,43 +324,43 @@ class ChangePEValueCommand(Command):
             new_value: The new PE value.
         """
         super().__init__(description=f"Change {quote_name_key}'s PE for {company_name} from '{old_value}' to '{new_value}'")
-        self.pe_section_widget = pe_section_widget
         self.all_quotes_data_ref = all_quotes_data_ref
         self.quote_name_key = quote_name_key
         self.company_name = company_name
         self.old_value = old_value
         self.new_value = new_value
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.old_value, self.new_value)
+
+    def merge_with(self, other):
+        if (type(other) is not type(self) or other.quote_name_key != self.quote_name_key
+                or other.company_name != self.company_name):
+            return False
+        self.new_value = other.new_value
+        self.description = f"Change {self.quote_name_key}'s PE for {self.company_name} from '{self.old_value}' to '{self.new_value}'"
+        return True
+
+    def is_noop(self):
+        return self.old_value == self.new_value
+
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "pe" not in quote_data: # Ensure 'pe' list exists
-                quote_data["pe"] = []
-            
-            found = False
-            for company_data in quote_data["pe"]:
-                if company_data.get("name") == self.company_name:
-                    company_data["value"] = self.new_value
-                    found = True
-                    break
-            if not found:
-                quote_data["pe"].append({"name": self.company_name, "value": self.new_value})
-        
-        self.pe_section_widget.update_company_value(self.company_name, self.new_value, from_command=True)
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.set_entry_value("pe", self.company_name, self.new_value) # Observed by the PE widget
 
     def unexecute(self):
-        if self.quote_name_key in self.all_quotes_data_ref and "pe" in self.all_quotes_data_ref[self.quote_name_key]:
-            for company_data in self.all_quotes_data_ref[self.quote_name_key]["pe"]:
-                if company_data.get("name") == self.company_name:
-                    company_data["value"] = self.old_value
-                    break
-        self.pe_section_widget.update_company_value(self.company_name, self.old_value, from_command=True)
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.set_entry_value("pe", self.company_name, self.old_value)
 
 class ChangeEPSValueCommand(Command):
-    def __init__(self, eps_section_widget, all_quotes_data_ref, quote_name_key,
+    def __init__(self, all_quotes_data_ref, quote_name_key,
                  year_name, company_name, field_name, old_value, new_value):
         super().__init__(description=f"Change {quote_name_key}'s EPS {year_name} for {company_name} {field_name} from '{old_value}' to '{new_value}'")
-        self.eps_section_widget = eps_section_widget
         self.all_quotes_data_ref = all_quotes_data_ref
         self.quote_name_key = quote_name_key
         self.year_name = year_name
@@ -248,46 +369,34 @@ class ChangeEPSValueCommand(Command):
         self.old_value = old_value
         self.new_value = new_value
 
-    def _find_eps_company_data(self, quote_data):
-        if "eps" not in quote_data:
-            quote_data["eps"] = []
-            
-        for year_data_entry in quote_data["eps"]:
-            if year_data_entry.get("name") == self.year_name:
-                if "companies" not in year_data_entry:
-                    year_data_entry["companies"] = []
-                for company_data_entry in year_data_entry["companies"]:
-                    if company_data_entry.get("name") == self.company_name:
-                        return company_data_entry
-                # Company not found in this year, create it
-                new_comp_data = {"name": self.company_name, "value": "", "growth": ""}
-                year_data_entry["companies"].append(new_comp_data)
-                return new_comp_data
-        # Year not found, create year and company structure
-        new_comp_data_for_year = {"name": self.company_name, "value": "", "growth": ""}
-        new_year_data = {"name": self.year_name, "companies": [new_comp_data_for_year]}
-        quote_data["eps"].append(new_year_data)
-        return new_comp_data_for_year
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.old_value, self.new_value)
+
+    def merge_with(self, other):
+        if (type(other) is not type(self) or other.quote_name_key != self.quote_name_key
+                or other.year_name != self.year_name or other.company_name != self.company_name
+                or other.field_name != self.field_name):
+            return False
+        self.new_value = other.new_value
+        self.description = f"Change {self.quote_name_key}'s EPS {self.year_name} for {self.company_name} {self.field_name} from '{self.old_value}' to '{self.new_value}'"
+        return True
+
+    def is_noop(self):
+        return self.old_value == self.new_value
 
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            company_eps_data = self._find_eps_company_data(quote_data)
-            company_eps_data[self.field_name] = self.new_value
-        
-        self.eps_section_widget.update_company_eps_field(
-            self.year_name, self.company_name, self.field_name, self.new_value, from_command=True
-        )
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            # Creates the year and/or company entry if missing; the EPS widget observes the displayed quote's model
+            quote_model.set_eps_field(self.year_name, self.company_name, self.field_name, self.new_value)
 
     def unexecute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            company_eps_data = self._find_eps_company_data(quote_data) 
-            company_eps_data[self.field_name] = self.old_value
-        
-        self.eps_section_widget.update_company_eps_field(
-            self.year_name, self.company_name, self.field_name, self.old_value, from_command=True
-        )
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.set_eps_field(self.year_name, self.company_name, self.field_name, self.old_value)
 
 class AddEPSYearCommand(Command):
     def __init__(self, eps_section_widget, all_quotes_data_ref, quote_name_key, year_name_to_add, initial_companies_data=None):
@@ -300,32 +409,30 @@ class AddEPSYearCommand(Command):
         # If None, it's a fresh add, and _add_eps_year_fields will populate with fixed companies.
         self.initial_companies_data = initial_companies_data if initial_companies_data is not None else []
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.initial_companies_data)
+
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "eps" not in quote_data:
-                quote_data["eps"] = []
-            
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
             # Check if year already exists in data model to prevent duplicates from rapid commands
-            if not any(y.get("name") == self.year_name_to_add for y in quote_data["eps"]):
-                new_year_data_model = {"name": self.year_name_to_add, "companies": list(self.initial_companies_data)}
-                quote_data["eps"].append(new_year_data_model)
+            if quote_model.find_eps_year(self.year_name_to_add) is None:
+                new_year_data_model = EpsYear(self.year_name_to_add, list(self.initial_companies_data))
                 # Sort EPS years in data model (optional, but good for consistency)
-                quote_data["eps"].sort(key=lambda y: self.eps_section_widget._get_eps_year_sort_key(y.get("name", "")))
+                quote_model.add_eps_year(new_year_data_model, self.eps_section_widget._get_eps_year_sort_key)
 
         # UI update
         self.eps_section_widget._add_eps_year_fields(self.year_name_to_add, self.initial_companies_data)
         # _add_eps_year_fields calls _update_visible_eps_years internally
 
     def unexecute(self):
-        removed_year_data_for_redo = None
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "eps" in quote_data:
-                year_to_remove_model = next((y for y in quote_data["eps"] if y.get("name") == self.year_name_to_add), None)
-                if year_to_remove_model:
-                    removed_year_data_for_redo = year_to_remove_model # Save for potential redo
-                    quote_data["eps"].remove(year_to_remove_model)
+        removed_year_data_for_redo = None # Saved for potential redo
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            removed_year_data_for_redo = quote_model.remove_eps_year(self.year_name_to_add)
         
         # UI update
         year_entry_ui_data = next((entry for entry in self.eps_section_widget.eps_year_entries if entry["year_name"] == self.year_name_to_add), None)
@@ -347,13 +454,16 @@ class RemoveEPSYearCommand(Command):
         self.year_name_to_remove = year_name_to_remove
         self.removed_year_data_model = removed_year_data_model # e.g., {"name": "2024", "companies": [...]}
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.removed_year_data_model)
+
     def execute(self): # Same logic as AddEPSYearCommand.unexecute
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "eps" in quote_data:
-                year_to_remove_model = next((y for y in quote_data["eps"] if y.get("name") == self.year_name_to_remove), None)
-                if year_to_remove_model:
-                    quote_data["eps"].remove(year_to_remove_model)
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.remove_eps_year(self.year_name_to_remove)
         
         year_entry_ui_data = next((entry for entry in self.eps_section_widget.eps_year_entries if entry["year_name"] == self.year_name_to_remove), None)
         if year_entry_ui_data:
@@ -361,14 +471,9 @@ class RemoveEPSYearCommand(Command):
             self.eps_section_widget._update_visible_eps_years()
 
     def unexecute(self): # Same logic as AddEPSYearCommand.execute
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "eps" not in quote_data:
-                quote_data["eps"] = []
-            
-            if not any(y.get("name") == self.year_name_to_remove for y in quote_data["eps"]):
-                quote_data["eps"].append(self.removed_year_data_model)
-                quote_data["eps"].sort(key=lambda y: self.eps_section_widget._get_eps_year_sort_key(y.get("name", "")))
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None and quote_model.find_eps_year(self.year_name_to_remove) is None:
+            quote_model.add_eps_year(self.removed_year_data_model, self.eps_section_widget._get_eps_year_sort_key)
 
         self.eps_section_widget._add_eps_year_fields(self.year_name_to_remove, self.removed_year_data_model.get("companies", []))
 
@@ -384,36 +489,34 @@ class AddRecordReportCommand(Command):
         self.insert_at_index = insert_at_index # For UI consistency, data model will be sorted
         self.created_ui_entry_data = None # Will store the dict returned by add_report_entry
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.report_data_to_add)
+
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "record" not in quote_data:
-                quote_data["record"] = []
-            quote_data["record"].append(self.report_data_to_add)
-            # The main editor's _display_quote or load_data in widget will handle sorting for display
-
-        # After adding to model, reload the widget's data
-        if self.quote_name_key in self.all_quotes_data_ref and "record" in self.all_quotes_data_ref[self.quote_name_key]:
-            self.record_widget.load_data(self.all_quotes_data_ref[self.quote_name_key]["record"])
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.append_record(self.report_data_to_add)
+            # The widget places the new report in its date-sorted view, binding only its box
+            self.record_widget.insert_report(quote_model["record"], self.report_data_to_add)
         else:
             self.record_widget.clear_data() # Should not happen if quote exists
-        self.created_ui_entry_data = None # UI entry is managed by load_data now
+        self.created_ui_entry_data = None # UI entry is managed by the widget
 
         # Update description now that we have more details
         self.description = f"Add Record Report ({self.report_data_to_add.get('company', '')} on {self.report_data_to_add.get('date', '')}) to '{self.quote_name_key}'"
 
     def unexecute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            current_quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "record" in current_quote_data and self.report_data_to_add in current_quote_data["record"]:
-                current_quote_data["record"].remove(self.report_data_to_add)
-        
-        # After removing from model, reload the widget's data to reflect changes and potentially show older reports
-        if self.quote_name_key in self.all_quotes_data_ref and "record" in self.all_quotes_data_ref[self.quote_name_key]:
-            self.record_widget.load_data(self.all_quotes_data_ref[self.quote_name_key]["record"])
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.remove_record(self.report_data_to_add)
+            # Releases only the removed report's box; an older report may move up onto the page
+            self.record_widget.remove_report(quote_model.get("record", []), self.report_data_to_add)
         else:
             self.record_widget.clear_data() # Should not happen if quote exists
-        self.created_ui_entry_data = None # UI entry is managed by load_data now
+        self.created_ui_entry_data = None # UI entry is managed by the widget
 
 
 class RemoveRecordReportCommand(Command):
@@ -427,42 +530,34 @@ class RemoveRecordReportCommand(Command):
         self.ui_entry_data_to_remove = ui_entry_data_to_remove # The dict from record_widget.report_entries
         self.original_data_model_index = original_data_model_index # Index in all_quotes_data["record"]
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.report_data_model_to_remove)
+
     def execute(self):
         # Remove from data model
-        current_quote_data = None
-        if self.quote_name_key in self.all_quotes_data_ref:
-            current_quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "record" in current_quote_data and self.report_data_model_to_remove in current_quote_data["record"]:
-                current_quote_data["record"].remove(self.report_data_model_to_remove)
-        
-        # After removing from model, reload the widget's data to reflect changes and potentially show older reports
-        if current_quote_data and "record" in current_quote_data:
-            self.record_widget.load_data(current_quote_data["record"])
+        current_quote_data = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if current_quote_data is not None:
+            current_quote_data.remove_record(self.report_data_model_to_remove)
+            # Releases only the removed report's box; an older report may move up onto the page
+            self.record_widget.remove_report(current_quote_data.get("record", []), self.report_data_model_to_remove)
         else: # Should not happen if quote_data was valid
             self.record_widget.clear_data()
 
     def unexecute(self):
         # Re-add to data model at original index
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            if "record" not in quote_data:
-                quote_data["record"] = []
-            
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
             # Insert at original index if possible, otherwise append
-            if 0 <= self.original_data_model_index <= len(quote_data["record"]):
-                quote_data["record"].insert(self.original_data_model_index, self.report_data_model_to_remove)
-            else:
-                quote_data["record"].append(self.report_data_model_to_remove)
-            # The editor's _display_quote or load_data in widget will handle sorting for display if needed
-        
-        # After re-adding to model, reload the widget's data
-        if self.quote_name_key in self.all_quotes_data_ref and "record" in self.all_quotes_data_ref[self.quote_name_key]:
-            self.record_widget.load_data(self.all_quotes_data_ref[self.quote_name_key]["record"])
+            quote_model.insert_record(self.original_data_model_index, self.report_data_model_to_remove)
+            # The widget puts the report back at its date-sorted place, binding only its box
+            self.record_widget.insert_report(quote_model["record"], self.report_data_model_to_remove)
         else:
             self.record_widget.clear_data() # Should not happen if quote exists
-        # self.ui_entry_data_to_remove is not directly used here as load_data rebuilds UI entries.
-        # If ChangeRecordReportDetailCommand needed to identify this specific instance later for an undo/redo chain,
-        # it would need a more robust way to track it than this command's instance variable.
+        # self.ui_entry_data_to_remove is not reused: the restored report gets a fresh entry_data.
+        # Entries of the other shown reports are kept, so commands holding them stay valid.
 
 
 class ChangeRecordReportDetailCommand(Command):
@@ -472,7 +567,7 @@ class ChangeRecordReportDetailCommand(Command):
                  field_name, old_value, new_value):
         super().__init__(description=f"Change Record Report {field_name} for '{quote_name_key}' from '{old_value}' to '{new_value}'")
         self.record_widget = record_widget
-        self.all_quotes_data_ref = all_quotes_data_ref # Not strictly needed if report_data_model_ref is used
+        self.all_quotes_data_ref = all_quotes_data_ref # For the quote model's record index
         self.quote_name_key = quote_name_key
         self.report_data_model_ref = report_data_model_ref # The actual dict in the data model
         self.ui_entry_data_ref = ui_entry_data_ref         # The actual dict for the UI entry
@@ -480,15 +575,29 @@ class ChangeRecordReportDetailCommand(Command):
         self.old_value = old_value
         self.new_value = new_value
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.old_value, self.new_value)
+
+    def _set_model_field(self, value):
+        # Through the quote model, so a changed company/date re-keys the record index
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            quote_model.set_record_field(self.report_data_model_ref, self.field_name, value)
+        else:
+            self.report_data_model_ref[self.field_name] = value
+
     def execute(self):
         # Update data model
-        self.report_data_model_ref[self.field_name] = self.new_value
+        self._set_model_field(self.new_value)
         # Update UI
         self.record_widget.update_report_entry_detail(self.ui_entry_data_ref, self.field_name, self.new_value, from_command=True)
 
     def unexecute(self):
         # Update data model
-        self.report_data_model_ref[self.field_name] = self.old_value
+        self._set_model_field(self.old_value)
         # Update UI
         self.record_widget.update_report_entry_detail(self.ui_entry_data_ref, self.field_name, self.old_value, from_command=True)
 
@@ -499,6 +608,12 @@ class ChangeEPSYearDisplayCommand(Command):
         self.old_selected_years = list(old_selected_years) # Store copies
         self.new_selected_years = list(new_selected_years) # Store copies
 
+    def affected_quote_names(self):
+        return () # Display selection only
+
+    def _retained_data(self):
+        return (self.description, self.old_selected_years, self.new_selected_years)
+
     def execute(self):
         self.eps_section_widget.selected_eps_years_to_display = list(self.new_selected_years)
         self.eps_section_widget._update_visible_eps_years()
@@ -515,6 +630,12 @@ class ChangeEPSCompaniesForYearDisplayCommand(Command):
         self.old_selected_companies = list(old_selected_companies) # Store copies
         self.new_selected_companies = list(new_selected_companies) # Store copies
 
+    def affected_quote_names(self):
+        return () # Display selection only
+
+    def _retained_data(self):
+        return (self.description, self.old_selected_companies, self.new_selected_companies)
+
     def execute(self):
         year_entry = next((entry for entry in self.eps_section_widget.eps_year_entries if entry["year_name"] == self.year_name), None)
         if year_entry:
@@ -543,6 +664,12 @@ class ChangeEPriceFixedCompaniesCommand(Command):
         self.old_fixed_companies = list(old_fixed_companies) # Store copies
         self.new_fixed_companies = list(new_fixed_companies) # Store copies
 
+    def affected_quote_names(self):
+        return () # Only the fixed company list and the section widgets change, no quote data
+
+    def _retained_data(self):
+        return (self.description, self.old_fixed_companies, self.new_fixed_companies)
+
     def execute(self):
         if self.editor_ref:
             # Update the editor's list
@@ -573,32 +700,32 @@ class ChangeSectorsCommand(Command):
         self.old_value = old_value
         self.new_value = new_value
 
-    def _find_sector_data(self, quote_data):
-        if "sectors" not in quote_data:
-            quote_data["sectors"] = []
+    def _find_sector_data(self, quote_model, sector_name):
+        return quote_model.ensure_entry("sectors", sector_name, type="main") # Default sector type
+
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
 
-        for sector_data in quote_data["sectors"]:
-            if sector_data.get("name") == self.sector_name:
-                return sector_data
-        new_sector_data = {"name": self.sector_name, "type": "main"} # Default sector type
-        quote_data["sectors"].append(new_sector_data)
-        return new_sector_data
+    def _retained_data(self):
+        return (self.description, self.old_value, self.new_value)
 
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            sector_data = self._find_sector_data(quote_data) # Ensure sector entry exists in data model.
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            sector_data = self._find_sector_data(quote_model, self.sector_name) # Ensure sector entry exists in data model.
             if self.field == "name" and not self.new_value: # Don't store an empty sector name
                 return
-            sector_data[self.field] = self.new_value
+            quote_model.set_entry_field("sectors", sector_data, self.field, self.new_value)
         if self.field == "name": self.sectors_section_widget.update_sector_name_in_ui(self.sector_name, self.new_value)
         self.sectors_section_widget.update_sector_value(self.sector_name, self.field, self.new_value, from_command=True)
 
     def unexecute(self):
-        if self.quote_name_key in self.all_quotes_data_ref:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            sector_data = self._find_sector_data(quote_data) # Use find, as execute might add it
-            sector_data[self.field] = self.old_value
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None:
+            # After a rename the entry is found under its new name
+            current_name = self.new_value if self.field == "name" and self.new_value else self.sector_name
+            sector_data = self._find_sector_data(quote_model, current_name) # Use find, as execute might add it
+            quote_model.set_entry_field("sectors", sector_data, self.field, self.old_value)
         self.sectors_section_widget.update_sector_value(self.sector_name, self.field, self.old_value, from_command=True)
 
 
@@ -611,18 +738,23 @@ class RemoveSectorCommand(Command):
         self.sector_name = sector_name
         self.removed_sector_data = None
 
+    def affected_quote_names(self):
+        return (self.quote_name_key,)
+
+    def _retained_data(self):
+        return (self.description, self.removed_sector_data)
+
     def execute(self):
-        if self.quote_name_key in self.all_quotes_data_ref and "sectors" in self.all_quotes_data_ref[self.quote_name_key]:
-            quote_data = self.all_quotes_data_ref[self.quote_name_key]
-            for i, sector_data in enumerate(quote_data["sectors"]):
-                if sector_data.get("name") == self.sector_name:
-                    self.removed_sector_data = quote_data["sectors"].pop(i)
-                    break
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        removed_sector_data = quote_model.remove_entry("sectors", self.sector_name) if quote_model is not None else None
+        if removed_sector_data is not None:
+            self.removed_sector_data = removed_sector_data
         self.sectors_section_widget._remove_sector_ui(self.sector_name)
 
     def unexecute(self):
-        if self.quote_name_key in self.all_quotes_data_ref and self.removed_sector_data:
-            self.all_quotes_data_ref[self.quote_name_key].setdefault("sectors", []).append(self.removed_sector_data)
+        quote_model = QuoteModel.of(self.all_quotes_data_ref, self.quote_name_key)
+        if quote_model is not None and self.removed_sector_data:
+            quote_model.append_entry("sectors", self.removed_sector_data)
         self.sectors_section_widget._create_sector_ui(self.sector_name, self.removed_sector_data.get("type", "main"))
 
 class ChangeSectorsListCommand(Command):
@@ -632,6 +764,12 @@ class ChangeSectorsListCommand(Command):
         self.old_sectors_list = list(old_sectors_list) # Create a copy
         self.new_sectors_list = list(new_sectors_list) # Create a copy
 
+    def affected_quote_names(self):
+        return () # Changes the sectors config, not any quote's sectors
+
+    def _retained_data(self):
+        return (self.description, self.old_sectors_list, self.new_sectors_list)
+
     def execute(self):
         if self.editor_ref:
             self.editor_ref.SECTOR_LIST = self.new_sectors_list # Update sector list
@@ -7,13 +7,23 @@ class HighlightableGroupBox(QGroupBox):
         super().__init__(title, parent)
         self.company_name = company_name
         self.setProperty("highlighted", False) # Initialize property
+        self._style_stale = False # Highlight changed while hidden; repolished when shown
 
     def setHighlightedState(self, highlight):
         if self.property("highlighted") != highlight:
             self.setProperty("highlighted", highlight)
+            if self.isVisible():
+                self._refresh_style()
+            else:
+                self._style_stale = True
+
+    def showEvent(self, event):
+        if self._style_stale:
             self._refresh_style()
+        super().showEvent(event)
 
     def _refresh_style(self):
+        self._style_stale = False
         self.style().unpolish(self)
         self.style().polish(self)
         self.update()
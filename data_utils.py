@@ -1,12 +1,17 @@
 # t:\Work\xml_input_ui\data_utils.py
 import os
+import secrets
+import shutil
+import tempfile
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import QMessageBox # For error messages directly from utils
+import snapshot_cache
+from quote_model import QuoteModel, CompanyValue, EpsYear, EpsCompany, Report, Sector
 
 EPRICE_CONFIG_FILE = "eprice_companies.cfg"
 SECTORS_CONFIG_FILE = "sectors_list.cfg"
+REPORT_SNAPSHOT_KIND = "report_events"
 
 def get_default_working_date():
     """Returns the current date, or the preceding Friday if today is a weekend."""
@@ -84,76 +89,178 @@ def parse_xml_data(file_path):
     quotes_el = root.find("quotes")
     if quotes_el is not None:
         for quote_el in quotes_el.findall("quote"):
-            quote_name = quote_el.findtext("name", default="")
+            current_quote_data_entry = _quote_element_to_dict(quote_el)
+            quote_name = current_quote_data_entry["name"]
             if not quote_name:
                 QMessageBox.warning(None, "XML Warning", "Found a quote without a name. Skipping.")
                 continue
-            
-            current_quote_data_entry = {
-                "name": quote_name,
-                "price": quote_el.findtext("price", default=""), "sectors": [],
-                "e_price": [], "eps": [], "pe": [], "record": []
-            }
-            
-            eprice_parent_el = quote_el.find("e_price")
-            if eprice_parent_el is not None:
-                for company_el in eprice_parent_el.findall("company"):
-                    current_quote_data_entry["e_price"].append({
-                        "name": company_el.findtext("name", default=""),
-                        "value": company_el.findtext("value", default="")
-                    })
-            
-            eps_parent_el = quote_el.find("eps")
-            if eps_parent_el is not None:
-                for year_el in eps_parent_el.findall("year"):
-                    year_eps_data = {
-                        "name": year_el.findtext("name", default=""),
-                        "companies": []
-                    }
-                    for company_sub_el in year_el.findall("company"):
-                        year_eps_data["companies"].append({
-                            "name": company_sub_el.findtext("name", default=""),
-                            "value": company_sub_el.findtext("value", default=""),
-                            "growth": company_sub_el.findtext("growth", default="")
-                        })
-                    current_quote_data_entry["eps"].append(year_eps_data)
-
-            pe_parent_el = quote_el.find("pe")
-            if pe_parent_el is not None:
-                for company_el in pe_parent_el.findall("company"):
-                    current_quote_data_entry["pe"].append({
-                        "name": company_el.findtext("name", default=""),
-                        "value": company_el.findtext("value", default="")
-                    })
-            
-            record_parent_el = quote_el.find("record")
-            if record_parent_el is not None:
-                for report_el in record_parent_el.findall("report"):
-                    current_quote_data_entry["record"].append({
-                        "company": report_el.findtext("company", default=""),
-                        "date": report_el.findtext("date", default=""),
-                        "color": report_el.findtext("color", default="") # Read color
-                    })
-                    
-            sectors_parent_el = quote_el.find("sectors")
-            if sectors_parent_el is not None:
-                for sector_el in sectors_parent_el.findall("sector"):
-                    current_quote_data_entry["sectors"].append({
-                        "name": sector_el.findtext("name", default=""),
-                        "type": sector_el.findtext("type", default="main")  # Default to 'main'
-                    })
-            # Update all_quotes_data_dict with the current quote's data
             # If a quote name appears multiple times, the last one will take precedence
-            if quote_name not in all_quotes_data_dict:
-                all_quotes_data_dict[quote_name] = {}
-            all_quotes_data_dict[quote_name].update(current_quote_data_entry)
-            if "sectors" not in all_quotes_data_dict[quote_name]: # Ensure a "sectors" entry
-                all_quotes_data_dict[quote_name]["sectors"] = [] # Initialize to an empty list
-
             all_quotes_data_dict[quote_name] = current_quote_data_entry
             
     return file_path, root_date_qdate, all_quotes_data_dict
 
+def iter_xml_quotes(source):
+    """
+    Streams a report file with ET.iterparse instead of building the whole DOM.
+    Args:
+        source: A file path or a binary file object.
+    Yields:
+        ("date", QDate) once the root <date> element closes (only if it holds a valid date),
+        then ("quote", quote_dict) as soon as each </quote> closes. Quotes without a name are
+        yielded as well; the consumer decides how to report them.
+    Raises:
+        FileNotFoundError, ET.ParseError: Propagated from iterparse.
+    """
+    depth = 0
+    quotes_el = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 2 and elem.tag == "quotes":
+                quotes_el = elem
+            continue
+        depth -= 1
+        if depth == 1 and elem.tag == "date": # Only the root date, not <report><date>
+            if elem.text:
+                parsed_date = QDate.fromString(elem.text, "MM/dd/yyyy")
+                if parsed_date.isValid():
+                    yield "date", parsed_date
+        elif depth == 2 and elem.tag == "quote" and quotes_el is not None:
+            quote_dict = _quote_element_to_dict(elem)
+            # Drop the finished subtree so peak memory stays at one quote
+            elem.clear()
+            quotes_el.remove(elem)
+            yield "quote", quote_dict
+
+def iter_cached_xml_quotes(file_path, source=None, progress_callback=None):
+    """
+    Same events as iter_xml_quotes, but replayed from the binary sidecar snapshot when the file
+    is unchanged since it was last read. On a miss the XML is streamed and each event is appended
+    to a new snapshot, which replaces the old one only if iteration runs to the end. Neither path
+    holds more than one event in memory.
+    Args:
+        file_path: Path of the report file (identifies the snapshot).
+        source: Optional already-open binary file object for file_path to parse from.
+        progress_callback: Optional callable(consumed, total) invoked before each event is yielded,
+            with the position in whichever file the events currently come from: the snapshot
+            while replaying, source while parsing (only if source is given).
+    """
+    replayed_count = 0
+    cached_events = snapshot_cache.load_snapshot_records(file_path, REPORT_SNAPSHOT_KIND)
+    try:
+        while cached_events is not None:
+            try:
+                event = next(cached_events)
+            except StopIteration:
+                return
+            except Exception as e: # Truncated or corrupt sidecar: parse the XML, skipping what was replayed
+                print(f"Warning: Ignoring unreadable snapshot for '{file_path}': {e}")
+                break
+            if progress_callback is not None:
+                progress_callback(cached_events.position(), cached_events.size)
+            yield event
+            replayed_count += 1
+    finally:
+        if cached_events is not None:
+            cached_events.close()
+    source_size = (os.fstat(source.fileno()).st_size or 1) if source is not None else None
+    file_key = snapshot_cache.file_key(file_path)
+    snapshot_writer = snapshot_cache.SnapshotRecordWriter(file_path, REPORT_SNAPSHOT_KIND, file_key)
+    try:
+        for event_index, event in enumerate(iter_xml_quotes(source if source is not None else file_path)):
+            # Written before yielding: the consumer owns (and may edit) the quote dict afterwards
+            snapshot_writer.write(event)
+            if event_index >= replayed_count:
+                if progress_callback is not None and source is not None:
+                    progress_callback(source.tell(), source_size)
+                yield event
+        snapshot_writer.commit()
+    finally:
+        snapshot_writer.discard() # No-op after a commit; drops the temp file if iteration stopped early
+
+def iterparse_xml_data(file_path):
+    """
+    Streaming counterpart of parse_xml_data built on iter_xml_quotes.
+    Returns the same (file_path, root_date_qdate, all_quotes_data_dict) tuple,
+    or (None, None, None) on error.
+    """
+    root_date_qdate = get_default_working_date()
+    all_quotes_data_dict = {}
+    try:
+        for kind, payload in iter_cached_xml_quotes(file_path):
+            if kind == "date":
+                root_date_qdate = payload
+                continue
+            quote_name = payload["name"]
+            if not quote_name:
+                QMessageBox.warning(None, "XML Warning", "Found a quote without a name. Skipping.")
+                continue
+            all_quotes_data_dict[quote_name] = payload # Last duplicate wins, as in parse_xml_data
+    except FileNotFoundError:
+        QMessageBox.critical(None, "Error", f"File not found: {file_path}")
+        return None, None, None
+    except ET.ParseError as e:
+        QMessageBox.critical(None, "Error", f"Error parsing XML file: {file_path}\n{e}")
+        return None, None, None
+    return file_path, root_date_qdate, all_quotes_data_dict
+
+def _quote_element_to_dict(quote_el):
+    """
+    Converts a <quote> element into the QuoteModel used by the editor. Its entries are the compact
+    record types from quote_model (read and written like the dicts they replace).
+    """
+    current_quote_data_entry = QuoteModel({
+        "name": quote_el.findtext("name", default=""),
+        "price": quote_el.findtext("price", default=""), "sectors": [],
+        "e_price": [], "eps": [], "pe": [], "record": []
+    })
+
+    eprice_parent_el = quote_el.find("e_price")
+    if eprice_parent_el is not None:
+        for company_el in eprice_parent_el.findall("company"):
+            current_quote_data_entry["e_price"].append(CompanyValue(
+                company_el.findtext("name", default=""),
+                company_el.findtext("value", default="")
+            ))
+
+    eps_parent_el = quote_el.find("eps")
+    if eps_parent_el is not None:
+        for year_el in eps_parent_el.findall("year"):
+            year_eps_data = EpsYear(year_el.findtext("name", default=""))
+            for company_sub_el in year_el.findall("company"):
+                year_eps_data.companies.append(EpsCompany(
+                    company_sub_el.findtext("name", default=""),
+                    company_sub_el.findtext("value", default=""),
+                    company_sub_el.findtext("growth", default="")
+                ))
+            current_quote_data_entry["eps"].append(year_eps_data)
+
+    pe_parent_el = quote_el.find("pe")
+    if pe_parent_el is not None:
+        for company_el in pe_parent_el.findall("company"):
+            current_quote_data_entry["pe"].append(CompanyValue(
+                company_el.findtext("name", default=""),
+                company_el.findtext("value", default="")
+            ))
+
+    record_parent_el = quote_el.find("record")
+    if record_parent_el is not None:
+        for report_el in record_parent_el.findall("report"):
+            current_quote_data_entry["record"].append(Report(
+                report_el.findtext("company", default=""),
+                report_el.findtext("date", default=""),
+                report_el.findtext("color", default="") # Read color
+            ))
+
+    sectors_parent_el = quote_el.find("sectors")
+    if sectors_parent_el is not None:
+        for sector_el in sectors_parent_el.findall("sector"):
+            current_quote_data_entry["sectors"].append(Sector(
+                sector_el.findtext("name", default=""),
+                sector_el.findtext("type", default="main")  # Default to 'main'
+            ))
+    return current_quote_data_entry
+
 def build_xml_tree(data_for_xml):
     """Generates an XML ElementTree from the collected data."""
     root_el = ET.Element("root")
@@ -161,45 +268,52 @@ def build_xml_tree(data_for_xml):
     quotes_el = ET.SubElement(root_el, "quotes")
 
     for quote_data in data_for_xml.get("quotes", []):
-        if not quote_data.get("name"): 
-            continue
-        quote_el = ET.SubElement(quotes_el, "quote")
-        ET.SubElement(quote_el, "name").text = quote_data.get("name", "")
-        ET.SubElement(quote_el, "price").text = quote_data.get("price", "")
-
-        eprice_data_list = quote_data.get("e_price", [])
-        if eprice_data_list:
-            eprice_el_parent = ET.SubElement(quote_el, "e_price")
-            for company_data in eprice_data_list:
-                company_el = ET.SubElement(eprice_el_parent, "company")
-                ET.SubElement(company_el, "name").text = company_data.get("name", "")
-                ET.SubElement(company_el, "value").text = company_data.get("value", "")
-        
-        eps_data_list = quote_data.get("eps", [])
-        if eps_data_list:
-            eps_el_parent = ET.SubElement(quote_el, "eps")
-            for year_data in eps_data_list:
-                _add_eps_year_element(eps_el_parent, year_data)
-
-        pe_data_list = quote_data.get("pe", [])
-        if pe_data_list:
-            pe_el_parent = ET.SubElement(quote_el, "pe")
-            for company_data in pe_data_list:
-                _add_company_element(pe_el_parent, company_data)
-
-        record_data_list = quote_data.get("record", [])
-        if record_data_list:
-            record_el_parent = ET.SubElement(quote_el, "record")
-            for report_data in record_data_list:
-                _add_report_element(record_el_parent, report_data)
-
-        # Add Sectors data
-        sectors_data_list = quote_data.get("sectors", [])
-        if sectors_data_list:
-            sectors_el_parent = ET.SubElement(quote_el, "sectors")
-            for sector_data in sectors_data_list:
-                _add_sector_element(sectors_el_parent, sector_data)
+        quote_el = build_quote_element(quote_data)
+        if quote_el is not None:
+            quotes_el.append(quote_el)
     return root_el
+
+def build_quote_element(quote_data):
+    """Builds the <quote> element for one quote dict, or returns None for a quote without a name."""
+    if not quote_data.get("name"):
+        return None
+    quote_el = ET.Element("quote")
+    ET.SubElement(quote_el, "name").text = quote_data.get("name", "")
+    ET.SubElement(quote_el, "price").text = quote_data.get("price", "")
+
+    eprice_data_list = quote_data.get("e_price", [])
+    if eprice_data_list:
+        eprice_el_parent = ET.SubElement(quote_el, "e_price")
+        for company_data in eprice_data_list:
+            company_el = ET.SubElement(eprice_el_parent, "company")
+            ET.SubElement(company_el, "name").text = company_data.get("name", "")
+            ET.SubElement(company_el, "value").text = company_data.get("value", "")
+    
+    eps_data_list = quote_data.get("eps", [])
+    if eps_data_list:
+        eps_el_parent = ET.SubElement(quote_el, "eps")
+        for year_data in eps_data_list:
+            _add_eps_year_element(eps_el_parent, year_data)
+
+    pe_data_list = quote_data.get("pe", [])
+    if pe_data_list:
+        pe_el_parent = ET.SubElement(quote_el, "pe")
+        for company_data in pe_data_list:
+            _add_company_element(pe_el_parent, company_data)
+
+    record_data_list = quote_data.get("record", [])
+    if record_data_list:
+        record_el_parent = ET.SubElement(quote_el, "record")
+        for report_data in record_data_list:
+            _add_report_element(record_el_parent, report_data)
+
+    # Add Sectors data
+    sectors_data_list = quote_data.get("sectors", [])
+    if sectors_data_list:
+        sectors_el_parent = ET.SubElement(quote_el, "sectors")
+        for sector_data in sectors_data_list:
+            _add_sector_element(sectors_el_parent, sector_data)
+    return quote_el
     
 # Helper functions to add elements
 def _add_company_element(parent, company_data):
@@ -275,15 +389,176 @@ def save_config_file(file_name, items_list, config_type):
         QMessageBox.warning(None, f"{config_type} Config Save Error",
                             f"Could not save {config_type.lower()} to '{file_name}': {e}")
 
+XML_DECLARATION = '<?xml version="1.0" ?>'
+XML_INDENT = "    "
+
+def _escape_xml_text(data):
+    """Escapes text and attribute values the same way minidom's writer does."""
+    return data.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
+
+class _BlankLineSkippingWriter:
+    """
+    Wraps a write callable and drops whitespace-only lines on the fly, joining the
+    remaining lines with '\n' and no trailing newline. This reproduces the historical
+    'toprettyxml, then filter blank lines' output without holding the document in memory.
+    """
+    def __init__(self, write):
+        self._write = write
+        self._wrote_line = False
+
+    def write_line(self, line):
+        if "\n" in line: # Multi-line text content, filter each physical line
+            for sub_line in line.split("\n"):
+                self.write_line(sub_line)
+            return
+        if not line.strip():
+            return
+        if self._wrote_line:
+            self._write("\n")
+        self._write(line)
+        self._wrote_line = True
+
+    def write_fragment(self, fragment):
+        """Writes pre-rendered lines (already free of blank lines) without re-scanning them."""
+        if not fragment:
+            return
+        if self._wrote_line:
+            self._write("\n")
+        self._write(fragment)
+        self._wrote_line = True
+
+def _write_pretty_element(writer, element, indent):
+    """Recursively writes one element in minidom toprettyxml layout."""
+    start_tag = "<" + element.tag
+    for attr_name, attr_value in element.attrib.items():
+        start_tag += f' {attr_name}="{_escape_xml_text(attr_value)}"'
+
+    children = list(element)
+    text = element.text or ""
+    if not children:
+        if text:
+            writer.write_line(f"{indent}{start_tag}>{_escape_xml_text(text)}</{element.tag}>")
+        else:
+            writer.write_line(f"{indent}{start_tag}/>")
+        return
+
+    child_indent = indent + XML_INDENT
+    writer.write_line(f"{indent}{start_tag}>")
+    if text:
+        writer.write_line(child_indent + _escape_xml_text(text))
+    for child in children:
+        _write_pretty_element(writer, child, child_indent)
+        if child.tail:
+            writer.write_line(child_indent + _escape_xml_text(child.tail))
+    writer.write_line(f"{indent}</{element.tag}>")
+
+def write_pretty_xml(write, root_element):
+    """
+    Streams root_element as indented XML through the write callable in a single pass.
+    The output is byte-identical to the previous ET.tostring -> minidom.toprettyxml(indent="    ")
+    round-trip with blank lines removed.
+    """
+    writer = _BlankLineSkippingWriter(write)
+    writer.write_line(XML_DECLARATION)
+    _write_pretty_element(writer, root_element, "")
+
+QUOTE_FRAGMENT_INDENT = XML_INDENT * 2 # <root><quotes><quote>
+
+def serialize_quote_fragment(quote_data):
+    """
+    Renders one quote as the exact lines write_pretty_xml would emit for it inside
+    <root><quotes>, so cached fragments can be spliced into a document unchanged.
+    Returns "" for a quote without a name (build_xml_tree skips those too).
+    """
+    quote_el = build_quote_element(quote_data)
+    if quote_el is None:
+        return ""
+    parts = []
+    _write_pretty_element(_BlankLineSkippingWriter(parts.append), quote_el, QUOTE_FRAGMENT_INDENT)
+    return "".join(parts)
+
+def write_pretty_xml_fragments(write, date_text, quote_fragments):
+    """
+    Streams a report document assembled from pre-rendered quote fragments. The output is
+    identical to write_pretty_xml(write, build_xml_tree(...)) for the same data.
+    """
+    root_el = ET.Element("root")
+    ET.SubElement(root_el, "date").text = date_text
+    quote_fragments = [fragment for fragment in quote_fragments if fragment]
+
+    writer = _BlankLineSkippingWriter(write)
+    writer.write_line(XML_DECLARATION)
+    writer.write_line("<root>")
+    _write_pretty_element(writer, root_el.find("date"), XML_INDENT)
+    if not quote_fragments:
+        writer.write_line(f"{XML_INDENT}<quotes/>")
+    else:
+        writer.write_line(f"{XML_INDENT}<quotes>")
+        for fragment in quote_fragments:
+            writer.write_fragment(fragment)
+        writer.write_line(f"{XML_INDENT}</quotes>")
+    writer.write_line("</root>")
+
 def save_xml_to_file(file_path_to_save, root_element):
     """Saves the XML ElementTree to a file with pretty printing."""
-    xml_str = ET.tostring(root_element, encoding='unicode')
-    dom = minidom.parseString(xml_str)
-    pretty_xml_str = dom.toprettyxml(indent="    ")
     try:
         with open(file_path_to_save, "w", encoding="utf-8") as f:
-            f.write('\n'.join(line for line in pretty_xml_str.split('\n') if line.strip()))
+            write_pretty_xml(f.write, root_element)
+        return True
+    except Exception as e:
+        QMessageBox.critical(None, "Error Saving File", f"Could not save file: {e}")
+        return False
+
+def save_xml_to_file_atomic(file_path_to_save, root_element):
+    """
+    Writes the XML ElementTree to a temp file next to the target and moves it into place
+    with os.replace, so readers never see a half-written report.
+    Unlike save_xml_to_file this shows no message box and raises on failure, which makes
+    it safe to call from a worker thread.
+    """
+    _write_file_atomic(file_path_to_save, lambda write: write_pretty_xml(write, root_element))
+
+def save_xml_fragments_to_file(file_path_to_save, date_text, quote_fragments):
+    """save_xml_to_file counterpart for a document assembled from cached quote fragments."""
+    try:
+        with open(file_path_to_save, "w", encoding="utf-8") as f:
+            write_pretty_xml_fragments(f.write, date_text, quote_fragments)
         return True
     except Exception as e:
         QMessageBox.critical(None, "Error Saving File", f"Could not save file: {e}")
         return False
+
+def save_xml_fragments_to_file_atomic(file_path_to_save, date_text, quote_fragments):
+    """save_xml_to_file_atomic counterpart for cached quote fragments. Raises on failure."""
+    _write_file_atomic(file_path_to_save,
+                       lambda write: write_pretty_xml_fragments(write, date_text, quote_fragments))
+
+def _create_temp_file(directory):
+    """
+    Creates a new, uniquely named temp file in directory, like tempfile.mkstemp, but with mode 0o666
+    so the kernel applies the umask (mkstemp always uses 0600). Returns (fd, path).
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    for _ in range(tempfile.TMP_MAX):
+        temp_path = os.path.join(directory, f".~{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name found in {directory}")
+
+def _write_file_atomic(file_path_to_save, write_document):
+    directory = os.path.dirname(os.path.abspath(file_path_to_save))
+    fd, temp_path = _create_temp_file(directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write_document(f.write)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path_to_save): # Keep the original file's permissions
+            shutil.copymode(file_path_to_save, temp_path)
+        os.replace(temp_path, file_path_to_save)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
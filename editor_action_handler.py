@@ -2,6 +2,7 @@
 from PyQt6.QtWidgets import QMessageBox
 # QDate might be needed if any handlers use it directly, but data_utils.get_default_working_date handles QDate creation.
 import data_utils # For get_default_working_date
+from quote_model import QuoteModel
 from commands import (
     ChangeRootDateCommand, ChangeQuoteDetailCommand, ChangeEPriceValueCommand,
     ChangePEValueCommand, ChangeEPSValueCommand,
@@ -45,7 +46,7 @@ class EditorActionHandler:
             self.editor.quote_details_widget.update_field_value("name", old_name, from_command=False)
             return
         # For a name change, the 'quote_name_key' passed to the command is the old_name.
-        cmd = ChangeQuoteDetailCommand(self.editor.quote_details_widget, self.editor.all_quotes_data,
+        cmd = ChangeQuoteDetailCommand(self.editor.all_quotes_data,
                                        old_name, "name", old_name, new_name)
         self.editor.execute_command(cmd)
         # Post-command execution logic for name change (updating editor's selected_quote_name)
@@ -57,28 +58,28 @@ class EditorActionHandler:
 
     def handle_quote_price_changed(self, old_price, new_price):
         if not self.editor.selected_quote_name: return
-        cmd = ChangeQuoteDetailCommand(self.editor.quote_details_widget, self.editor.all_quotes_data,
+        cmd = ChangeQuoteDetailCommand(self.editor.all_quotes_data,
                                        self.editor.selected_quote_name, "price", old_price, new_price)
         self.editor.execute_command(cmd)
 
     # --- E-Price Handlers ---
     def handle_eprice_value_changed(self, company_name, old_value, new_value):
         if not self.editor.selected_quote_name: return
-        cmd = ChangeEPriceValueCommand(self.editor.eprice_section_widget, self.editor.all_quotes_data,
+        cmd = ChangeEPriceValueCommand(self.editor.all_quotes_data,
                                        self.editor.selected_quote_name, company_name, old_value, new_value)
         self.editor.execute_command(cmd)
 
     # --- PE Handlers ---
     def handle_pe_value_changed(self, company_name, old_value, new_value):
         if not self.editor.selected_quote_name: return
-        cmd = ChangePEValueCommand(self.editor.pe_section_widget, self.editor.all_quotes_data,
+        cmd = ChangePEValueCommand(self.editor.all_quotes_data,
                                    self.editor.selected_quote_name, company_name, old_value, new_value)
         self.editor.execute_command(cmd)
 
     # --- EPS Handlers ---
     def handle_eps_value_changed(self, year_name, company_name, field_name, old_value, new_value):
         if not self.editor.selected_quote_name: return
-        cmd = ChangeEPSValueCommand(self.editor.eps_section_widget, self.editor.all_quotes_data,
+        cmd = ChangeEPSValueCommand(self.editor.all_quotes_data,
                                     self.editor.selected_quote_name, year_name, company_name,
                                     field_name, old_value, new_value)
         self.editor.execute_command(cmd)
@@ -126,25 +127,16 @@ class EditorActionHandler:
     def handle_record_report_remove_requested(self, ui_entry_data_to_remove):
         if not self.editor.selected_quote_name or self.editor.selected_quote_name not in self.editor.all_quotes_data:
             return
-        quote_data = self.editor.all_quotes_data[self.editor.selected_quote_name]
+        quote_data = QuoteModel.of(self.editor.all_quotes_data, self.editor.selected_quote_name)
         if "record" not in quote_data: return
 
-        report_data_model_to_remove = None
-        original_data_model_index = -1
-        match_company = ui_entry_data_to_remove.get("current_company")
-        match_date = ui_entry_data_to_remove.get("current_date")
-        match_color = ui_entry_data_to_remove.get("current_color")
-
-        for idx, data_model_entry in enumerate(quote_data["record"]):
-            if (data_model_entry.get("company") == match_company and
-                data_model_entry.get("date") == match_date and
-                data_model_entry.get("color", "default") == match_color):
-                report_data_model_to_remove = data_model_entry
-                original_data_model_index = idx
-                break
+        report_data_model_to_remove = quote_data.find_record(ui_entry_data_to_remove.get("current_company"),
+                                                             ui_entry_data_to_remove.get("current_date"),
+                                                             ui_entry_data_to_remove.get("current_color"))
         if report_data_model_to_remove is None:
             QMessageBox.warning(self.editor, "Error", "Could not find the report entry in the data model to remove.")
             return
+        original_data_model_index = quote_data.record_position(report_data_model_to_remove)
         cmd = RemoveRecordReportCommand(self.editor.record_report_section_widget, self.editor.all_quotes_data,
                                         self.editor.selected_quote_name, report_data_model_to_remove,
                                         ui_entry_data_to_remove, original_data_model_index)
@@ -153,7 +145,7 @@ class EditorActionHandler:
     def handle_record_report_detail_changed(self, ui_entry_data_ref, field_name, old_value, new_value):
         if not self.editor.selected_quote_name or self.editor.selected_quote_name not in self.editor.all_quotes_data:
             return
-        quote_data = self.editor.all_quotes_data[self.editor.selected_quote_name]
+        quote_data = QuoteModel.of(self.editor.all_quotes_data, self.editor.selected_quote_name)
         data_model_ref = self.editor._find_data_model_for_record_report(quote_data, ui_entry_data_ref, field_name, old_value)
         
         if data_model_ref is None:
@@ -175,6 +167,12 @@ class EditorActionHandler:
 
     # --- Chart Handler ---
     def handle_eps_growth_data_changed_for_chart(self, year_name_changed):
+        # Inside a transaction (e.g. a bulk EPS edit) the chart is refreshed once, at commit
+        self.editor.command_manager.call_after_commit(
+            lambda: self._refresh_eps_growth_chart(year_name_changed), key=("eps_growth_chart", year_name_changed)
+        )
+
+    def _refresh_eps_growth_chart(self, year_name_changed):
         if not self.editor.selected_quote_name: return
         if self.editor.eps_growth_chart_widget._selected_year_for_chart == year_name_changed:
             # Ensure the chart has the latest full EPS data for the current quote
@@ -186,7 +184,9 @@ class EditorActionHandler:
     def handle_sector_value_changed(self, sector_name, field, new_value):
         if not self.editor.selected_quote_name: return
         quote_name = self.editor.selected_quote_name
-        old_value = next((s.get(field, "") for s in self.editor.all_quotes_data.get(quote_name, {}).get("sectors", []) if s.get("name") == sector_name), "")
+        quote_model = QuoteModel.of(self.editor.all_quotes_data, quote_name)
+        sector_data = quote_model.find_entry("sectors", sector_name) if quote_model is not None else None
+        old_value = sector_data.get(field, "") if sector_data is not None else ""
         cmd = ChangeSectorsCommand(self.editor.sectors_section_widget, self.editor.all_quotes_data,
                                             quote_name, sector_name, field, old_value, new_value)
         self.editor.execute_command(cmd)
@@ -204,7 +204,9 @@ class EditorActionHandler:
     def handle_sector_value_changed(self, sector_name, field, new_value):
         if not self.editor.selected_quote_name: return
         quote_name = self.editor.selected_quote_name
-        old_value = next((s.get(field, "") for s in self.editor.all_quotes_data.get(quote_name, {}).get("sectors", []) if s.get("name") == sector_name), "")
+        quote_model = QuoteModel.of(self.editor.all_quotes_data, quote_name)
+        sector_data = quote_model.find_entry("sectors", sector_name) if quote_model is not None else None
+        old_value = sector_data.get(field, "") if sector_data is not None else ""
         cmd = ChangeSectorsCommand(self.editor.sectors_section_widget, self.editor.all_quotes_data,
                                             quote_name, sector_name, field, old_value, new_value)
         self.editor.execute_command(cmd)
\ No newline at end of file
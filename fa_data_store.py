@@ -0,0 +1,179 @@
+# t:\Work\xml_input_ui\fa_data_store.py
+import math
+import os
+import xml.etree.ElementTree as ET
+import snapshot_cache
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for the columnar views
+    np = None
+
+FA_PERIOD_TYPES = ("yearly", "quarterly")
+FA_SNAPSHOT_KIND = "fa_index"
+
+
+def parse_fa_number(text):
+    """Converts FA cell text such as "39.24%" or "1,081.04" to a float; empty or invalid cells become NaN."""
+    if not text:
+        return math.nan
+    try:
+        return float(text.strip().rstrip("%").replace(",", ""))
+    except ValueError:
+        return math.nan
+
+
+class FAColumnarTable:
+    """
+    One metric/period-type slice of the FA database as a float64 grid:
+    values[quote_row, period_col], with NaN for empty cells. Percentages are stored as their
+    number (19.65% -> 19.65).
+    """
+
+    def __init__(self, period_type, metric, quote_names, periods, values):
+        self.period_type = period_type
+        self.metric = metric
+        self.quote_names = quote_names
+        self.periods = periods
+        self.values = values
+        self.quote_index = {name: row for row, name in enumerate(quote_names)}
+        self.period_index = {period: col for col, period in enumerate(periods)}
+
+    def column(self, period):
+        """Returns the values of every quote for one period (a view, do not modify)."""
+        return self.values[:, self.period_index[period]]
+
+    def row(self, quote_name):
+        return self.values[self.quote_index[quote_name]]
+
+    def value(self, quote_name, period):
+        return float(self.values[self.quote_index[quote_name], self.period_index[period]])
+
+    def quotes_where(self, period, predicate):
+        """
+        Returns the names of quotes whose value for period satisfies predicate, evaluated on the
+        whole column at once, e.g. table.quotes_where("Y24Q4", lambda col: col > 20).
+        NaN cells never match ordinary comparisons.
+        """
+        if period not in self.period_index:
+            return []
+        mask = np.asarray(predicate(self.column(period)), dtype=bool)
+        return [self.quote_names[row] for row in np.flatnonzero(mask)]
+
+
+class FADataStore:
+    """
+    In-memory index of an FA database file (e.g. sample/fa_db_main.xml).
+
+    The file is parsed once and indexed as
+        quote name -> period type ("yearly"/"quarterly") -> metric (EPS, PE, ...) -> period -> value text
+    and is only re-parsed when the file's modification time or size changes. The index is also
+    kept in a sidecar snapshot, so an unchanged file is not parsed again on the next launch.
+    Lookups raise FileNotFoundError / ET.ParseError if the file cannot be read, like ET.parse would.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._quotes = {}
+        self._file_signature = None # (mtime_ns, size) of the parsed file
+        self._columnar_tables = {} # (period_type, metric) -> FAColumnarTable, built on demand
+
+    def _ensure_loaded(self):
+        stat_result = os.stat(self.file_path)
+        file_signature = (stat_result.st_mtime_ns, stat_result.st_size)
+        if file_signature != self._file_signature:
+            self._quotes = self._load_index(self.file_path)
+            self._file_signature = file_signature
+            self._columnar_tables = {}
+
+    @classmethod
+    def _load_index(cls, file_path):
+        quotes = snapshot_cache.load_snapshot(file_path, FA_SNAPSHOT_KIND)
+        if quotes is None:
+            file_key = snapshot_cache.file_key(file_path)
+            quotes = cls._parse(file_path)
+            snapshot_cache.save_snapshot(file_path, FA_SNAPSHOT_KIND, quotes, file_key)
+        return quotes
+
+    @staticmethod
+    def _parse(file_path):
+        quotes = {}
+        for _, elem in ET.iterparse(file_path, events=("end",)):
+            if elem.tag != "quote":
+                continue
+            quote_name = elem.findtext("name")
+            if quote_name:
+                stats = {}
+                stat_el = elem.find("stat")
+                if stat_el is not None:
+                    for period_type_el in stat_el:
+                        stats[period_type_el.tag] = {
+                            metric_el.tag: {period_el.tag: period_el.text for period_el in metric_el}
+                            for metric_el in period_type_el
+                        }
+                quotes[quote_name] = stats # Later duplicates win
+            elem.clear() # Keep memory flat while streaming
+        return quotes
+
+    def quote_names(self):
+        self._ensure_loaded()
+        return list(self._quotes)
+
+    def has_quote(self, quote_name):
+        self._ensure_loaded()
+        return quote_name in self._quotes
+
+    def get_quote_stats(self, quote_name):
+        """Returns {period_type: {metric: {period: value}}} for a quote, or None if it is not in the file."""
+        self._ensure_loaded()
+        return self._quotes.get(quote_name)
+
+    def get_metric_values(self, quote_name, period_type, metric):
+        """Returns {period: value} in file order, or None if the quote has no such metric."""
+        stats = self.get_quote_stats(quote_name)
+        if stats is None:
+            return None
+        return stats.get(period_type, {}).get(metric)
+
+    def get_available_periods(self, quote_name, period_type, metric="EPS"):
+        values = self.get_metric_values(quote_name, period_type, metric)
+        return list(values) if values else []
+
+    # --- Columnar (NumPy) views ---
+    def get_columnar_table(self, period_type, metric):
+        """Returns the FAColumnarTable for one metric/period type, covering every quote and period in the file."""
+        if np is None:
+            raise ImportError("numpy is required for columnar FA data")
+        self._ensure_loaded()
+        table = self._columnar_tables.get((period_type, metric))
+        if table is None:
+            table = self._build_columnar_table(period_type, metric)
+            self._columnar_tables[(period_type, metric)] = table
+        return table
+
+    def _build_columnar_table(self, period_type, metric):
+        quote_names = list(self._quotes)
+        metric_rows = [self._quotes[name].get(period_type, {}).get(metric, {}) for name in quote_names]
+        periods = sorted({period for metric_values in metric_rows for period in metric_values})
+        period_index = {period: col for col, period in enumerate(periods)}
+        values = np.full((len(quote_names), len(periods)), np.nan, dtype=np.float64)
+        for row, metric_values in enumerate(metric_rows):
+            for period, text in metric_values.items():
+                values[row, period_index[period]] = parse_fa_number(text)
+        return FAColumnarTable(period_type, metric, quote_names, periods, values)
+
+    def quotes_where(self, period_type, metric, period, predicate):
+        """Screens all quotes at once, e.g. quotes_where("quarterly", "ROE", "Y24Q4", lambda col: col > 20)."""
+        return self.get_columnar_table(period_type, metric).quotes_where(period, predicate)
+
+
+_shared_stores = {}
+
+def get_fa_data_store(file_path):
+    """Returns the process-wide store for file_path, so every chart window shares one parse."""
+    key = os.path.normcase(os.path.abspath(file_path))
+    store = _shared_stores.get(key)
+    if store is None:
+        store = FADataStore(file_path)
+        _shared_stores[key] = store
+    return store
@@ -1,17 +1,128 @@
 # t:\Work\xml_input_ui\file_manager.py
 import os
+import copy
+import xml.etree.ElementTree as ET
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, pyqtSlot
 import data_utils
 
-class FileManager:
+class XmlSaveWorker(QObject):
+    """Builds and atomically writes the XML for a data snapshot off the GUI thread."""
+    finished = pyqtSignal(str)       # file_path
+    failed = pyqtSignal(str, str)    # file_path, error message
+
+    def __init__(self, file_path, collected_data):
+        super().__init__()
+        self.file_path = file_path
+        self.collected_data = collected_data # A private snapshot, never touched by the GUI thread
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            if "quote_fragments" in self.collected_data:
+                data_utils.save_xml_fragments_to_file_atomic(
+                    self.file_path, self.collected_data.get("date", ""), self.collected_data["quote_fragments"])
+            else:
+                root_element = data_utils.build_xml_tree(self.collected_data)
+                data_utils.save_xml_to_file_atomic(self.file_path, root_element)
+        except Exception as e:
+            self.failed.emit(self.file_path, str(e))
+            return
+        self.finished.emit(self.file_path)
+
+class XmlLoadWorker(QObject):
+    """Streams a report file off the GUI thread and hands parsed quotes back in batches."""
+    FIRST_BATCH_SIZE = 1 # Deliver the first quote right away so it can be displayed
+    BATCH_SIZE = 100
+
+    rootDateLoaded = pyqtSignal(object)   # QDate
+    quotesBatchLoaded = pyqtSignal(object) # list of quote dicts, in file order
+    progressChanged = pyqtSignal(int)     # percent of the file (or its snapshot) consumed
+    finished = pyqtSignal(str, int)       # file_path, number of skipped nameless quotes
+    failed = pyqtSignal(str, str)         # file_path, error message
+    cancelled = pyqtSignal(str)           # file_path
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self._cancel_requested = False
+
+    def request_cancel(self):
+        """Thread-safe: the flag is polled between quotes."""
+        self._cancel_requested = True
+
+    @pyqtSlot()
+    def run(self):
+        batch = []
+        batch_limit = self.FIRST_BATCH_SIZE
+        skipped_count = 0
+        self._last_percent = -1
+        try:
+            with open(self.file_path, "rb") as f:
+                for kind, payload in data_utils.iter_cached_xml_quotes(self.file_path, f, self._report_progress):
+                    if self._cancel_requested:
+                        self.cancelled.emit(self.file_path)
+                        return
+                    if kind == "date":
+                        self.rootDateLoaded.emit(payload)
+                        continue
+                    if not payload["name"]:
+                        skipped_count += 1
+                        continue
+                    batch.append(payload)
+                    if len(batch) >= batch_limit:
+                        self.quotesBatchLoaded.emit(batch)
+                        batch = []
+                        batch_limit = self.BATCH_SIZE
+        except FileNotFoundError:
+            self.failed.emit(self.file_path, f"File not found: {self.file_path}")
+            return
+        except ET.ParseError as e:
+            self.failed.emit(self.file_path, f"Error parsing XML file: {self.file_path}\n{e}")
+            return
+        except OSError as e:
+            self.failed.emit(self.file_path, f"Could not read file: {self.file_path}\n{e}")
+            return
+        except Exception as e: # Always end with a terminal signal, or the load thread never quits
+            self.failed.emit(self.file_path, f"Could not load file: {self.file_path}\n{e}")
+            return
+        if batch:
+            self.quotesBatchLoaded.emit(batch)
+        self.progressChanged.emit(100)
+        self.finished.emit(self.file_path, skipped_count)
+
+    def _report_progress(self, consumed, total):
+        """Progress of the XML or, when it is replayed, of the snapshot (see iter_cached_xml_quotes)."""
+        percent = min(100, consumed * 100 // total)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progressChanged.emit(percent)
+
+class FileManager(QObject):
+    saveFinished = pyqtSignal(str)    # file_path, emitted when a background save completes
+    saveFailed = pyqtSignal(str, str) # file_path, error message
+    loadStarted = pyqtSignal(str)             # file_path
+    loadRootDateLoaded = pyqtSignal(object)   # QDate
+    loadQuotesBatchLoaded = pyqtSignal(object) # list of quote dicts
+    loadProgressChanged = pyqtSignal(int)     # percent
+    loadFinished = pyqtSignal(str)            # file_path
+    loadFailed = pyqtSignal(str, str)         # file_path, error message
+    loadCancelled = pyqtSignal(str)           # file_path
+
     def __init__(self, editor_ref):
         """
         Manages file operations for the XmlReportEditor.
         Args:
             editor_ref: A reference to the XmlReportEditor instance.
         """
+        super().__init__()
         self.editor = editor_ref  # To call editor methods like collect_data_for_xml, _set_dirty_flag etc.
         self.current_file_path = None
+        self._save_thread = None
+        self._save_worker = None
+        self._load_thread = None
+        self._load_worker = None
+        self._file_path_before_load = None
 
     def get_current_file_path(self):
         return self.current_file_path
@@ -28,24 +139,96 @@ class FileManager:
         if not file_path:
             return None, None, None
 
-        file_path, root_date, quotes_data = data_utils.parse_xml_data(file_path)
+        file_path, root_date, quotes_data = data_utils.iterparse_xml_data(file_path)
         if root_date is not None or quotes_data is not None: # Allow opening even if one part is missing but file is valid
             self.current_file_path = file_path
             return self.current_file_path, root_date, quotes_data
-        # If parse_xml_data returned None, None (e.g. critical error), it would have shown a message.
+        # If iterparse_xml_data returned None, None (e.g. critical error), it would have shown a message.
         return None, None, None
 
+    # --- Background open ---
+    def is_load_in_progress(self):
+        return self._load_thread is not None
+
+    def open_file_async(self):
+        """
+        Asks for a file and parses it on a worker thread. Parsed quotes are streamed back in
+        batches through loadQuotesBatchLoaded; loadFinished/loadFailed/loadCancelled end the load.
+        Returns:
+            bool: True if a background load was started, False otherwise.
+        """
+        if self.is_load_in_progress():
+            return False
+        file_path, _ = QFileDialog.getOpenFileName(
+            self.editor, "Open XML File", "", "XML Files (*.xml);;All Files (*)"
+        )
+        if not file_path:
+            return False
+
+        # The editor is about to be repopulated; never save a partial load over the previous file.
+        # The previous path comes back if the load fails or is cancelled.
+        self._file_path_before_load = self.current_file_path
+        self.current_file_path = None
+        self._load_thread = QThread()
+        self._load_worker = XmlLoadWorker(file_path)
+        self._load_worker.moveToThread(self._load_thread)
+        self._load_thread.started.connect(self._load_worker.run)
+        self._load_worker.rootDateLoaded.connect(self.loadRootDateLoaded)
+        self._load_worker.quotesBatchLoaded.connect(self.loadQuotesBatchLoaded)
+        self._load_worker.progressChanged.connect(self.loadProgressChanged)
+        self._load_worker.finished.connect(self._on_async_load_finished)
+        self._load_worker.failed.connect(self._on_async_load_failed)
+        self._load_worker.cancelled.connect(self.loadCancelled)
+        for end_signal in (self._load_worker.finished, self._load_worker.failed, self._load_worker.cancelled):
+            end_signal.connect(self._load_thread.quit, Qt.ConnectionType.DirectConnection)
+        self._load_thread.finished.connect(self._release_load_thread)
+        self.loadStarted.emit(file_path)
+        self._load_thread.start()
+        return True
+
+    def cancel_open(self):
+        """Asks a running background load to stop after the current quote and restores the previous file path."""
+        if self._load_worker is not None:
+            self._load_worker.request_cancel()
+            self.current_file_path = self._file_path_before_load
+
+    def wait_for_pending_load(self):
+        if self._load_thread is not None:
+            self._load_thread.wait()
+
+    @pyqtSlot()
+    def _release_load_thread(self):
+        if self._load_thread is not None:
+            self._load_thread.wait()
+        self._load_thread = None
+        self._load_worker = None
+
+    @pyqtSlot(str, int)
+    def _on_async_load_finished(self, file_path, skipped_count):
+        self.current_file_path = file_path
+        if skipped_count:
+            QMessageBox.warning(self.editor, "XML Warning",
+                                f"Found {skipped_count} quote(s) without a name. Skipped.")
+        self.loadFinished.emit(file_path)
+
+    @pyqtSlot(str, str)
+    def _on_async_load_failed(self, file_path, error_message):
+        self.current_file_path = self._file_path_before_load
+        QMessageBox.critical(self.editor, "Error", error_message)
+        self.loadFailed.emit(file_path, error_message)
+
     def save_file(self, data_for_xml_func):
         """
         Saves the current data to the current_file_path or prompts for Save As if no path exists.
         Args:
-            data_for_xml_func: A callable that returns the data to be saved.
+            data_for_xml_func: A callable that returns the data to be saved, either
+                {"date", "quotes"} for build_xml_tree or {"date", "quote_fragments"}.
         Returns:
             bool: True if save was successful, False otherwise.
         """
         if not self.current_file_path:
             return self.save_file_as(data_for_xml_func)
-        
+
         return self._perform_save_internal(self.current_file_path, data_for_xml_func)
 
     def save_file_as(self, data_for_xml_func):
@@ -56,22 +239,96 @@ class FileManager:
         Returns:
             bool: True if save was successful, False otherwise.
         """
+        file_path_dialog = self._ask_save_file_path()
+        if not file_path_dialog:
+            return False # User cancelled
+
+        return self._perform_save_internal(file_path_dialog, data_for_xml_func)
+
+    def _ask_save_file_path(self):
         default_path = self.current_file_path if self.current_file_path else os.path.join(os.getcwd(), "report_output.xml")
         file_path_dialog, _ = QFileDialog.getSaveFileName(
             self.editor, "Save XML File As", default_path, "XML Files (*.xml);;All Files (*)"
         )
-        if not file_path_dialog:
-            return False # User cancelled
-        
-        return self._perform_save_internal(file_path_dialog, data_for_xml_func)
+        return file_path_dialog
 
     def _perform_save_internal(self, file_path_to_save, data_for_xml_func):
         collected_data = data_for_xml_func()
-        root_element = data_utils.build_xml_tree(collected_data)
-        
-        if data_utils.save_xml_to_file(file_path_to_save, root_element):
+        if "quote_fragments" in collected_data: # Pre-serialized quotes, see QuoteFragmentCache
+            saved = data_utils.save_xml_fragments_to_file(
+                file_path_to_save, collected_data.get("date", ""), collected_data["quote_fragments"])
+        else:
+            saved = data_utils.save_xml_to_file(file_path_to_save, data_utils.build_xml_tree(collected_data))
+
+        if saved:
             QMessageBox.information(self.editor, "Success", f"XML saved to {file_path_to_save}")
             self.current_file_path = file_path_to_save
             return True
         # data_utils.save_xml_to_file shows its own error message
-        return False
\ No newline at end of file
+        return False
+
+    # --- Background save ---
+    def is_save_in_progress(self):
+        return self._save_thread is not None
+
+    def save_file_async(self, data_for_xml_func):
+        """
+        Background variant of save_file. The data is snapshotted on the calling (GUI) thread,
+        then built and written on a worker thread. Completion is reported via saveFinished/saveFailed.
+        Returns:
+            bool: True if a background save was started, False otherwise.
+        """
+        if not self.current_file_path:
+            return self.save_file_as_async(data_for_xml_func)
+        return self._start_async_save(self.current_file_path, data_for_xml_func)
+
+    def save_file_as_async(self, data_for_xml_func):
+        """Background variant of save_file_as. Returns True if a background save was started."""
+        if self.is_save_in_progress():
+            return False
+        file_path_dialog = self._ask_save_file_path()
+        if not file_path_dialog:
+            return False # User cancelled
+        return self._start_async_save(file_path_dialog, data_for_xml_func)
+
+    def _start_async_save(self, file_path_to_save, data_for_xml_func):
+        if self.is_save_in_progress():
+            return False
+        # Deep copy so edits made while the worker runs cannot race with serialization
+        # (cheap for pre-serialized fragments, which are immutable strings)
+        snapshot = copy.deepcopy(data_for_xml_func())
+
+        self._save_thread = QThread()
+        self._save_worker = XmlSaveWorker(file_path_to_save, snapshot)
+        self._save_worker.moveToThread(self._save_thread)
+        self._save_thread.started.connect(self._save_worker.run)
+        self._save_worker.finished.connect(self._on_async_save_finished)
+        self._save_worker.failed.connect(self._on_async_save_failed)
+        # Quit directly from the worker thread so wait_for_pending_save() cannot deadlock
+        self._save_worker.finished.connect(self._save_thread.quit, Qt.ConnectionType.DirectConnection)
+        self._save_worker.failed.connect(self._save_thread.quit, Qt.ConnectionType.DirectConnection)
+        self._save_thread.finished.connect(self._release_save_thread)
+        self._save_thread.start()
+        return True
+
+    def wait_for_pending_save(self):
+        """Blocks until a running background save has finished writing."""
+        if self._save_thread is not None:
+            self._save_thread.wait()
+
+    @pyqtSlot()
+    def _release_save_thread(self):
+        if self._save_thread is not None:
+            self._save_thread.wait() # finished is emitted just before the thread exits
+        self._save_thread = None
+        self._save_worker = None
+
+    @pyqtSlot(str)
+    def _on_async_save_finished(self, file_path):
+        self.current_file_path = file_path
+        self.saveFinished.emit(file_path)
+
+    @pyqtSlot(str, str)
+    def _on_async_save_failed(self, file_path, error_message):
+        QMessageBox.critical(self.editor, "Error Saving File", f"Could not save file: {error_message}")
+        self.saveFailed.emit(file_path, error_message)
@@ -0,0 +1,45 @@
+# t:\Work\xml_input_ui\quote_fragment_cache.py
+import data_utils
+
+
+class QuoteFragmentCache:
+    """
+    Keeps each quote's serialized XML fragment between saves. Quotes are re-serialized only
+    after they have been marked dirty (normally from Command.affected_quote_names()), so a save
+    after a one-field edit renders a single quote and splices in the cached rest.
+    """
+
+    def __init__(self):
+        self._fragments = {} # quote name -> fragment text
+        self._dirty_quote_names = set()
+
+    def mark_dirty(self, quote_names):
+        """Marks quotes as changed. None means "unknown", which invalidates every fragment."""
+        if quote_names is None:
+            self.invalidate_all()
+        else:
+            self._dirty_quote_names.update(quote_names)
+
+    def invalidate_all(self):
+        self._fragments.clear()
+        self._dirty_quote_names.clear()
+
+    def is_cached(self, quote_name):
+        return quote_name in self._fragments and quote_name not in self._dirty_quote_names
+
+    def fragments_for(self, quotes):
+        """
+        Returns the fragments for quotes, an iterable of (quote_name, quote_data) in document order,
+        serializing only dirty or uncached quotes. Fragments of quotes no longer present are dropped.
+        """
+        fragments = []
+        current_fragments = {}
+        for quote_name, quote_data in quotes:
+            fragment = self._fragments.get(quote_name)
+            if fragment is None or quote_name in self._dirty_quote_names:
+                fragment = data_utils.serialize_quote_fragment(quote_data)
+            current_fragments[quote_name] = fragment
+            fragments.append(fragment)
+        self._fragments = current_fragments
+        self._dirty_quote_names.clear()
+        return fragments
@@ -0,0 +1,438 @@
+# t:\Work\xml_input_ui\quote_model.py
+import sys
+from collections import namedtuple
+from collections.abc import Mapping, MutableMapping
+
+# Chart-ready growth of one EPS year: company names, growth values (0.0 where missing or not a
+# number), how many companies had a numeric growth, and their average (None if there were none).
+EpsGrowthSeries = namedtuple("EpsGrowthSeries", ["categories", "values", "numeric_count", "average"])
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Record(MutableMapping):
+    """
+    Base of the compact entry types below. Fields live in __slots__ instead of a per-entry dict,
+    but are read and written through the same mapping interface the dicts had (entry["name"],
+    entry.get("value", ""), dict(entry), entry == {...}), so commands and widgets work with either.
+    Every field is always present; unknown keys raise KeyError and fields cannot be deleted.
+    Repeated strings (company, sector and year names, dates, colors) are interned.
+    """
+    __slots__ = ()
+    _interned_fields = frozenset()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in self._interned_fields else value)
+
+    def __delitem__(self, key):
+        raise TypeError(f"{type(self).__name__} fields cannot be removed")
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    __hash__ = None # Mutable, like the dicts it replaces
+
+    def __reduce__(self):
+        # Positional field values: compact in the snapshot pickles, re-interned on load
+        return (type(self), tuple(getattr(self, field) for field in self.__slots__))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class CompanyValue(_Record):
+    """An E-Price or PE company entry."""
+    __slots__ = ("name", "value")
+    _interned_fields = frozenset(("name",))
+
+    def __init__(self, name="", value=""):
+        self.name = _intern(name)
+        self.value = value
+
+
+class EpsCompany(_Record):
+    __slots__ = ("name", "value", "growth")
+    _interned_fields = frozenset(("name",))
+
+    def __init__(self, name="", value="", growth=""):
+        self.name = _intern(name)
+        self.value = value
+        self.growth = growth
+
+
+class EpsYear(_Record):
+    __slots__ = ("name", "companies")
+    _interned_fields = frozenset(("name",))
+
+    def __init__(self, name="", companies=None):
+        self.name = _intern(name)
+        self.companies = companies if companies is not None else []
+
+
+class Report(_Record):
+    """A record report entry."""
+    __slots__ = ("company", "date", "color")
+    _interned_fields = frozenset(("company", "date", "color"))
+
+    def __init__(self, company="", date="", color=""):
+        self.company = _intern(company)
+        self.date = _intern(date)
+        self.color = _intern(color)
+
+
+class Sector(_Record):
+    __slots__ = ("name", "type")
+    _interned_fields = frozenset(("name", "type"))
+
+    def __init__(self, name="", type="main"):
+        self.name = _intern(name)
+        self.type = _intern(type)
+
+
+_ENTRY_TYPES = {"e_price": CompanyValue, "pe": CompanyValue, "sectors": Sector}
+
+
+def parse_growth(growth_text):
+    """Parses an EPS growth string such as "12.5%" or "-3"; returns None if it is empty or not a number."""
+    growth_text = (growth_text or "").replace('%', '')
+    if not growth_text:
+        return None
+    try:
+        return float(growth_text)
+    except ValueError:
+        return None
+
+
+def compute_eps_growth_series(year_data):
+    """Builds the EpsGrowthSeries of an EPS year entry (or an empty one for None)."""
+    categories = []
+    values = []
+    growth_sum = 0.0
+    numeric_count = 0
+    for company_data in (year_data.get("companies") or []) if year_data else []:
+        categories.append(company_data.get("name", "N/A"))
+        growth_value = parse_growth(company_data.get("growth", ""))
+        if growth_value is None:
+            values.append(0.0)
+            continue
+        values.append(growth_value)
+        growth_sum += growth_value
+        numeric_count += 1
+    average = growth_sum / numeric_count if numeric_count else None
+    return EpsGrowthSeries(tuple(categories), tuple(values), numeric_count, average)
+
+
+def _name_key(entry):
+    return entry.get("name")
+
+
+def _record_key(record):
+    return (record.get("company"), record.get("date"))
+
+
+class QuoteModel(dict):
+    """
+    A quote's data dict (same keys and XML-ordered lists as before) that also keeps lookup indexes:
+    e_price / pe / sectors entries and EPS years by name, each EPS year's companies by name, and
+    records by (company, date). The lists stay the source of truth and keep their order; an index
+    is built on first use and rebuilt when its list was replaced or resized behind the model's back
+    (e.g. a list assigned straight into the dict). Renaming an entry in place must go
+    through set_entry_field()/set_record_field() so its index follows the new key.
+    Parsed EPS growth series are cached per year the same way; growth edits made in place must
+    call invalidate_eps_growth().
+    Values set through set_detail(), set_entry_value() and set_eps_field() are announced to the
+    observers of their section, which is how the displayed quote's widgets follow the commands.
+    """
+    __slots__ = ("_indexes", "_growth_series", "_observers")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._indexes = {} # index key -> (indexed list, its length, {key: entry or [records]})
+        self._growth_series = {} # year name -> (year entry, its companies list, length, EpsGrowthSeries)
+        self._observers = {} # section -> callbacks(key, field, value)
+
+    def __reduce__(self):
+        # Pickles/copies as the plain quote data; indexes are rebuilt on demand and observers are not copied
+        return (QuoteModel, (dict(self),))
+
+    @staticmethod
+    def of(all_quotes_data, quote_name):
+        """
+        Returns the QuoteModel stored under quote_name, upgrading a plain quote dict in place,
+        or None if there is no such quote.
+        """
+        quote_data = all_quotes_data.get(quote_name)
+        if quote_data is None or quote_name == "date":
+            return None
+        if not isinstance(quote_data, QuoteModel):
+            quote_data = all_quotes_data[quote_name] = QuoteModel(quote_data)
+        return quote_data
+
+    def _current_index(self, index_key, entries, length_delta=0):
+        """The index of entries if it is still valid (allowing for length_delta just-made changes), else None."""
+        cached = self._indexes.get(index_key)
+        if cached is None or cached[0] is not entries or cached[1] + length_delta != len(entries):
+            return None
+        return cached[2]
+
+    def _index(self, index_key, entries, key_func, unique=True):
+        mapping = self._current_index(index_key, entries)
+        if mapping is not None:
+            return mapping
+        mapping = {}
+        for entry in entries:
+            if unique:
+                mapping.setdefault(key_func(entry), entry) # First match wins, as with a linear scan
+            else:
+                mapping.setdefault(key_func(entry), []).append(entry)
+        self._indexes[index_key] = (entries, len(entries), mapping)
+        return mapping
+
+    def _lookup(self, index_key, entries, key, key_func=_name_key):
+        if entries is None:
+            return None
+        entry = self._index(index_key, entries, key_func).get(key)
+        if entry is not None and key_func(entry) != key: # Renamed without the model; re-index
+            self._indexes.pop(index_key, None)
+            entry = self._index(index_key, entries, key_func).get(key)
+        return entry
+
+    def _appended(self, index_key, entries, key, entry):
+        """Records an entry just appended to (or inserted into) entries without re-indexing the list."""
+        mapping = self._current_index(index_key, entries, length_delta=1)
+        if mapping is None:
+            return # Rebuilt on next use
+        if index_key == "record":
+            mapping.setdefault(key, []).append(entry)
+        else:
+            mapping.setdefault(key, entry)
+        self._indexes[index_key] = (entries, len(entries), mapping)
+
+    def _removed(self, index_key, entries, key, entry):
+        mapping = self._current_index(index_key, entries, length_delta=-1)
+        if mapping is None:
+            return
+        if index_key == "record":
+            _remove_from_bucket(mapping, key, entry)
+        elif mapping.get(key) is entry:
+            # Another entry with the same name may now be the first one
+            self._indexes.pop(index_key, None)
+            return
+        self._indexes[index_key] = (entries, len(entries), mapping)
+
+    # --- Field change events ---
+    def observe(self, section, callback):
+        """
+        Calls callback(key, field, value) after each value set through the model in section:
+        "details" (key None, field "name" or "price"), "e_price" or "pe" (key the company name,
+        field "value") or "eps" (key (year name, company name), field "value" or "growth").
+        """
+        callbacks = self._observers.setdefault(section, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unobserve(self, section, callback):
+        callbacks = self._observers.get(section, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def _notify(self, section, key, field, value):
+        for callback in tuple(self._observers.get(section, ())):
+            callback(key, field, value)
+
+    def set_detail(self, field, value):
+        """Sets the quote's "name" or "price"."""
+        self[field] = value
+        self._notify("details", None, field, value)
+
+    # --- E-Price / PE companies and sectors (lists of {"name": ...}) ---
+    def find_entry(self, section, name):
+        """Returns the entry named name in section ("e_price", "pe" or "sectors"), or None."""
+        return self._lookup(section, self.get(section), name)
+
+    def ensure_entry(self, section, name, **defaults):
+        """Returns the entry named name in section, appending a new entry (name plus defaults) if missing."""
+        entries = self.setdefault(section, [])
+        entry = self._lookup(section, entries, name)
+        if entry is None:
+            entry = _ENTRY_TYPES[section](name=name, **defaults)
+            entries.append(entry)
+            self._appended(section, entries, name, entry)
+        return entry
+
+    def append_entry(self, section, entry):
+        entries = self.setdefault(section, [])
+        entries.append(entry)
+        self._appended(section, entries, _name_key(entry), entry)
+
+    def remove_entry(self, section, name):
+        """Removes and returns the entry named name from section, or None if there is none."""
+        entries = self.get(section)
+        entry = self._lookup(section, entries, name)
+        if entry is None:
+            return None
+        del entries[_position(entries, entry)]
+        self._removed(section, entries, name, entry)
+        return entry
+
+    def set_entry_value(self, section, name, value):
+        """Sets the value of the E-Price/PE company name in section, appending the company if missing."""
+        self.ensure_entry(section, name, value="")["value"] = value
+        self._notify(section, name, "value", value)
+
+    def set_entry_field(self, section, entry, field, value):
+        """Sets entry[field]; renaming the entry keeps the section index in step."""
+        if field == "name":
+            self._indexes.pop(section, None)
+        entry[field] = value
+
+    # --- EPS years and their companies ---
+    def find_eps_year(self, year_name):
+        return self._lookup("eps", self.get("eps"), year_name)
+
+    def ensure_eps_company(self, year_name, company_name):
+        """
+        Returns the company dict for company_name in EPS year year_name, creating the year and/or
+        the company (with empty value and growth) if missing.
+        """
+        year_data = self.find_eps_year(year_name)
+        if year_data is None:
+            year_data = EpsYear(year_name)
+            self.add_eps_year(year_data)
+        companies = year_data.setdefault("companies", [])
+        company_data = self._lookup(("eps", year_name), companies, company_name)
+        if company_data is None:
+            company_data = EpsCompany(company_name)
+            companies.append(company_data)
+            self._appended(("eps", year_name), companies, company_name, company_data)
+        return company_data
+
+    def set_eps_field(self, year_name, company_name, field, value):
+        """Sets the "value" or "growth" of a company in an EPS year, creating the year/company if missing."""
+        self.ensure_eps_company(year_name, company_name)[field] = value
+        if field == "growth":
+            self.invalidate_eps_growth(year_name)
+        self._notify("eps", (year_name, company_name), field, value)
+
+    def add_eps_year(self, year_data, sort_key=None):
+        """Appends an EPS year (then re-sorts the years by sort_key if given)."""
+        years = self.setdefault("eps", [])
+        years.append(year_data)
+        self._appended("eps", years, _name_key(year_data), year_data)
+        if sort_key is not None:
+            years.sort(key=lambda y: sort_key(y.get("name", ""))) # Same entries, so the index holds
+
+    def remove_eps_year(self, year_name):
+        year_data = self.remove_entry("eps", year_name)
+        if year_data is not None:
+            self._indexes.pop(("eps", year_name), None)
+        return year_data
+
+    def eps_growth_series(self, year_name):
+        """The (cached) EpsGrowthSeries of EPS year year_name."""
+        year_data = self.find_eps_year(year_name)
+        if year_data is None:
+            self._growth_series.pop(year_name, None)
+            return compute_eps_growth_series(None)
+        companies = year_data.get("companies")
+        cached = self._growth_series.get(year_name)
+        if (cached is not None and cached[0] is year_data and cached[1] is companies
+                and cached[2] == len(companies or ())):
+            return cached[3]
+        series = compute_eps_growth_series(year_data)
+        self._growth_series[year_name] = (year_data, companies, len(companies or ()), series)
+        return series
+
+    def invalidate_eps_growth(self, year_name=None):
+        """Drops the cached growth series of year_name (of every year if None)."""
+        if year_name is None:
+            self._growth_series.clear()
+        else:
+            self._growth_series.pop(year_name, None)
+
+    # --- Record reports ---
+    def find_record(self, company, date, color=None):
+        """
+        Returns the first record with company and date (and color, treating a missing color as
+        "default", when given), or None.
+        """
+        if self.get("record") is None:
+            return None
+        records = self._index("record", self["record"], _record_key, unique=False).get((company, date), ())
+        for record in records:
+            if _record_key(record) != (company, date): # Changed without the model; re-index
+                self._indexes.pop("record", None)
+                return self.find_record(company, date, color)
+            if color is None or record.get("color", "default") == color:
+                return record
+        return None
+
+    def record_position(self, record):
+        """Index of record (by identity) in the record list, or -1."""
+        return _position(self.get("record", []), record)
+
+    def append_record(self, record):
+        records = self.setdefault("record", [])
+        records.append(record)
+        self._appended("record", records, _record_key(record), record)
+
+    def insert_record(self, position, record):
+        """Inserts record at position (appends if position is out of range)."""
+        records = self.setdefault("record", [])
+        if 0 <= position <= len(records):
+            records.insert(position, record)
+        else:
+            records.append(record)
+        self._appended("record", records, _record_key(record), record)
+
+    def remove_record(self, record):
+        """Removes record (by identity) and returns its former position, or -1 if it is not listed."""
+        records = self.get("record", [])
+        position = _position(records, record)
+        if position >= 0:
+            del records[position]
+            self._removed("record", records, _record_key(record), record)
+        return position
+
+    def set_record_field(self, record, field, value):
+        """Sets record[field]; changing its company or date re-keys it in the index."""
+        mapping = self._current_index("record", self.get("record")) if field in ("company", "date") else None
+        indexed = mapping is not None and any(r is record for r in mapping.get(_record_key(record), ()))
+        if indexed:
+            _remove_from_bucket(mapping, _record_key(record), record)
+        record[field] = value
+        if indexed:
+            mapping.setdefault(_record_key(record), []).append(record)
+
+
+def _remove_from_bucket(mapping, key, record):
+    records = mapping.get(key, [])
+    records[:] = [r for r in records if r is not record]
+    if not records:
+        mapping.pop(key, None)
+
+
+def _position(entries, entry):
+    for position, candidate in enumerate(entries):
+        if candidate is entry:
+            return position
+    return -1
@@ -0,0 +1,165 @@
+# t:\Work\xml_input_ui\quote_search_index.py
+import bisect
+import unicodedata
+
+
+def normalize_search_text(text):
+    """Upper-cases text and strips Vietnamese diacritics, so "ngan hang" finds "NGÂN HÀNG"."""
+    decomposed = unicodedata.normalize("NFD", str(text).strip().upper().replace("Đ", "D"))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _bigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _quote_terms(quote_data):
+    """Searchable terms of a quote besides its name: each sector (whole and word by word) and the price."""
+    terms = set()
+    if not isinstance(quote_data, dict):
+        return terms
+    for sector in quote_data.get("sectors", []):
+        sector_key = normalize_search_text(sector.get("name") or "")
+        if sector_key:
+            terms.add(sector_key)
+            terms.update(sector_key.split())
+    price_key = normalize_search_text(quote_data.get("price") or "")
+    if price_key:
+        terms.add(price_key)
+    return terms
+
+
+class QuoteSearchIndex:
+    """
+    Type-ahead index over all_quotes_data. Quote names and their sector/price terms are kept as
+    sorted (term, quote name) lists, so a prefix lookup is a bisect; name bigrams back a fuzzy
+    fallback for typos. Like SectorIndex, it is kept current per quote through update_quotes().
+    """
+    FUZZY_MIN_SCORE = 0.5 # Dice coefficient over name bigrams
+
+    def __init__(self):
+        self._name_keys = [] # sorted (normalized name, quote name)
+        self._term_keys = [] # sorted (normalized sector/price term, quote name)
+        self._keys_by_quote = {} # quote name -> (normalized name, set of terms)
+        self._quotes_by_bigram = {} # name bigram -> set of quote names
+
+    def clear(self):
+        self._name_keys = []
+        self._term_keys = []
+        self._keys_by_quote.clear()
+        self._quotes_by_bigram.clear()
+
+    def rebuild(self, all_quotes_data):
+        """Indexes all_quotes_data from scratch (after loading a file)."""
+        self.clear()
+        for quote_name, quote_data in all_quotes_data.items():
+            if quote_name == "date":
+                continue
+            name_key = normalize_search_text(quote_name)
+            terms = _quote_terms(quote_data)
+            self._keys_by_quote[quote_name] = (name_key, terms)
+            self._name_keys.append((name_key, quote_name))
+            self._term_keys.extend((term, quote_name) for term in terms)
+            for bigram in _bigrams(name_key):
+                self._quotes_by_bigram.setdefault(bigram, set()).add(quote_name)
+        self._name_keys.sort()
+        self._term_keys.sort()
+
+    def update_quotes(self, quote_names, all_quotes_data):
+        """
+        Re-indexes the given quotes from all_quotes_data; quotes no longer present are dropped
+        (so a rename passes both the old and the new name). None means "any quote" and rebuilds.
+        """
+        if quote_names is None:
+            self.rebuild(all_quotes_data)
+            return
+        for quote_name in quote_names:
+            if quote_name == "date":
+                continue
+            self._remove_quote(quote_name)
+            if quote_name in all_quotes_data:
+                self._add_quote(quote_name, all_quotes_data[quote_name])
+
+    def _add_quote(self, quote_name, quote_data):
+        name_key = normalize_search_text(quote_name)
+        terms = _quote_terms(quote_data)
+        self._keys_by_quote[quote_name] = (name_key, terms)
+        bisect.insort(self._name_keys, (name_key, quote_name))
+        for term in terms:
+            bisect.insort(self._term_keys, (term, quote_name))
+        for bigram in _bigrams(name_key):
+            self._quotes_by_bigram.setdefault(bigram, set()).add(quote_name)
+
+    def _remove_quote(self, quote_name):
+        keys = self._keys_by_quote.pop(quote_name, None)
+        if keys is None:
+            return
+        name_key, terms = keys
+        _remove_sorted(self._name_keys, (name_key, quote_name))
+        for term in terms:
+            _remove_sorted(self._term_keys, (term, quote_name))
+        for bigram in _bigrams(name_key):
+            quote_names = self._quotes_by_bigram[bigram]
+            quote_names.discard(quote_name)
+            if not quote_names:
+                del self._quotes_by_bigram[bigram]
+
+    def search(self, query, limit=20):
+        """
+        Returns up to limit quote names matching query, best first: names equal to it (ignoring case
+        and diacritics), then names starting with it, then quotes with a sector or price starting
+        with it. Only when nothing starts with it are names within a typo or two of it returned.
+        """
+        key = normalize_search_text(query)
+        if not key or limit <= 0:
+            return []
+        results = []
+        seen = set()
+
+        def take(quote_name):
+            if quote_name not in seen:
+                seen.add(quote_name)
+                results.append(quote_name)
+            return len(results) >= limit
+
+        for _, quote_name in _prefix_matches(self._name_keys, key): # Exact names sort first
+            if take(quote_name):
+                return results
+        for _, quote_name in _prefix_matches(self._term_keys, key):
+            if take(quote_name):
+                return results
+        if results:
+            return results
+        return self._fuzzy_matches(key)[:limit]
+
+    def _fuzzy_matches(self, key):
+        if len(key) < 2:
+            return []
+        query_bigrams = _bigrams(key)
+        shared_counts = {}
+        for bigram in query_bigrams:
+            for quote_name in self._quotes_by_bigram.get(bigram, ()):
+                shared_counts[quote_name] = shared_counts.get(quote_name, 0) + 1
+        scored = []
+        for quote_name, shared in shared_counts.items():
+            name_bigram_count = len(self._keys_by_quote[quote_name][0]) + 1
+            score = 2 * shared / (len(query_bigrams) + name_bigram_count)
+            if score >= self.FUZZY_MIN_SCORE:
+                scored.append((-score, quote_name))
+        scored.sort()
+        return [quote_name for _, quote_name in scored]
+
+
+def _prefix_matches(sorted_keys, prefix):
+    """Yields the (term, quote name) pairs of sorted_keys whose term starts with prefix."""
+    index = bisect.bisect_left(sorted_keys, (prefix,))
+    while index < len(sorted_keys) and sorted_keys[index][0].startswith(prefix):
+        yield sorted_keys[index]
+        index += 1
+
+
+def _remove_sorted(sorted_list, item):
+    index = bisect.bisect_left(sorted_list, item)
+    if index < len(sorted_list) and sorted_list[index] == item:
+        del sorted_list[index]
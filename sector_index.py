@@ -0,0 +1,112 @@
+# t:\Work\xml_input_ui\sector_index.py
+import bisect
+import heapq
+
+
+def _sector_keys(quote_data):
+    """The (sector name, type) pairs a quote is listed under; a missing type counts as "main"."""
+    if not isinstance(quote_data, dict):
+        return set()
+    return {(sector.get("name"), sector.get("type") or "main")
+            for sector in quote_data.get("sectors", []) if sector.get("name")}
+
+
+class SectorIndex:
+    """
+    Inverted index over all_quotes_data: (sector name, sector type) -> sorted list of quote names,
+    plus the sorted list of every quote name. The editor keeps it current per quote through
+    update_quotes() from its post-command hook, so filtering by sector is a lookup instead of a
+    scan of every quote's sectors.
+    """
+
+    def __init__(self):
+        self._quotes_by_sector = {} # (sector name, type) -> sorted quote names
+        self._types_by_sector = {} # sector name -> set of types it is indexed under
+        self._sector_keys_by_quote = {} # quote name -> set of (sector name, type)
+        self._all_quote_names = [] # sorted
+
+    def clear(self):
+        self._quotes_by_sector.clear()
+        self._types_by_sector.clear()
+        self._sector_keys_by_quote.clear()
+        self._all_quote_names = []
+
+    def rebuild(self, all_quotes_data):
+        """Indexes all_quotes_data from scratch (after loading a file)."""
+        self.clear()
+        for quote_name, quote_data in all_quotes_data.items():
+            if quote_name == "date":
+                continue
+            keys = _sector_keys(quote_data)
+            self._sector_keys_by_quote[quote_name] = keys
+            for key in keys:
+                self._quotes_by_sector.setdefault(key, []).append(quote_name)
+                self._types_by_sector.setdefault(key[0], set()).add(key[1])
+        for quote_names in self._quotes_by_sector.values():
+            quote_names.sort()
+        self._all_quote_names = sorted(self._sector_keys_by_quote)
+
+    def update_quotes(self, quote_names, all_quotes_data):
+        """
+        Re-indexes the given quotes from all_quotes_data; quotes no longer present are dropped
+        (so a rename passes both the old and the new name). None means "any quote" and rebuilds.
+        """
+        if quote_names is None:
+            self.rebuild(all_quotes_data)
+            return
+        for quote_name in quote_names:
+            if quote_name == "date":
+                continue
+            self._remove_quote(quote_name)
+            if quote_name in all_quotes_data:
+                self._add_quote(quote_name, all_quotes_data[quote_name])
+
+    def _add_quote(self, quote_name, quote_data):
+        keys = _sector_keys(quote_data)
+        self._sector_keys_by_quote[quote_name] = keys
+        bisect.insort(self._all_quote_names, quote_name)
+        for key in keys:
+            bisect.insort(self._quotes_by_sector.setdefault(key, []), quote_name)
+            self._types_by_sector.setdefault(key[0], set()).add(key[1])
+
+    def _remove_quote(self, quote_name):
+        keys = self._sector_keys_by_quote.pop(quote_name, None)
+        if keys is None:
+            return
+        _remove_sorted(self._all_quote_names, quote_name)
+        for key in keys:
+            quote_names = self._quotes_by_sector[key]
+            _remove_sorted(quote_names, quote_name)
+            if not quote_names:
+                del self._quotes_by_sector[key]
+                sector_types = self._types_by_sector[key[0]]
+                sector_types.discard(key[1])
+                if not sector_types:
+                    del self._types_by_sector[key[0]]
+
+    def quotes_in_sector(self, sector_name=None, sector_type=None):
+        """
+        Returns the sorted names of quotes listed under sector_name (with sector_type, or any type if None).
+        sector_name None returns every quote.
+        """
+        if sector_name is None:
+            return list(self._all_quote_names)
+        if sector_type is not None:
+            return list(self._quotes_by_sector.get((sector_name, sector_type), []))
+        sorted_lists = [self._quotes_by_sector[(sector_name, t)] for t in self._types_by_sector.get(sector_name, ())]
+        if len(sorted_lists) == 1:
+            return list(sorted_lists[0])
+        quote_names = []
+        for quote_name in heapq.merge(*sorted_lists): # A quote listed as both main and sub appears once
+            if not quote_names or quote_names[-1] != quote_name:
+                quote_names.append(quote_name)
+        return quote_names
+
+    def sectors_of(self, quote_name):
+        return set(self._sector_keys_by_quote.get(quote_name, ()))
+
+
+def _remove_sorted(sorted_list, item):
+    index = bisect.bisect_left(sorted_list, item)
+    if index < len(sorted_list) and sorted_list[index] == item:
+        del sorted_list[index]
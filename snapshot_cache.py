@@ -0,0 +1,237 @@
+# t:\Work\xml_input_ui\snapshot_cache.py
+import hashlib
+import os
+import pickle
+import tempfile
+
+# Bump whenever the pickled payload layout of any snapshot kind changes
+SNAPSHOT_FORMAT_VERSION = 4
+SNAPSHOT_SUFFIX = ".snapshot"
+# The only classes a snapshot may name. A sidecar is just a file next to the XML (possibly from a
+# shared folder or an archive), so anything else is rejected instead of imported and called.
+SNAPSHOT_ALLOWED_CLASSES = frozenset({
+    ("quote_model", "QuoteModel"), ("quote_model", "CompanyValue"), ("quote_model", "EpsCompany"),
+    ("quote_model", "EpsYear"), ("quote_model", "Report"), ("quote_model", "Sector"),
+    ("PyQt6.QtCore", "QDate"),
+})
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, f, allowed_classes):
+        super().__init__(f)
+        self.allowed_classes = allowed_classes
+
+    def find_class(self, module, name):
+        if (module, name) not in self.allowed_classes:
+            raise pickle.UnpicklingError(f"snapshot refers to disallowed class {module}.{name}")
+        return super().find_class(module, name)
+
+
+def _load_header(f):
+    """The header is plain data (dict, tuple, str, int), so it may not name any class."""
+    return _SnapshotUnpickler(f, frozenset()).load()
+
+
+def _load_record(f):
+    # A fresh unpickler per record, so its memo does not keep earlier records alive
+    return _SnapshotUnpickler(f, SNAPSHOT_ALLOWED_CLASSES).load()
+
+
+def snapshot_path(xml_path):
+    """The sidecar cache sits next to the XML file, e.g. report_db.xml -> report_db.xml.snapshot."""
+    return xml_path + SNAPSHOT_SUFFIX
+
+
+def file_key(xml_path):
+    """(absolute path, size, mtime_ns, content hash) identifying the exact XML contents a snapshot was built from."""
+    stat_result = os.stat(xml_path)
+    digest = hashlib.blake2b(digest_size=20)
+    with open(xml_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return (os.path.normcase(os.path.abspath(xml_path)), stat_result.st_size,
+            stat_result.st_mtime_ns, digest.hexdigest())
+
+
+def _snapshot_header(kind, key):
+    return {"version": SNAPSHOT_FORMAT_VERSION, "kind": kind, "key": key}
+
+
+def _header_matches(xml_path, header, kind):
+    """True if a snapshot header was written by this format version, for kind and for the current xml_path contents."""
+    if (not isinstance(header, dict) or header.get("version") != SNAPSHOT_FORMAT_VERSION
+            or header.get("kind") != kind):
+        return False
+    stored_key = header.get("key")
+    stat_result = os.stat(xml_path)
+    # Cheap size/mtime check first; only hash the XML when those still match
+    if (not isinstance(stored_key, tuple) or len(stored_key) != 4
+            or stored_key[1:3] != (stat_result.st_size, stat_result.st_mtime_ns)):
+        return False
+    return stored_key == file_key(xml_path)
+
+
+def load_snapshot(xml_path, kind):
+    """
+    Returns the payload cached for xml_path, or None if there is no usable snapshot.
+    A missing, stale (different path/size/mtime/hash), foreign-version or corrupt sidecar
+    is treated as a miss, so callers simply fall back to parsing the XML. The header is checked
+    before the payload is read, and the payload may only contain SNAPSHOT_ALLOWED_CLASSES.
+    """
+    cache_path = snapshot_path(xml_path)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            if not _header_matches(xml_path, _load_header(f), kind):
+                return None
+            return _load_record(f)
+    except Exception as e: # Any unreadable snapshot just means "parse the XML"
+        print(f"Warning: Ignoring unreadable snapshot '{cache_path}': {e}")
+        return None
+
+
+def load_snapshot_records(xml_path, kind):
+    """
+    Streaming counterpart of load_snapshot for sidecars written with SnapshotRecordWriter.
+    Returns a SnapshotRecordReader that reads the records back one at a time, or None on a miss
+    (checked before anything is returned). The reader raises if the sidecar turns out to be
+    truncated or corrupt part way through.
+    """
+    cache_path = snapshot_path(xml_path)
+    if not os.path.exists(cache_path):
+        return None
+    f = None
+    try:
+        f = open(cache_path, "rb")
+        if not _header_matches(xml_path, _load_header(f), kind):
+            f.close()
+            return None
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable snapshot '{cache_path}': {e}")
+        if f is not None:
+            f.close()
+        return None
+    return SnapshotRecordReader(f)
+
+
+class SnapshotRecordReader:
+    """
+    Iterator over the records of a sidecar opened by load_snapshot_records. position() and size
+    tell how much of the sidecar has been read, e.g. for a progress bar. The file is closed when
+    the records are exhausted, when reading fails or on close().
+    """
+    def __init__(self, f):
+        self._file = f
+        self.size = os.fstat(f.fileno()).st_size or 1
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._file is None:
+            raise StopIteration
+        try:
+            record = _load_record(self._file) # EOFError before the end marker means a truncated sidecar
+        except BaseException:
+            self.close()
+            raise
+        if record is None:
+            self.close()
+            raise StopIteration
+        return record
+
+    def position(self):
+        return self._file.tell() if self._file is not None else self.size
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SnapshotRecordWriter:
+    """
+    Writes a sidecar one record at a time, so neither the writer nor load_snapshot_records ever
+    holds the whole payload. Records go to a temp file that commit() moves into place atomically;
+    discard() (or any write failure) drops it. Records must not be None (None ends the stream).
+    Failures are reported and otherwise ignored, like save_snapshot.
+    """
+    def __init__(self, xml_path, kind, key):
+        """key must be file_key(xml_path) taken before the XML was parsed (see save_snapshot)."""
+        self.cache_path = snapshot_path(xml_path)
+        self._file = None
+        self._temp_path = None
+        try:
+            fd, self._temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.cache_path)),
+                                                   prefix=os.path.basename(self.cache_path) + ".", suffix=".tmp")
+            self._file = os.fdopen(fd, "wb")
+            pickle.dump(_snapshot_header(kind, key), self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self._fail(e)
+
+    def write(self, record):
+        if self._file is None:
+            return
+        try:
+            pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self._fail(e)
+
+    def commit(self):
+        """Ends the stream and replaces the sidecar. Returns True if the snapshot was written."""
+        if self._file is None:
+            return False
+        try:
+            pickle.dump(None, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            self._file.close()
+            self._file = None
+            os.replace(self._temp_path, self.cache_path)
+            self._temp_path = None
+            return True
+        except Exception as e:
+            self._fail(e)
+            return False
+
+    def discard(self):
+        """Drops the partially written snapshot (e.g. the XML was not read to the end)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._remove_temp_file()
+
+    def _fail(self, error):
+        print(f"Warning: Could not write snapshot '{self.cache_path}': {error}")
+        self.discard()
+
+    def _remove_temp_file(self):
+        if self._temp_path and os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+        self._temp_path = None
+
+
+def save_snapshot(xml_path, kind, payload, key):
+    """
+    Writes the sidecar for xml_path atomically. key must be file_key(xml_path) taken before
+    the XML was parsed, so a file modified mid-parse never gets a matching snapshot.
+    Failures (read-only folder, full disk, ...) are reported and otherwise ignored; the cache
+    is only an optimization.
+    Returns:
+        bool: True if the snapshot was written.
+    """
+    cache_path = snapshot_path(xml_path)
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_path)),
+                                         prefix=os.path.basename(cache_path) + ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            # Header and payload are separate pickles, so a stale or foreign header stops the read early
+            pickle.dump(_snapshot_header(kind, key), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        return True
+    except Exception as e:
+        print(f"Warning: Could not write snapshot '{cache_path}': {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
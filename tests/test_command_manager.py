@@ -1,8 +1,8 @@
 # t:\Work\xml_input_ui\tests\test_command_manager.py
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from command_manager import CommandManager
-from commands import Command # Import the base Command class for mocking
+from commands import Command, MacroCommand # Import the base Command class for mocking
 
 # Simple mock command for testing
 class MockCommand(Command):
@@ -51,6 +51,7 @@ class TestCommandManager(unittest.TestCase):
         self.assertFalse(self.command_manager.can_redo())
         self.mock_editor._log_history.assert_called_once_with("Executed: Cmd 1")
         self.mock_editor._set_dirty_flag.assert_called_once_with(True)
+        self.mock_editor._mark_quotes_modified.assert_called_once_with(None) # Base Command: any quote may change
         self.mock_editor._update_undo_redo_actions_state.assert_called_once()
         self.assertEqual(executed_cmd1, command1) # Check return value
 
@@ -204,3 +205,214 @@ class TestCommandManager(unittest.TestCase):
         self.assertFalse(cm_no_editor.can_redo())
         # Assert that no methods on a None editor were called
         # (This is implicitly tested by the lack of AttributeErrors)
+
+class SizedMockCommand(MockCommand):
+    """MockCommand with a fixed estimated size and a widget reference, for history cap tests."""
+    def __init__(self, description, size=100):
+        super().__init__(description)
+        self.size = size
+        self.widget = MagicMock()
+
+    def estimated_size(self):
+        return self.size
+
+class TestCommandManagerHistoryLimits(unittest.TestCase):
+    def test_depth_cap_evicts_oldest_and_releases_it(self):
+        cm = CommandManager(None, max_depth=2, max_bytes=None)
+        commands = [SizedMockCommand(f"Cmd {i}") for i in range(3)]
+        for command in commands:
+            cm.execute_command(command)
+
+        self.assertEqual(cm.undo_stack, commands[1:])
+        self.assertFalse(hasattr(commands[0], "widget")) # Widget reference dropped on eviction
+        self.assertEqual(str(commands[0]), "Cmd 0")
+        self.assertEqual(cm.retained_bytes, 200)
+
+    def test_byte_cap_counts_undo_and_redo_history(self):
+        cm = CommandManager(None, max_depth=None, max_bytes=250)
+        first, second = SizedMockCommand("Cmd 1"), SizedMockCommand("Cmd 2")
+        cm.execute_command(first)
+        cm.execute_command(second)
+        cm.undo()
+        self.assertEqual(cm.retained_bytes, 200) # Undo moves, it does not free
+
+        third = SizedMockCommand("Cmd 3", size=150)
+        cm.execute_command(third) # Clears redo (Cmd 2) -> 250 bytes, still within the cap
+        self.assertEqual(cm.undo_stack, [first, third])
+        self.assertEqual(cm.retained_bytes, 250)
+
+        cm.execute_command(SizedMockCommand("Cmd 4"))
+        self.assertEqual(cm.undo_stack[0], third)
+        self.assertEqual(cm.retained_bytes, 250)
+
+    def test_newest_command_is_kept_even_if_over_cap(self):
+        cm = CommandManager(None, max_depth=None, max_bytes=50)
+        big = SizedMockCommand("Big", size=1000)
+        cm.execute_command(SizedMockCommand("Small", size=10))
+        cm.execute_command(big)
+        self.assertEqual(cm.undo_stack, [big])
+        self.assertTrue(cm.can_undo())
+
+    def test_set_history_limits_evicts_immediately(self):
+        cm = CommandManager(None, max_depth=None, max_bytes=None)
+        for i in range(5):
+            cm.execute_command(SizedMockCommand(f"Cmd {i}"))
+        cm.set_history_limits(max_depth=3)
+        self.assertEqual([str(c) for c in cm.undo_stack], ["Cmd 2", "Cmd 3", "Cmd 4"])
+
+    def test_clear_stacks_resets_retained_bytes(self):
+        cm = CommandManager(None)
+        cm.execute_command(SizedMockCommand("Cmd 1"))
+        cm.clear_stacks()
+        self.assertEqual(cm.retained_bytes, 0)
+
+    def test_take_and_restore_history(self):
+        cm = CommandManager(None)
+        for i in range(3):
+            cm.execute_command(SizedMockCommand(f"Cmd {i}"))
+        cm.undo()
+        retained_bytes = cm.retained_bytes
+
+        history = cm.take_history()
+        self.assertFalse(cm.can_undo())
+        self.assertFalse(cm.can_redo())
+        self.assertEqual(cm.retained_bytes, 0)
+
+        cm.execute_command(SizedMockCommand("During load"))
+        cm.restore_history(history)
+        self.assertEqual([str(c) for c in cm.undo_stack], ["Cmd 0", "Cmd 1"])
+        self.assertEqual([str(c) for c in cm.redo_stack], ["Cmd 2"])
+        self.assertEqual(cm.retained_bytes, retained_bytes)
+
+class MergeableMockCommand(MockCommand):
+    """MockCommand that merges with following commands for the same field."""
+    def __init__(self, field, new_value, old_value=None):
+        super().__init__(f"Set {field}")
+        self.field = field
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def is_noop(self):
+        return self.old_value == self.new_value
+
+    def merge_with(self, other):
+        if not isinstance(other, MergeableMockCommand) or other.field != self.field:
+            return False
+        self.new_value = other.new_value
+        return True
+
+class TestCommandManagerTransactions(unittest.TestCase):
+    def setUp(self):
+        self.mock_editor = MagicMock()
+        self.command_manager = CommandManager(self.mock_editor)
+
+    def test_transaction_records_one_undo_step_and_notifies_once(self):
+        commands = [MockCommand(f"Cmd {i}") for i in range(3)]
+        with self.command_manager.transaction("Paste"):
+            for command in commands:
+                self.command_manager.execute_command(command)
+            self.mock_editor._log_history.assert_not_called()
+            self.assertFalse(self.command_manager.can_undo())
+
+        self.assertEqual(len(self.command_manager.undo_stack), 1)
+        macro = self.command_manager.undo_stack[0]
+        self.assertIsInstance(macro, MacroCommand)
+        self.assertEqual(macro.commands, commands)
+        self.mock_editor._log_history.assert_called_once_with("Executed: Paste")
+        self.mock_editor._set_dirty_flag.assert_called_once_with(True)
+
+        self.command_manager.undo()
+        self.assertTrue(all(command.unexecuted for command in commands))
+
+    def test_single_command_transaction_is_not_wrapped(self):
+        command = MockCommand()
+        with self.command_manager.transaction("Edit"):
+            self.command_manager.execute_command(command)
+        self.assertEqual(self.command_manager.undo_stack, [command])
+
+    def test_nested_transactions_commit_at_outermost_level(self):
+        self.command_manager.begin_transaction("Outer")
+        self.command_manager.execute_command(MockCommand("A"))
+        self.command_manager.begin_transaction("Inner")
+        self.command_manager.execute_command(MockCommand("B"))
+        self.assertIsNone(self.command_manager.commit_transaction())
+        self.assertTrue(self.command_manager.in_transaction())
+        macro = self.command_manager.commit_transaction()
+        self.assertEqual([str(c) for c in macro.commands], ["A", "B"])
+        self.assertFalse(self.command_manager.in_transaction())
+
+    def test_exception_rolls_back_transaction(self):
+        command = MockCommand()
+        with self.assertRaises(ValueError):
+            with self.command_manager.transaction("Paste"):
+                self.command_manager.execute_command(command)
+                raise ValueError("bad cell")
+        self.assertTrue(command.unexecuted)
+        self.assertFalse(self.command_manager.can_undo())
+        self.assertFalse(self.command_manager.in_transaction())
+        rolled_back_macro = self.mock_editor._update_ui_after_undo.call_args[0][0]
+        self.assertEqual(rolled_back_macro.commands, [command])
+        self.mock_editor._update_undo_redo_actions_state.assert_called_once()
+
+    def test_undo_and_redo_are_ignored_during_transaction(self):
+        self.command_manager.execute_command(MockCommand())
+        with self.command_manager.transaction():
+            self.assertIsNone(self.command_manager.undo())
+        self.assertEqual(len(self.command_manager.undo_stack), 1)
+
+    def test_call_after_commit_coalesces_by_key(self):
+        callback = MagicMock()
+        self.command_manager.call_after_commit(callback, key="chart")
+        callback.assert_called_once()
+        callback.reset_mock()
+
+        with self.command_manager.transaction():
+            for _ in range(5):
+                self.command_manager.call_after_commit(callback, key="chart")
+            callback.assert_not_called()
+        callback.assert_called_once()
+
+    def test_consecutive_edits_of_same_field_merge(self):
+        self.command_manager.execute_command(MergeableMockCommand("price", "1"))
+        self.command_manager.execute_command(MergeableMockCommand("price", "12"))
+        self.command_manager.execute_command(MergeableMockCommand("price", "123"))
+        self.assertEqual(len(self.command_manager.undo_stack), 1)
+        self.assertEqual(self.command_manager.undo_stack[0].new_value, "123")
+
+        self.command_manager.execute_command(MergeableMockCommand("volume", "5"))
+        self.assertEqual(len(self.command_manager.undo_stack), 2)
+
+    def test_no_merge_across_undo(self):
+        self.command_manager.execute_command(MergeableMockCommand("price", "1"))
+        self.command_manager.execute_command(MergeableMockCommand("volume", "5"))
+        self.command_manager.undo()
+        self.command_manager.execute_command(MergeableMockCommand("price", "2"))
+        self.assertEqual([c.new_value for c in self.command_manager.undo_stack], ["1", "2"])
+
+    @patch('command_manager.time.monotonic')
+    def test_edits_further_apart_than_merge_window_do_not_merge(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        self.command_manager.execute_command(MergeableMockCommand("price", "1"))
+        mock_monotonic.return_value = 100.5
+        self.command_manager.execute_command(MergeableMockCommand("price", "12"))
+        mock_monotonic.return_value = 100.5 + self.command_manager.merge_window + 1
+        self.command_manager.execute_command(MergeableMockCommand("price", "123"))
+        self.assertEqual([c.new_value for c in self.command_manager.undo_stack], ["12", "123"])
+
+    def test_merge_back_to_original_value_leaves_no_undo_step(self):
+        self.command_manager.execute_command(MergeableMockCommand("volume", "5", old_value=""))
+        self.command_manager.execute_command(MergeableMockCommand("price", "2", old_value="1"))
+        self.command_manager.execute_command(MergeableMockCommand("price", "1", old_value="2"))
+        self.assertEqual([c.field for c in self.command_manager.undo_stack], ["volume"])
+        # The dropped command is no merge target any more
+        self.command_manager.execute_command(MergeableMockCommand("price", "3", old_value="1"))
+        self.assertEqual([c.field for c in self.command_manager.undo_stack], ["volume", "price"])
+
+    def test_merge_back_to_original_value_in_transaction_records_nothing(self):
+        with self.command_manager.transaction("Edit"):
+            self.command_manager.execute_command(MergeableMockCommand("price", "2", old_value="1"))
+            self.command_manager.execute_command(MergeableMockCommand("price", "1", old_value="2"))
+        self.assertFalse(self.command_manager.can_undo())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,10 @@ from commands import (
     ChangeEPSValueCommand, AddEPSYearCommand, RemoveEPSYearCommand,
     ChangeEPSYearDisplayCommand, ChangeEPSCompaniesForYearDisplayCommand,
     AddRecordReportCommand, RemoveRecordReportCommand, ChangeRecordReportDetailCommand,
-    ChangeEPriceFixedCompaniesCommand
+    ChangeEPriceFixedCompaniesCommand, MacroCommand, estimate_data_size
 )
 from PyQt6.QtCore import QDate
+from quote_model import QuoteModel
 
 # Minimal concrete command for testing base Command class features
 class ConcreteTestCommand(Command):
@@ -36,19 +37,99 @@ class TestCommands(unittest.TestCase):
 
         # Mocks for UI widgets
         self.mock_date_edit_widget = MagicMock()
-        self.mock_quote_details_widget = MagicMock()
-        self.mock_eprice_section_widget = MagicMock()
-        self.mock_pe_section_widget = MagicMock()
         self.mock_eps_section_widget = MagicMock()
         self.mock_record_widget = MagicMock()
         self.mock_eps_section_widget.eps_year_entries = [] # Initialize for tests
 
+    @staticmethod
+    def _observe(all_quotes_data, quote_name, section):
+        """Records the (key, field, value) change events the quote's model announces for section."""
+        events = []
+        QuoteModel.of(all_quotes_data, quote_name).observe(section, lambda *event: events.append(event))
+        return events
+
     def test_command_base_str(self):
         cmd_with_desc = ConcreteTestCommand(description="Test Desc")
         self.assertEqual(str(cmd_with_desc), "Test Desc")
         cmd_no_desc = ConcreteTestCommand() # No description
         self.assertEqual(str(cmd_no_desc), "ConcreteTestCommand") # Should return class name
 
+    def test_affected_quote_names(self):
+        self.assertIsNone(ConcreteTestCommand().affected_quote_names())
+        self.assertEqual(ChangeRootDateCommand(self.mock_date_edit_widget, self.mock_all_quotes_data,
+                                               "10/26/2023", "10/27/2023").affected_quote_names(), ())
+        rename_cmd = ChangeQuoteDetailCommand(self.mock_all_quotes_data,
+                                              "AAPL", "name", "AAPL", "AAPL_NEW")
+        self.assertEqual(set(rename_cmd.affected_quote_names()), {"AAPL", "AAPL_NEW"})
+        price_cmd = ChangeQuoteDetailCommand(self.mock_all_quotes_data,
+                                             "AAPL", "price", "170.0", "175.0")
+        self.assertEqual(price_cmd.affected_quote_names(), ("AAPL",))
+        eprice_cmd = ChangeEPriceValueCommand(self.mock_all_quotes_data,
+                                              "GOOG", "VCSC", "", "5")
+        self.assertEqual(eprice_cmd.affected_quote_names(), ("GOOG",))
+        self.assertEqual(ChangeEPSYearDisplayCommand(self.mock_eps_section_widget, [], ["2023"]).affected_quote_names(), ())
+
+    def test_estimated_size_counts_owned_snapshots(self):
+        big_quote = {"name": "BIG", "record": [{"company": "VCSC", "date": f"01/{i:02d}/2023"} for i in range(1, 29)]}
+        remove_cmd = RemoveQuoteCommand(self.mock_all_quotes_data, "BIG", big_quote, self.mock_editor_ref)
+        price_cmd = ChangeQuoteDetailCommand(self.mock_all_quotes_data,
+                                             "AAPL", "price", "170.0", "175.0")
+        self.assertGreater(remove_cmd.estimated_size(), price_cmd.estimated_size())
+        self.assertGreater(remove_cmd.estimated_size(), estimate_data_size(big_quote))
+
+    def test_release_drops_references_but_keeps_description(self):
+        cmd = ChangePEValueCommand(self.mock_all_quotes_data, "AAPL", "SSI", "", "10")
+        description = str(cmd)
+        cmd.release()
+        self.assertEqual(str(cmd), description)
+        self.assertFalse(hasattr(cmd, "pe_section_widget"))
+        self.assertFalse(hasattr(cmd, "all_quotes_data_ref"))
+
+    def test_merge_with_same_field_keeps_original_old_value(self):
+        self.mock_all_quotes_data["AAPL"]["e_price"] = [{"name": "VCSC", "value": "1"}]
+        first = ChangeEPriceValueCommand(self.mock_all_quotes_data, "AAPL", "VCSC", "1", "2")
+        second = ChangeEPriceValueCommand(self.mock_all_quotes_data, "AAPL", "VCSC", "2", "3")
+        other_company = ChangeEPriceValueCommand(self.mock_all_quotes_data, "AAPL", "SSI", "", "4")
+        pe_cmd = ChangePEValueCommand(self.mock_all_quotes_data, "AAPL", "VCSC", "", "4")
+        self.assertTrue(first.merge_with(second))
+        self.assertFalse(first.merge_with(other_company))
+        self.assertFalse(first.merge_with(pe_cmd))
+        self.assertEqual((first.old_value, first.new_value), ("1", "3"))
+        self.assertIn("from '1' to '3'", str(first))
+
+        eps_cmd = ChangeEPSValueCommand(self.mock_all_quotes_data, "AAPL", "2024", "MSFT", "value", "1.0", "1.1")
+        self.assertFalse(eps_cmd.merge_with(ChangeEPSValueCommand(self.mock_all_quotes_data,
+                                                                  "AAPL", "2024", "MSFT", "growth", "", "5%")))
+        self.assertTrue(eps_cmd.merge_with(ChangeEPSValueCommand(self.mock_all_quotes_data,
+                                                                 "AAPL", "2024", "MSFT", "value", "1.1", "1.2")))
+        self.assertEqual(eps_cmd.new_value, "1.2")
+
+    def test_merge_back_to_original_value_is_noop(self):
+        first = ChangePEValueCommand(self.mock_all_quotes_data, "AAPL", "VCSC", "1", "2")
+        self.assertFalse(first.is_noop())
+        first.merge_with(ChangePEValueCommand(self.mock_all_quotes_data, "AAPL", "VCSC", "2", "1"))
+        self.assertTrue(first.is_noop())
+
+    def test_macro_command_runs_in_order_and_undoes_in_reverse(self):
+        calls = []
+        class RecordingCommand(ConcreteTestCommand):
+            def execute(self):
+                calls.append(("execute", self.description))
+            def unexecute(self):
+                calls.append(("unexecute", self.description))
+        macro = MacroCommand("Paste", [RecordingCommand("a"), RecordingCommand("b")])
+        macro.execute()
+        macro.unexecute()
+        self.assertEqual(calls, [("execute", "a"), ("execute", "b"), ("unexecute", "b"), ("unexecute", "a")])
+        self.assertEqual(str(macro), "Paste")
+        self.assertEqual(str(MacroCommand(commands=macro.commands)), "2 changes")
+
+    def test_macro_command_affected_quote_names_is_union(self):
+        aapl_cmd = ChangePEValueCommand(self.mock_all_quotes_data, "AAPL", "SSI", "", "10")
+        goog_cmd = ChangePEValueCommand(self.mock_all_quotes_data, "GOOG", "SSI", "", "10")
+        self.assertEqual(set(MacroCommand("Bulk", [aapl_cmd, goog_cmd]).affected_quote_names()), {"AAPL", "GOOG"})
+        self.assertIsNone(MacroCommand("Bulk", [aapl_cmd, ConcreteTestCommand()]).affected_quote_names())
+
     def test_change_root_date_command(self):
         old_date_str = "10/26/2023"
         new_date_str = "10/27/2023"
@@ -89,13 +170,13 @@ class TestCommands(unittest.TestCase):
         # old_value_for_field = old_name (the actual old name string)
         # new_value_for_field = new_name (the actual new name string)
         cmd = ChangeQuoteDetailCommand(
-            self.mock_quote_details_widget, 
             copy.deepcopy(self.mock_all_quotes_data), # Command gets a deep copy
             old_name,  # quote_name_key
             field, 
             old_name,  # old_value (of the 'name' field)
             new_name   # new_value (for the 'name' field)
         )
+        events = self._observe(cmd.all_quotes_data_ref, old_name, "details")
 
         # --- Test execute ---
         cmd.execute()
@@ -109,9 +190,9 @@ class TestCommands(unittest.TestCase):
         # Assert that the original self.mock_all_quotes_data is unchanged
         self.assertEqual(self.mock_all_quotes_data, initial_original_data, "Original data should not be modified by execute")
 
-        # UI update check
-        self.mock_quote_details_widget.update_field_value.assert_called_once_with(field, new_name, from_command=True)
-        self.mock_quote_details_widget.update_field_value.reset_mock()
+        # The displayed details widget follows the model's change event
+        self.assertEqual(events, [(None, field, new_name)])
+        events.clear()
 
         # --- Test unexecute ---
         cmd.unexecute()
@@ -123,46 +204,39 @@ class TestCommands(unittest.TestCase):
         # Assert that the original self.mock_all_quotes_data is still unchanged
         self.assertEqual(self.mock_all_quotes_data, initial_original_data, "Original data should not be modified by unexecute")
 
-        # UI update check
-        self.mock_quote_details_widget.update_field_value.assert_called_once_with(field, old_name, from_command=True)
+        self.assertEqual(events, [(None, field, old_name)])
 
     def test_change_quote_detail_command_price(self):
         quote_name_key = "AAPL"
         field = "price"
         old_value = "170.0"
         new_value = "175.0"
-        cmd = ChangeQuoteDetailCommand(self.mock_quote_details_widget, self.mock_all_quotes_data, quote_name_key, field, old_value, new_value)
+        cmd = ChangeQuoteDetailCommand(self.mock_all_quotes_data, quote_name_key, field, old_value, new_value)
+        events = self._observe(self.mock_all_quotes_data, quote_name_key, "details")
 
         cmd.execute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key][field], new_value)
-        self.mock_quote_details_widget.update_field_value.assert_called_once_with(field, new_value, from_command=True)
-
-        self.mock_quote_details_widget.update_field_value.reset_mock()
-
         cmd.unexecute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key][field], old_value)
-        self.mock_quote_details_widget.update_field_value.assert_called_with(field, old_value, from_command=True)
+        self.assertEqual(events, [(None, field, new_value), (None, field, old_value)])
 
     @patch('commands.print')
     def test_change_quote_detail_command_name_key_not_found(self, mock_print):
         # Test when the quote key is not found during name change
-        cmd_exec = ChangeQuoteDetailCommand(self.mock_quote_details_widget, {}, "NON_EXISTENT", "name", "NON_EXISTENT", "NEW_NAME")
+        cmd_exec = ChangeQuoteDetailCommand({}, "NON_EXISTENT", "name", "NON_EXISTENT", "NEW_NAME")
         cmd_exec.execute()
         mock_print.assert_called_with("Error: Quote key 'NON_EXISTENT' not found during name change execute. Command: Change NON_EXISTENT's name from 'NON_EXISTENT' to 'NEW_NAME'")
-        self.mock_quote_details_widget.update_field_value.assert_not_called() # Should not update UI if data change failed
 
         mock_print.reset_mock()
-        self.mock_quote_details_widget.update_field_value.reset_mock()
 
         # Test unexecute when the new_name (which became the key) is not found
-        cmd_unexec = ChangeQuoteDetailCommand(self.mock_quote_details_widget, {}, "OLD_NAME", "name", "OLD_NAME", "NEW_KEY_NOT_THERE")
+        cmd_unexec = ChangeQuoteDetailCommand({}, "OLD_NAME", "name", "OLD_NAME", "NEW_KEY_NOT_THERE")
         cmd_unexec.unexecute() # This assumes execute was successful and new_value is the key
         mock_print.assert_called_with("Error: Quote key 'NEW_KEY_NOT_THERE' not found during name change unexecute. Command: Change OLD_NAME's name from 'OLD_NAME' to 'NEW_KEY_NOT_THERE'")
-        self.mock_quote_details_widget.update_field_value.assert_not_called()
 
     @patch('commands.print')
     def test_change_quote_detail_command_price_key_not_found(self, mock_print):
-        cmd = ChangeQuoteDetailCommand(self.mock_quote_details_widget, {}, "NON_EXISTENT_PRICE", "price", "100", "110")
+        cmd = ChangeQuoteDetailCommand({}, "NON_EXISTENT_PRICE", "price", "100", "110")
         cmd.execute()
         mock_print.assert_called_with("Error: Quote key 'NON_EXISTENT_PRICE' not found during price change execute. Command: Change NON_EXISTENT_PRICE's price from '100' to '110'")
         cmd.unexecute() # Should also call print
@@ -199,17 +273,14 @@ class TestCommands(unittest.TestCase):
         # Ensure the company exists in the mock data initially
         self.mock_all_quotes_data[quote_name_key]["e_price"] = [{"name": company_name, "value": old_value}]
 
-        cmd = ChangeEPriceValueCommand(self.mock_eprice_section_widget, self.mock_all_quotes_data, quote_name_key, company_name, old_value, new_value)
+        cmd = ChangeEPriceValueCommand(self.mock_all_quotes_data, quote_name_key, company_name, old_value, new_value)
+        events = self._observe(self.mock_all_quotes_data, quote_name_key, "e_price")
 
         cmd.execute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["e_price"][0]["value"], new_value)
-        self.mock_eprice_section_widget.update_company_value.assert_called_once_with(company_name, new_value, from_command=True)
-
-        self.mock_eprice_section_widget.update_company_value.reset_mock()
-
         cmd.unexecute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["e_price"][0]["value"], old_value)
-        self.mock_eprice_section_widget.update_company_value.assert_called_with(company_name, old_value, from_command=True)
+        self.assertEqual(events, [(company_name, "value", new_value), (company_name, "value", old_value)])
 
     def test_change_eprice_value_command_add_new_company_on_execute(self):
         quote_name_key = "AAPL"
@@ -218,11 +289,10 @@ class TestCommands(unittest.TestCase):
         new_value = "5.0"
         self.mock_all_quotes_data[quote_name_key]["e_price"] = [] # Start with no e_price companies
 
-        cmd = ChangeEPriceValueCommand(self.mock_eprice_section_widget, self.mock_all_quotes_data, quote_name_key, new_company_name, old_value, new_value)
+        cmd = ChangeEPriceValueCommand(self.mock_all_quotes_data, quote_name_key, new_company_name, old_value, new_value)
         cmd.execute()
 
         self.assertIn({"name": new_company_name, "value": new_value}, self.mock_all_quotes_data[quote_name_key]["e_price"])
-        self.mock_eprice_section_widget.update_company_value.assert_called_once_with(new_company_name, new_value, from_command=True)
 
 
     def test_change_pe_value_command(self):
@@ -233,17 +303,14 @@ class TestCommands(unittest.TestCase):
         # Ensure the company exists in the mock data initially
         self.mock_all_quotes_data[quote_name_key]["pe"] = [{"name": company_name, "value": old_value}]
 
-        cmd = ChangePEValueCommand(self.mock_pe_section_widget, self.mock_all_quotes_data, quote_name_key, company_name, old_value, new_value)
+        cmd = ChangePEValueCommand(self.mock_all_quotes_data, quote_name_key, company_name, old_value, new_value)
+        events = self._observe(self.mock_all_quotes_data, quote_name_key, "pe")
 
         cmd.execute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["pe"][0]["value"], new_value)
-        self.mock_pe_section_widget.update_company_value.assert_called_once_with(company_name, new_value, from_command=True)
-
-        self.mock_pe_section_widget.update_company_value.reset_mock()
-
         cmd.unexecute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["pe"][0]["value"], old_value)
-        self.mock_pe_section_widget.update_company_value.assert_called_with(company_name, old_value, from_command=True)
+        self.assertEqual(events, [(company_name, "value", new_value), (company_name, "value", old_value)])
 
     def test_change_pe_value_command_add_new_company_on_execute(self):
         quote_name_key = "AAPL"
@@ -252,11 +319,10 @@ class TestCommands(unittest.TestCase):
         new_value = "22.0"
         self.mock_all_quotes_data[quote_name_key]["pe"] = [] # Start with no pe companies
 
-        cmd = ChangePEValueCommand(self.mock_pe_section_widget, self.mock_all_quotes_data, quote_name_key, new_company_name, old_value, new_value)
+        cmd = ChangePEValueCommand(self.mock_all_quotes_data, quote_name_key, new_company_name, old_value, new_value)
         cmd.execute()
 
         self.assertIn({"name": new_company_name, "value": new_value}, self.mock_all_quotes_data[quote_name_key]["pe"])
-        self.mock_pe_section_widget.update_company_value.assert_called_once_with(new_company_name, new_value, from_command=True)
 
     def test_change_eps_value_command(self):
         quote_name_key = "AAPL"
@@ -268,22 +334,15 @@ class TestCommands(unittest.TestCase):
         # Ensure the structure exists in the mock data initially
         self.mock_all_quotes_data[quote_name_key]["eps"] = [{"name": year_name, "companies": [{"name": company_name, "value": old_value, "growth": "5%"}]}]
 
-        cmd = ChangeEPSValueCommand(self.mock_eps_section_widget, self.mock_all_quotes_data, quote_name_key,
+        cmd = ChangeEPSValueCommand(self.mock_all_quotes_data, quote_name_key,
                                     year_name, company_name, field_name, old_value, new_value)
+        events = self._observe(self.mock_all_quotes_data, quote_name_key, "eps")
 
         cmd.execute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["eps"][0]["companies"][0][field_name], new_value)
-        self.mock_eps_section_widget.update_company_eps_field.assert_called_once_with(
-            year_name, company_name, field_name, new_value, from_command=True
-        )
-
-        self.mock_eps_section_widget.update_company_eps_field.reset_mock()
-
         cmd.unexecute()
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["eps"][0]["companies"][0][field_name], old_value)
-        self.mock_eps_section_widget.update_company_eps_field.assert_called_with(
-            year_name, company_name, field_name, old_value, from_command=True
-        )
+        self.assertEqual(events, [((year_name, company_name), field_name, new_value), ((year_name, company_name), field_name, old_value)])
 
     def test_change_eps_value_command_creates_structure(self):
         quote_name_key = "AAPL"
@@ -296,7 +355,7 @@ class TestCommands(unittest.TestCase):
         # Ensure 'eps' key exists but is empty for the quote
         self.mock_all_quotes_data[quote_name_key]["eps"] = []
 
-        cmd = ChangeEPSValueCommand(self.mock_eps_section_widget, self.mock_all_quotes_data, quote_name_key,
+        cmd = ChangeEPSValueCommand(self.mock_all_quotes_data, quote_name_key,
                                     year_name, company_name, field_name, old_value, new_value)
         cmd.execute()
 
@@ -310,7 +369,7 @@ class TestCommands(unittest.TestCase):
 
         # Test creating company if year exists but company doesn't
         self.mock_all_quotes_data[quote_name_key]["eps"] = [{"name": "2026", "companies": []}]
-        cmd2 = ChangeEPSValueCommand(self.mock_eps_section_widget, self.mock_all_quotes_data, quote_name_key,
+        cmd2 = ChangeEPSValueCommand(self.mock_all_quotes_data, quote_name_key,
                                      "2026", "ANOTHER_CO", "growth", "", "10%")
         cmd2.execute()
         year_2026_data = next(y for y in self.mock_all_quotes_data[quote_name_key]["eps"] if y["name"] == "2026")
@@ -320,7 +379,7 @@ class TestCommands(unittest.TestCase):
 
         # Test creating companies list if year exists but "companies" key is missing
         self.mock_all_quotes_data[quote_name_key]["eps"] = [{"name": "2027"}] # No "companies" key
-        cmd3 = ChangeEPSValueCommand(self.mock_eps_section_widget, self.mock_all_quotes_data, quote_name_key, "2027", "CO_C", "value", "", "3.0")
+        cmd3 = ChangeEPSValueCommand(self.mock_all_quotes_data, quote_name_key, "2027", "CO_C", "value", "", "3.0")
         cmd3.execute()
         year_2027_data = next(y for y in self.mock_all_quotes_data[quote_name_key]["eps"] if y["name"] == "2027")
         self.assertIn("companies", year_2027_data)
@@ -477,14 +536,13 @@ class TestCommands(unittest.TestCase):
 
         cmd.execute()
         self.assertIn(report_data_to_add, self.mock_all_quotes_data[quote_name_key]["record"])
-        self.mock_record_widget.load_data.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"])
+        self.mock_record_widget.insert_report.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"], report_data_to_add)
         self.assertNotEqual(cmd.description, "Add Record Report") # Check description updated
 
-        self.mock_record_widget.load_data.reset_mock()
-
         cmd.unexecute()
         self.assertNotIn(report_data_to_add, self.mock_all_quotes_data[quote_name_key]["record"])
-        self.mock_record_widget.load_data.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"])
+        self.mock_record_widget.remove_report.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"], report_data_to_add)
+        self.mock_record_widget.load_data.assert_not_called() # No full reload for one report
 
     def test_add_record_report_command_quote_not_found(self):
         quote_name_key = "NON_EXISTENT_QUOTE"
@@ -521,17 +579,16 @@ class TestCommands(unittest.TestCase):
 
         cmd.execute()
         self.assertNotIn(report_to_remove_model, self.mock_all_quotes_data[quote_name_key]["record"])
-        self.mock_record_widget.load_data.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"])
-
-        self.mock_record_widget.load_data.reset_mock()
+        self.mock_record_widget.remove_report.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"], report_to_remove_model)
 
         cmd.unexecute()
         self.assertIn(report_to_remove_model, self.mock_all_quotes_data[quote_name_key]["record"])
         # Check if it was inserted at the original index (assuming list wasn't modified otherwise)
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["record"][original_index], report_to_remove_model)
-        self.mock_record_widget.load_data.assert_called_once_with(
-            self.mock_all_quotes_data[quote_name_key]["record"]
+        self.mock_record_widget.insert_report.assert_called_once_with(
+            self.mock_all_quotes_data[quote_name_key]["record"], report_to_remove_model
         )
+        self.mock_record_widget.load_data.assert_not_called() # No full reload for one report
 
     def test_remove_record_report_command_quote_not_found(self):
         quote_name_key = "NON_EXISTENT_QUOTE"
@@ -566,7 +623,7 @@ class TestCommands(unittest.TestCase):
         cmd.unexecute() # Should create "record" list and add the report
         self.assertIn("record", self.mock_all_quotes_data[quote_name_key])
         self.assertIn(report_to_restore, self.mock_all_quotes_data[quote_name_key]["record"])
-        self.mock_record_widget.load_data.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"])
+        self.mock_record_widget.insert_report.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"], report_to_restore)
 
 
     def test_remove_record_report_command_unexecute_invalid_index(self):
@@ -578,14 +635,14 @@ class TestCommands(unittest.TestCase):
         cmd = RemoveRecordReportCommand(self.mock_record_widget, self.mock_all_quotes_data, quote_name_key, report_to_restore, {}, -1) # Invalid index
         cmd.unexecute() # Should append
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["record"][-1], report_to_restore)
-        self.mock_record_widget.load_data.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"])
+        self.mock_record_widget.insert_report.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"], report_to_restore)
 
-        self.mock_record_widget.load_data.reset_mock()
+        self.mock_record_widget.insert_report.reset_mock()
 
         cmd2 = RemoveRecordReportCommand(self.mock_record_widget, self.mock_all_quotes_data, quote_name_key, report_to_restore, {}, 99) # Invalid index
         cmd2.unexecute() # Should append
         self.assertEqual(self.mock_all_quotes_data[quote_name_key]["record"][-1], report_to_restore)
-        self.mock_record_widget.load_data.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"])
+        self.mock_record_widget.insert_report.assert_called_once_with(self.mock_all_quotes_data[quote_name_key]["record"], report_to_restore)
 
 
     def test_change_record_report_detail_command(self):
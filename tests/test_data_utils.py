@@ -1,6 +1,7 @@
 # t:\Work\xml_input_ui\tests\test_data_utils.py
 import unittest
 import os
+import tempfile
 from unittest.mock import patch, mock_open, MagicMock, call
 import xml.etree.ElementTree as ET
 from PyQt6.QtCore import QDate
@@ -220,6 +221,88 @@ class TestDataUtils(unittest.TestCase):
 
         os.remove(tmp_file_path)
 
+    @patch('data_utils.QMessageBox.critical')
+    def test_iterparse_xml_data_file_not_found(self, mock_critical):
+        file_path, root_date, quotes_data = data_utils.iterparse_xml_data("non_existent_file.xml")
+        self.assertIsNone(file_path)
+        self.assertIsNone(root_date)
+        self.assertIsNone(quotes_data)
+        mock_critical.assert_called_once()
+
+    @patch('data_utils.QMessageBox.critical')
+    def test_iterparse_xml_data_parse_error(self, mock_critical):
+        tmp_file_path = "temp_test_truncated.xml"
+        with open(tmp_file_path, "w") as f:
+            f.write("<root><date>10/26/2023</date><quotes><quote><name>AAPL</name>")
+
+        file_path, root_date, quotes_data = data_utils.iterparse_xml_data(tmp_file_path)
+
+        self.assertIsNone(file_path)
+        self.assertIsNone(root_date)
+        self.assertIsNone(quotes_data)
+        mock_critical.assert_called_once()
+        os.remove(tmp_file_path)
+
+    @patch('data_utils.QMessageBox.warning')
+    def test_iterparse_xml_data_matches_parse_xml_data(self, mock_warning):
+        xml_content = """
+        <root>
+            <date>10/26/2023</date>
+            <quotes>
+                <quote>
+                    <name>AAPL</name>
+                    <price>175.0</price>
+                    <e_price>
+                        <company><name>VCSC</name><value>5.0</value></company>
+                    </e_price>
+                    <eps>
+                        <year><name>2023</name><company><name>MSFT</name><value>1.0</value><growth>5%</growth></company></year>
+                    </eps>
+                    <record>
+                        <report><company>MSFT</company><date>01/01/2020</date><color>red</color></report>
+                    </record>
+                    <sectors>
+                        <sector><name>BANK</name><type>sub</type></sector>
+                    </sectors>
+                </quote>
+                <quote><price>1</price></quote>
+                <quote><name>GOOG</name><price>1</price></quote>
+                <quote><name>GOOG</name><price>2</price></quote>
+            </quotes>
+        </root>
+        """
+        temp_dir = tempfile.TemporaryDirectory() # iterparse_xml_data writes a snapshot sidecar next to the file
+        self.addCleanup(temp_dir.cleanup)
+        tmp_file_path = os.path.join(temp_dir.name, "temp_test_iterparse.xml")
+        with open(tmp_file_path, "w") as f:
+            f.write(xml_content)
+
+        expected = data_utils.parse_xml_data(tmp_file_path)
+        self.assertEqual(mock_warning.call_count, 1)
+        mock_warning.reset_mock()
+        file_path, root_date, quotes_data = data_utils.iterparse_xml_data(tmp_file_path)
+
+        self.assertEqual(file_path, tmp_file_path)
+        # The nested <report><date> must not be mistaken for the root date
+        self.assertEqual(root_date, QDate(2023, 10, 26))
+        self.assertEqual(quotes_data, expected[2])
+        self.assertEqual(list(quotes_data), ["AAPL", "GOOG"])
+        self.assertEqual(quotes_data["GOOG"]["price"], "2") # Last duplicate wins
+        mock_warning.assert_called_once_with(None, "XML Warning", "Found a quote without a name. Skipping.")
+
+    def test_iter_xml_quotes_clears_finished_quotes(self):
+        xml_content = "<root><date>bad</date><quotes><quote><name>A</name></quote><quote><name>B</name></quote></quotes></root>"
+        tmp_file_path = "temp_test_iter_quotes.xml"
+        with open(tmp_file_path, "w") as f:
+            f.write(xml_content)
+
+        events = list(data_utils.iter_xml_quotes(tmp_file_path))
+
+        # An invalid root date is not reported; quotes arrive in document order
+        self.assertEqual([kind for kind, _ in events], ["quote", "quote"])
+        self.assertEqual([payload["name"] for _, payload in events], ["A", "B"])
+        os.remove(tmp_file_path)
+
     def test_build_xml_tree(self):
         data_for_xml = {
             "date": "10/27/2023",
@@ -276,30 +359,23 @@ class TestDataUtils(unittest.TestCase):
         self.assertIsNone(goog_el.find("record"))
 
 
-    @patch('xml.dom.minidom.parseString')
     @patch('builtins.open', new_callable=mock_open)
     @patch('data_utils.QMessageBox.critical')
-    def test_save_xml_to_file_success(self, mock_critical, mock_open_method, mock_dom_parse): # Renamed mock_open to mock_open_method
-        mock_dom = MagicMock()
-        mock_dom.toprettyxml.return_value = "<pretty/>"
-        mock_dom_parse.return_value = mock_dom
+    def test_save_xml_to_file_success(self, mock_critical, mock_open_method): # Renamed mock_open to mock_open_method
+        root_element = ET.Element("root")
+        ET.SubElement(root_element, "date").text = "10/27/2023"
 
-        mock_root_element = ET.Element("root") # Mock root element
-        success = data_utils.save_xml_to_file("dummy_path.xml", mock_root_element)
+        success = data_utils.save_xml_to_file("dummy_path.xml", root_element)
 
         self.assertTrue(success)
         mock_open_method.assert_called_once_with("dummy_path.xml", "w", encoding="utf-8")
-        mock_open_method().write.assert_called_once_with("<pretty/>")
+        written = "".join(c.args[0] for c in mock_open_method().write.call_args_list)
+        self.assertEqual(written, '<?xml version="1.0" ?>\n<root>\n    <date>10/27/2023</date>\n</root>')
         mock_critical.assert_not_called()
 
-    @patch('xml.dom.minidom.parseString')
     @patch('builtins.open', new_callable=mock_open)
     @patch('data_utils.QMessageBox.critical')
-    def test_save_xml_to_file_error(self, mock_critical, mock_open_method, mock_dom_parse): # Renamed mock_open to mock_open_method
-        mock_dom = MagicMock()
-        mock_dom.toprettyxml.return_value = "<pretty/>"
-        mock_dom_parse.return_value = mock_dom
-
+    def test_save_xml_to_file_error(self, mock_critical, mock_open_method): # Renamed mock_open to mock_open_method
         mock_open_method.side_effect = IOError("Disk full")
 
         mock_root_element = ET.Element("root")
@@ -310,5 +386,46 @@ class TestDataUtils(unittest.TestCase):
         mock_open_method.assert_called_once_with("dummy_path.xml", "w", encoding="utf-8")
         mock_critical.assert_called_once()
 
+    def test_write_pretty_xml_matches_minidom_output(self):
+        from xml.dom import minidom
+        root_element = data_utils.build_xml_tree({
+            "date": "10/27/2023",
+            "quotes": [{
+                "name": "A&B <x>",
+                "price": "",
+                "e_price": [{"name": "VCSC", "value": "5.0"}],
+                "eps": [{"name": "2023", "companies": [{"name": "MSFT", "value": "", "growth": "15%"}]}],
+                "record": [{"company": "MSFT", "date": "01/01/2023", "color": "green"}],
+                "sectors": [{"name": "NGÂN HÀNG", "type": "main"}]
+            }]
+        })
+        ET.SubElement(root_element, "note").text = "line one\n   \nline two"
+
+        pretty = minidom.parseString(ET.tostring(root_element, encoding="unicode")).toprettyxml(indent="    ")
+        expected = "\n".join(line for line in pretty.split("\n") if line.strip())
+        chunks = []
+        data_utils.write_pretty_xml(chunks.append, root_element)
+
+        self.assertEqual("".join(chunks), expected)
+
+    def test_write_pretty_xml_fragments_matches_full_tree_output(self):
+        quotes = [
+            {"name": "AAPL", "price": "1&2", "e_price": [{"name": "VCSC", "value": "5.0"}],
+             "record": [{"company": "VCSC", "date": "01/01/2023", "color": "red"}]},
+            {"name": "", "price": "ignored"}, # Nameless quotes are skipped by both paths
+            {"name": "MSFT", "price": "", "eps": [{"name": "2023", "companies": [{"name": "SSI", "value": "", "growth": "5%"}]}]},
+        ]
+        for data in ({"date": "10/27/2023", "quotes": quotes}, {"date": "", "quotes": []}):
+            full_chunks, fragment_chunks = [], []
+            data_utils.write_pretty_xml(full_chunks.append, data_utils.build_xml_tree(data))
+            data_utils.write_pretty_xml_fragments(
+                fragment_chunks.append, data["date"], [data_utils.serialize_quote_fragment(q) for q in data["quotes"]])
+            self.assertEqual("".join(fragment_chunks), "".join(full_chunks))
+
+    def test_serialize_quote_fragment_is_indented_for_quotes_element(self):
+        fragment = data_utils.serialize_quote_fragment({"name": "AAPL", "price": "1"})
+        self.assertEqual(fragment, "        <quote>\n            <name>AAPL</name>\n            <price>1</price>\n        </quote>")
+        self.assertEqual(data_utils.serialize_quote_fragment({"name": ""}), "")
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,7 @@ import unittest
 from unittest.mock import MagicMock, patch, ANY, call
 from PyQt6.QtCore import QDate
 from editor_action_handler import EditorActionHandler
+from command_manager import CommandManager
 # Import Command classes that are instantiated by the handler
 from commands import (
     ChangeRootDateCommand, ChangeQuoteDetailCommand, ChangeEPriceValueCommand,
@@ -43,6 +44,8 @@ class TestEditorActionHandler(unittest.TestCase):
         ]
         # For testing record report detail change
         self.mock_editor._find_data_model_for_record_report = MagicMock()
+        # Real manager (without editor callbacks) so call_after_commit() runs callbacks outside transactions
+        self.mock_editor.command_manager = CommandManager(None)
 
 
         self.handler = EditorActionHandler(self.mock_editor)
@@ -121,7 +124,6 @@ class TestEditorActionHandler(unittest.TestCase):
         self.handler.handle_quote_name_changed(old_name, new_name)
 
         MockChangeQuoteDetailCommand.assert_called_once_with(
-            self.mock_editor.quote_details_widget,
             self.mock_editor.all_quotes_data,
             old_name, "name", old_name, new_name
         )
@@ -150,7 +152,6 @@ class TestEditorActionHandler(unittest.TestCase):
         self.handler.handle_quote_price_changed(old_price, new_price)
 
         MockChangeQuoteDetailCommand.assert_called_once_with(
-            self.mock_editor.quote_details_widget,
             self.mock_editor.all_quotes_data,
             "AAPL", "price", old_price, new_price
         )
@@ -168,7 +169,6 @@ class TestEditorActionHandler(unittest.TestCase):
         self.handler.handle_eprice_value_changed(company_name, old_value, new_value)
 
         MockChangeEPriceValueCommand.assert_called_once_with(
-            self.mock_editor.eprice_section_widget,
             self.mock_editor.all_quotes_data,
             "AAPL", company_name, old_value, new_value
         )
@@ -186,7 +186,6 @@ class TestEditorActionHandler(unittest.TestCase):
         self.handler.handle_pe_value_changed(company_name, old_value, new_value)
 
         MockChangePEValueCommand.assert_called_once_with(
-            self.mock_editor.pe_section_widget,
             self.mock_editor.all_quotes_data,
             "AAPL", company_name, old_value, new_value
         )
@@ -206,7 +205,6 @@ class TestEditorActionHandler(unittest.TestCase):
         self.handler.handle_eps_value_changed(year_name, company_name, field_name, old_value, new_value)
 
         MockChangeEPSValueCommand.assert_called_once_with(
-            self.mock_editor.eps_section_widget,
             self.mock_editor.all_quotes_data,
             "AAPL", year_name, company_name, field_name, old_value, new_value
         )
@@ -0,0 +1,82 @@
+# t:\Work\xml_input_ui\tests\test_eps_growth_chart_widget.py
+import unittest
+from unittest.mock import MagicMock
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCharts import QChart
+from ui_components.eps_growth_chart_widget import EPSGrowthChartWidget
+from quote_model import QuoteModel, EpsYear, EpsCompany, compute_eps_growth_series, parse_growth
+from commands import ChangeEPSValueCommand
+
+app = QApplication.instance() or QApplication([])
+
+def _bar_values(bar_set):
+    return [bar_set.at(index) for index in range(bar_set.count())]
+
+class TestEPSGrowthSeries(unittest.TestCase):
+    def test_parse_and_compute(self):
+        self.assertEqual(parse_growth("12.5%"), 12.5)
+        self.assertIsNone(parse_growth("n/a"))
+        self.assertIsNone(parse_growth(""))
+        series = compute_eps_growth_series({"name": "2024", "companies": [
+            {"name": "SSI", "growth": "10%"}, {"name": "VCSC", "growth": "-4"}, {"name": "HSC", "growth": ""}]})
+        self.assertEqual(series.categories, ("SSI", "VCSC", "HSC"))
+        self.assertEqual(series.values, (10.0, -4.0, 0.0))
+        self.assertEqual((series.numeric_count, series.average), (2, 3.0))
+
+    def test_quote_model_caches_until_growth_command(self):
+        all_quotes = {"VCB": QuoteModel({"name": "VCB", "eps": [EpsYear("2024", [EpsCompany("SSI", "1", "5")])]})}
+        quote = all_quotes["VCB"]
+        series = quote.eps_growth_series("2024")
+        self.assertIs(quote.eps_growth_series("2024"), series)
+
+        cmd = ChangeEPSValueCommand(all_quotes, "VCB", "2024", "SSI", "growth", "5", "7")
+        cmd.execute()
+        self.assertEqual(quote.eps_growth_series("2024").values, (7.0,))
+        cmd.unexecute()
+        self.assertEqual(quote.eps_growth_series("2024").values, (5.0,))
+
+        quote["eps"] = [EpsYear("2024", [EpsCompany("SSI", "1", "9")])] # Replaced outside the model
+        self.assertEqual(quote.eps_growth_series("2024").values, (9.0,))
+
+class TestEPSGrowthChartWidget(unittest.TestCase):
+    def setUp(self):
+        self.eps = [{"name": "2024", "companies": [{"name": "SSI", "growth": "10"}, {"name": "VCSC", "growth": "-5"}]},
+                    {"name": "2025", "companies": [{"name": "SSI", "growth": "3"}]}]
+        self.widget = EPSGrowthChartWidget()
+        self.widget.load_data(self.eps)
+
+    def test_updates_existing_chart_objects_in_place(self):
+        chart, positive_set = self.widget.chart_view.chart(), self.widget.positive_growth_set
+        self.widget.update_chart("2024")
+        self.assertEqual(_bar_values(positive_set), [10.0, 0.0])
+        self.assertEqual(_bar_values(self.widget.negative_growth_set), [0.0, -5.0])
+        self.assertEqual(self.widget.axis_x.categories(), ["SSI", "VCSC"])
+        self.assertEqual(self.widget.average_line_series.name(), "Avg Growth: 2.50%")
+
+        self.eps[0]["companies"][0]["growth"] = "20"
+        self.widget.load_data(self.eps) # Same list: keeps the chart and selected year
+        self.widget.update_chart("2024")
+        self.assertEqual(_bar_values(positive_set), [20.0, 0.0])
+        self.widget.update_chart("2025")
+        self.assertEqual(_bar_values(positive_set), [3.0])
+        self.assertIs(self.widget.chart_view.chart(), chart)
+        self.assertIs(self.widget.positive_growth_set, positive_set)
+
+    def test_redraws_of_the_shown_year_are_not_animated(self):
+        self.widget.update_chart("2024")
+        self.assertEqual(self.widget.chart.animationOptions(), QChart.AnimationOption.SeriesAnimations)
+        self.widget.update_chart("2024")
+        self.assertEqual(self.widget.chart.animationOptions(), QChart.AnimationOption.NoAnimation)
+        self.widget.animations_enabled = False
+        self.widget.update_chart("2025")
+        self.assertEqual(self.widget.chart.animationOptions(), QChart.AnimationOption.NoAnimation)
+
+    def test_uses_the_growth_series_provider(self):
+        provider = MagicMock(return_value=compute_eps_growth_series({"companies": [{"name": "HSC", "growth": "1"}]}))
+        self.widget.set_growth_series_provider(provider)
+        self.widget.update_chart("2024")
+        provider.assert_called_once_with("2024")
+        self.assertEqual(self.widget.axis_x.categories(), ["HSC"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# t:\Work\xml_input_ui\tests\test_fa_data_store.py
+import unittest
+import math
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+import fa_data_store
+from fa_data_store import FADataStore, get_fa_data_store, parse_fa_number
+
+FA_XML = """<root>
+    <quote>
+        <name>BID</name>
+        <stat>
+            <quarterly>
+                <EPS><Y24Q1>1,081.04</Y24Q1><Y24Q2></Y24Q2></EPS>
+            </quarterly>
+            <yearly>
+                <EPS><Y2022>3,500.00</Y2022><Y2023>4,100.50</Y2023></EPS>
+                <ROE><Y2023 flag="ignore">19.65%</Y2023></ROE>
+            </yearly>
+        </stat>
+    </quote>
+    <quote>
+        <name>VCB</name>
+        <stat><yearly><EPS><Y2023>5,000.00</Y2023></EPS></yearly></stat>
+    </quote>
+</root>"""
+
+class TestFADataStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "fa_db.xml")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(FA_XML)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_indexes_quote_period_type_metric_and_period(self):
+        store = FADataStore(self.file_path)
+        self.assertEqual(store.quote_names(), ["BID", "VCB"])
+        self.assertEqual(store.get_metric_values("BID", "yearly", "EPS"), {"Y2022": "3,500.00", "Y2023": "4,100.50"})
+        self.assertEqual(store.get_metric_values("BID", "quarterly", "EPS"), {"Y24Q1": "1,081.04", "Y24Q2": None})
+        self.assertEqual(store.get_metric_values("BID", "yearly", "ROE"), {"Y2023": "19.65%"})
+        self.assertIsNone(store.get_metric_values("BID", "yearly", "PB"))
+        self.assertIsNone(store.get_quote_stats("MISSING"))
+        self.assertEqual(store.get_available_periods("VCB", "yearly"), ["Y2023"])
+        self.assertEqual(store.get_available_periods("VCB", "quarterly"), [])
+
+    def test_parses_once_until_file_changes(self):
+        store = FADataStore(self.file_path)
+        with patch.object(FADataStore, '_parse', wraps=FADataStore._parse) as mock_parse:
+            store.get_quote_stats("BID")
+            store.get_quote_stats("VCB")
+            self.assertEqual(mock_parse.call_count, 1)
+
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                f.write("<root><quote><name>FPT</name></quote></root>")
+            stat_result = os.stat(self.file_path)
+            os.utime(self.file_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+            self.assertEqual(store.quote_names(), ["FPT"])
+            self.assertEqual(mock_parse.call_count, 2)
+
+    def test_new_store_reuses_snapshot_of_unchanged_file(self):
+        FADataStore(self.file_path).quote_names()
+        with patch.object(FADataStore, '_parse') as mock_parse:
+            store = FADataStore(self.file_path)
+            self.assertEqual(store.get_metric_values("VCB", "yearly", "EPS"), {"Y2023": "5,000.00"})
+            mock_parse.assert_not_called()
+
+    def test_missing_file_raises(self):
+        store = FADataStore(os.path.join(self.temp_dir.name, "missing.xml"))
+        with self.assertRaises(FileNotFoundError):
+            store.get_quote_stats("BID")
+
+    def test_malformed_file_raises_parse_error(self):
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("<root><quote>")
+        with self.assertRaises(ET.ParseError):
+            FADataStore(self.file_path).quote_names()
+
+    def test_get_fa_data_store_is_shared_per_path(self):
+        with patch.dict(fa_data_store._shared_stores, clear=True):
+            store = get_fa_data_store(self.file_path)
+            self.assertIs(get_fa_data_store(os.path.join(self.temp_dir.name, ".", "fa_db.xml")), store)
+            self.assertIsNot(get_fa_data_store(os.path.join(self.temp_dir.name, "other.xml")), store)
+
+class TestParseFANumber(unittest.TestCase):
+    def test_parses_percentages_and_thousands_separators(self):
+        self.assertEqual(parse_fa_number("39.24%"), 39.24)
+        self.assertEqual(parse_fa_number("1,081.04"), 1081.04)
+        self.assertEqual(parse_fa_number("-2.5"), -2.5)
+
+    def test_empty_or_invalid_text_is_nan(self):
+        for text in (None, "", "n/a"):
+            self.assertTrue(math.isnan(parse_fa_number(text)))
+
+@unittest.skipIf(fa_data_store.np is None, "numpy is not installed")
+class TestFAColumnarTable(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "fa_db.xml")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(FA_XML)
+        self.store = FADataStore(self.file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_builds_float_grid_with_nan_for_missing_cells(self):
+        table = self.store.get_columnar_table("yearly", "EPS")
+        self.assertEqual(table.quote_names, ["BID", "VCB"])
+        self.assertEqual(table.periods, ["Y2022", "Y2023"])
+        self.assertEqual(table.values.dtype, fa_data_store.np.float64)
+        self.assertEqual(table.value("BID", "Y2023"), 4100.5)
+        self.assertTrue(math.isnan(table.value("VCB", "Y2022"))) # VCB has no Y2022 cell
+        self.assertTrue(math.isnan(self.store.get_columnar_table("quarterly", "EPS").value("BID", "Y24Q2"))) # Empty cell
+
+    def test_quotes_where_screens_all_quotes(self):
+        self.assertEqual(self.store.quotes_where("yearly", "EPS", "Y2023", lambda col: col > 4500), ["VCB"])
+        self.assertEqual(self.store.quotes_where("yearly", "ROE", "Y2023", lambda col: col > 19), ["BID"])
+        self.assertEqual(self.store.quotes_where("yearly", "EPS", "Y2022", lambda col: col > 0), ["BID"]) # NaN never matches
+        self.assertEqual(self.store.quotes_where("yearly", "EPS", "Y1999", lambda col: col > 0), [])
+
+    def test_tables_are_cached_until_file_changes(self):
+        table = self.store.get_columnar_table("yearly", "EPS")
+        self.assertIs(self.store.get_columnar_table("yearly", "EPS"), table)
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("<root><quote><name>FPT</name><stat><yearly><EPS><Y2023>7.5</Y2023></EPS></yearly></stat></quote></root>")
+        stat_result = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.store.get_columnar_table("yearly", "EPS").quote_names, ["FPT"])
+
+if __name__ == '__main__':
+    unittest.main()
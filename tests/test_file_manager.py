@@ -0,0 +1,158 @@
+# t:\Work\xml_input_ui\tests\test_file_manager.py
+import unittest
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+import data_utils
+from file_manager import XmlSaveWorker, XmlLoadWorker
+
+class TestXmlSaveWorker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "report.xml")
+        self.collected_data = {
+            "date": "10/27/2023",
+            "quotes": [{"name": "AAPL", "price": "175.0", "e_price": [{"name": "VCSC", "value": "5.0"}]}]
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_run_writes_file_atomically_and_emits_finished(self):
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("old content")
+        worker = XmlSaveWorker(self.file_path, self.collected_data)
+        finished_slot, failed_slot = MagicMock(), MagicMock()
+        worker.finished.connect(finished_slot)
+        worker.failed.connect(failed_slot)
+
+        worker.run()
+
+        finished_slot.assert_called_once_with(self.file_path)
+        failed_slot.assert_not_called()
+        with open(self.file_path, encoding="utf-8") as f:
+            content = f.read()
+        self.assertTrue(content.startswith('<?xml version="1.0" ?>\n<root>'))
+        self.assertIn("<name>AAPL</name>", content)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["report.xml"]) # No temp file left behind
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_run_gives_new_files_umask_permissions(self):
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        worker = XmlSaveWorker(self.file_path, self.collected_data)
+
+        worker.run()
+
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o644)
+
+    @patch('data_utils.os.replace', side_effect=OSError("Disk full"))
+    def test_run_emits_failed_and_keeps_original_file(self, mock_replace):
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("old content")
+        worker = XmlSaveWorker(self.file_path, self.collected_data)
+        finished_slot, failed_slot = MagicMock(), MagicMock()
+        worker.finished.connect(finished_slot)
+        worker.failed.connect(failed_slot)
+
+        worker.run()
+
+        finished_slot.assert_not_called()
+        failed_slot.assert_called_once_with(self.file_path, "Disk full")
+        with open(self.file_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "old content")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["report.xml"])
+
+class TestXmlLoadWorker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "report.xml")
+        quotes_xml = "".join(f"<quote><name>Q{i:03d}</name><price>{i}</price></quote>" for i in range(150))
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(f"<root><date>05/30/2025</date><quotes><quote><price>1</price></quote>{quotes_xml}</quotes></root>")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _connect_slots(self, worker):
+        slots = {name: MagicMock() for name in
+                 ("rootDateLoaded", "quotesBatchLoaded", "progressChanged", "finished", "failed", "cancelled")}
+        for name, slot in slots.items():
+            getattr(worker, name).connect(slot)
+        return slots
+
+    def test_run_streams_quotes_in_batches(self):
+        worker = XmlLoadWorker(self.file_path)
+        slots = self._connect_slots(worker)
+
+        worker.run()
+
+        self.assertEqual(slots["rootDateLoaded"].call_args[0][0].toString("MM/dd/yyyy"), "05/30/2025")
+        batch_sizes = [len(call.args[0]) for call in slots["quotesBatchLoaded"].call_args_list]
+        self.assertEqual(batch_sizes, [1, 100, 49]) # First quote is delivered on its own
+        names = [q["name"] for call in slots["quotesBatchLoaded"].call_args_list for q in call.args[0]]
+        self.assertEqual(names, [f"Q{i:03d}" for i in range(150)])
+        self.assertEqual(slots["progressChanged"].call_args[0][0], 100)
+        slots["finished"].assert_called_once_with(self.file_path, 1) # The nameless quote is skipped
+        slots["failed"].assert_not_called()
+
+    def test_run_stops_when_cancelled(self):
+        worker = XmlLoadWorker(self.file_path)
+        slots = self._connect_slots(worker)
+        slots["quotesBatchLoaded"].side_effect = lambda batch: worker.request_cancel()
+
+        worker.run()
+
+        self.assertEqual(slots["quotesBatchLoaded"].call_count, 1)
+        slots["cancelled"].assert_called_once_with(self.file_path)
+        slots["finished"].assert_not_called()
+
+    def test_run_emits_failed_on_truncated_file(self):
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("<root><quote><name>AAPL</name>")
+        worker = XmlLoadWorker(self.file_path)
+        slots = self._connect_slots(worker)
+
+        worker.run()
+
+        slots["failed"].assert_called_once()
+        self.assertIn("Error parsing XML file", slots["failed"].call_args[0][1])
+        slots["finished"].assert_not_called()
+
+    def test_run_emits_failed_when_file_missing(self):
+        missing_path = os.path.join(self.temp_dir.name, "missing.xml")
+        worker = XmlLoadWorker(missing_path)
+        slots = self._connect_slots(worker)
+
+        worker.run()
+
+        slots["failed"].assert_called_once_with(missing_path, f"File not found: {missing_path}")
+
+    def test_snapshot_replay_reports_intermediate_progress(self):
+        XmlLoadWorker(self.file_path).run() # Writes the snapshot
+        worker = XmlLoadWorker(self.file_path)
+        slots = self._connect_slots(worker)
+
+        with patch('data_utils.iter_xml_quotes') as mock_iter:
+            worker.run()
+            mock_iter.assert_not_called() # Replayed from the snapshot
+
+        percents = [call.args[0] for call in slots["progressChanged"].call_args_list]
+        self.assertEqual(percents, sorted(percents))
+        self.assertTrue(any(0 < percent < 100 for percent in percents))
+        self.assertEqual(percents[-1], 100)
+        slots["finished"].assert_called_once_with(self.file_path, 1)
+
+    @patch('data_utils._quote_element_to_dict', side_effect=KeyError("name"))
+    def test_run_emits_failed_on_unexpected_error(self, mock_to_dict):
+        worker = XmlLoadWorker(self.file_path)
+        slots = self._connect_slots(worker)
+
+        worker.run()
+
+        slots["failed"].assert_called_once()
+        self.assertIn("Could not load file", slots["failed"].call_args[0][1])
+        slots["finished"].assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
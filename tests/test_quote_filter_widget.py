@@ -0,0 +1,96 @@
+# t:\Work\xml_input_ui\tests\test_quote_filter_widget.py
+import unittest
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtGui import QKeyEvent
+from PyQt6.QtTest import QTest
+from ui_components.quote_filter_widget import QuoteFilterWidget
+from sector_index import SectorIndex
+
+app = QApplication.instance() or QApplication([])
+
+def _listed_quotes(widget):
+    model = widget.filtered_quotes_list.model()
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+class TestQuoteFilterNavigation(unittest.TestCase):
+    def setUp(self):
+        self.quotes = {"date": "05/30/2025",
+                       "BID": {"name": "BID", "price": "40001"},
+                       "CTG": {"name": "CTG", "price": "35000"},
+                       "VCB": {"name": "VCB", "price": "90000"}}
+        self.widget = QuoteFilterWidget(lambda: [], self.quotes)
+        self.widget.quote_list_model.add_quotes(["BID", "CTG", "VCB"])
+        self.selected = []
+        self.widget.quoteSelected.connect(self.selected.append)
+
+    def _press(self, key):
+        self.widget.list_key_press_event(QKeyEvent(QEvent.Type.KeyPress, key, Qt.KeyboardModifier.NoModifier))
+
+    def test_rapid_arrow_keys_emit_only_the_last_quote(self):
+        for _ in range(3):
+            self._press(Qt.Key.Key_Down)
+        self.assertEqual(self.widget.filtered_quotes_list.currentIndex().data(), "VCB") # Highlight moved at once
+        self.assertEqual(self.widget.preview_label.text(), "VCB    Price: 90000")
+        self.assertEqual(self.selected, [])
+
+        QTest.qWait(self.widget.NAVIGATION_IDLE_MS + 100)
+        self.assertEqual(self.selected, ["VCB"])
+
+    def test_click_emits_immediately_and_cancels_pending_navigation(self):
+        self._press(Qt.Key.Key_Down)
+        self.widget._on_filtered_quote_clicked(self.widget.filter_proxy_model.index(2, 0))
+        self.assertEqual(self.selected, ["VCB"])
+        self.widget.flush_pending_navigation()
+        self.assertEqual(self.selected, ["VCB"])
+
+    def test_quote_removed_before_flush_is_not_emitted(self):
+        self._press(Qt.Key.Key_Down)
+        del self.quotes["BID"]
+        self.widget.flush_pending_navigation()
+        self.assertEqual(self.selected, [])
+
+    def test_clearing_the_list_drops_pending_navigation(self):
+        self._press(Qt.Key.Key_Down)
+        self.widget.reset_navigation()
+        self.widget.flush_pending_navigation()
+        self.assertEqual(self.selected, [])
+        self.assertEqual(self.widget.preview_label.text(), "")
+
+class TestQuoteFilterSectorIndex(unittest.TestCase):
+    def test_sector_filter_uses_index(self):
+        quotes = {"date": "05/30/2025",
+                  "VCB": {"name": "VCB", "sectors": [{"name": "BANK", "type": "main"}]},
+                  "HPG": {"name": "HPG", "sectors": [{"name": "STEEL", "type": "main"}]},
+                  "BID": {"name": "BID", "sectors": [{"name": "BANK", "type": "sub"}]}}
+        index = SectorIndex()
+        index.rebuild(quotes)
+        widget = QuoteFilterWidget(lambda: ["BANK", "STEEL"], quotes, sector_index=index)
+        widget.quote_list_model.reset_quotes(quotes)
+        emitted = []
+        widget.filterChanged.connect(emitted.append)
+
+        widget.sector_combo.setCurrentIndex(widget.sector_combo.findData("BANK"))
+        self.assertEqual(emitted[-1], ["BID", "VCB"])
+        self.assertEqual(_listed_quotes(widget), ["BID", "VCB"])
+
+        widget.sector_combo.setCurrentIndex(0) # All Sectors
+        self.assertEqual(emitted[-1], ["BID", "HPG", "VCB"])
+        self.assertEqual(_listed_quotes(widget), ["BID", "HPG", "VCB"])
+
+    def test_quotes_changed_updates_filtered_rows(self):
+        quotes = {"VCB": {"name": "VCB", "sectors": [{"name": "BANK", "type": "main"}]},
+                  "HPG": {"name": "HPG", "sectors": [{"name": "STEEL", "type": "main"}]}}
+        widget = QuoteFilterWidget(lambda: ["BANK", "STEEL"], quotes)
+        widget.quote_list_model.reset_quotes(quotes)
+        widget.sector_combo.setCurrentIndex(widget.sector_combo.findData("BANK"))
+
+        quotes["HPG"]["sectors"].append({"name": "BANK", "type": "sub"}) # Sector added to a listed quote
+        quotes["ACB"] = {"name": "ACB", "sectors": [{"name": "BANK", "type": "main"}]} # New quote
+        quotes["FPT"] = {"name": "FPT"}
+        widget.quotes_changed(["HPG", "ACB", "FPT"])
+        widget.quote_list_model.sync_quotes(["HPG", "ACB", "FPT"], quotes)
+        self.assertEqual(_listed_quotes(widget), ["ACB", "HPG", "VCB"])
+
+if __name__ == '__main__':
+    unittest.main()
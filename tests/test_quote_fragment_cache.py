@@ -0,0 +1,58 @@
+# t:\Work\xml_input_ui\tests\test_quote_fragment_cache.py
+import unittest
+from unittest.mock import patch
+import data_utils
+from quote_fragment_cache import QuoteFragmentCache
+
+class TestQuoteFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = QuoteFragmentCache()
+        self.quotes = {
+            "AAPL": {"name": "AAPL", "price": "170.0"},
+            "GOOG": {"name": "GOOG", "price": "130.0"},
+        }
+
+    def _fragments(self):
+        return self.cache.fragments_for(self.quotes.items())
+
+    def test_first_call_serializes_every_quote(self):
+        fragments = self._fragments()
+        self.assertEqual(fragments, [data_utils.serialize_quote_fragment(q) for q in self.quotes.values()])
+        self.assertTrue(self.cache.is_cached("AAPL"))
+
+    @patch('quote_fragment_cache.data_utils.serialize_quote_fragment', wraps=data_utils.serialize_quote_fragment)
+    def test_only_dirty_quotes_are_reserialized(self, mock_serialize):
+        self._fragments()
+        mock_serialize.reset_mock()
+        self.quotes["GOOG"]["price"] = "131.0"
+        self.cache.mark_dirty(("GOOG",))
+
+        fragments = self._fragments()
+
+        mock_serialize.assert_called_once_with(self.quotes["GOOG"])
+        self.assertIn("<price>131.0</price>", fragments[1])
+        mock_serialize.reset_mock()
+        self._fragments()
+        mock_serialize.assert_not_called()
+
+    @patch('quote_fragment_cache.data_utils.serialize_quote_fragment', wraps=data_utils.serialize_quote_fragment)
+    def test_unknown_changes_invalidate_everything(self, mock_serialize):
+        self._fragments()
+        mock_serialize.reset_mock()
+        self.cache.mark_dirty(None)
+        self._fragments()
+        self.assertEqual(mock_serialize.call_count, 2)
+
+    def test_removed_and_renamed_quotes_are_dropped(self):
+        self._fragments()
+        self.quotes["MSFT"] = self.quotes.pop("AAPL")
+        self.quotes["MSFT"]["name"] = "MSFT"
+        self.cache.mark_dirty(("AAPL", "MSFT"))
+
+        fragments = self._fragments()
+
+        self.assertFalse(self.cache.is_cached("AAPL"))
+        self.assertIn("<name>MSFT</name>", fragments[1])
+
+if __name__ == '__main__':
+    unittest.main()
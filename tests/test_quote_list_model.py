@@ -0,0 +1,75 @@
+# t:\Work\xml_input_ui\tests\test_quote_list_model.py
+import unittest
+from PyQt6.QtWidgets import QApplication
+from ui_components.quote_list_model import QuoteListModel, QuoteFilterProxyModel
+
+app = QApplication.instance() or QApplication([])
+
+class TestQuoteListModel(unittest.TestCase):
+    def setUp(self):
+        self.model = QuoteListModel()
+        self.model.reset_quotes({"date": "05/30/2025", "VCB": {}, "BID": {}, "SSI": {}})
+        self.events = []
+        self.model.modelReset.connect(lambda: self.events.append("reset"))
+        self.model.rowsInserted.connect(lambda parent, first, last: self.events.append(("inserted", first, last)))
+        self.model.rowsRemoved.connect(lambda parent, first, last: self.events.append(("removed", first, last)))
+        self.model.rowsMoved.connect(lambda parent, start, end, dest, row: self.events.append(("moved", start, row)))
+
+    def test_reset_sorts_and_skips_date(self):
+        self.assertEqual(self.model.quote_names(), ["BID", "SSI", "VCB"])
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.index(1).data(), "SSI")
+        self.assertEqual(self.model.row_of("VCB"), 2)
+        self.assertEqual(self.model.row_of("ACB"), -1)
+
+    def test_added_and_removed_quotes_are_row_inserts_and_removals(self):
+        quotes = {"BID": {}, "SSI": {}, "VCB": {}, "CTG": {}}
+        self.model.sync_quotes(["CTG"], quotes)
+        del quotes["BID"]
+        self.model.sync_quotes(["BID"], quotes)
+        self.assertEqual(self.model.quote_names(), ["CTG", "SSI", "VCB"])
+        self.assertEqual(self.events, [("inserted", 1, 1), ("removed", 0, 0)])
+
+    def test_rename_moves_the_row(self):
+        quotes = {"BID": {}, "VCB": {}, "AAA": {}}
+        self.model.sync_quotes(["SSI", "AAA"], quotes) # SSI renamed to AAA
+        self.assertEqual(self.model.quote_names(), ["AAA", "BID", "VCB"])
+        self.assertEqual(self.events, [("moved", 1, 0)])
+
+        quotes = {"BID": {}, "VCB": {}, "ZZZ": {}}
+        self.model.sync_quotes(["AAA", "ZZZ"], quotes)
+        self.assertEqual(self.model.quote_names(), ["BID", "VCB", "ZZZ"])
+
+    def test_rename_in_place_only_changes_data(self):
+        changed = []
+        self.model.dataChanged.connect(lambda first, last: changed.append(first.row()))
+        self.model.sync_quotes(["SSI", "SSJ"], {"BID": {}, "SSJ": {}, "VCB": {}})
+        self.assertEqual(self.model.quote_names(), ["BID", "SSJ", "VCB"])
+        self.assertEqual(self.events, [])
+        self.assertEqual(changed, [1])
+
+    def test_none_resets(self):
+        self.model.sync_quotes(None, {"date": "x", "FPT": {}})
+        self.assertEqual(self.model.quote_names(), ["FPT"])
+        self.assertEqual(self.events, ["reset"])
+
+class TestQuoteFilterProxyModel(unittest.TestCase):
+    def test_filters_by_accepted_names_and_follows_source_changes(self):
+        model = QuoteListModel()
+        model.reset_quotes(["BID", "SSI", "VCB"])
+        proxy = QuoteFilterProxyModel()
+        proxy.setSourceModel(model)
+        self.assertEqual(proxy.rowCount(), 3)
+
+        proxy.set_accepted_names({"BID", "VCB", "ACB"})
+        self.assertEqual([proxy.index(row, 0).data() for row in range(proxy.rowCount())], ["BID", "VCB"])
+        model.add_quotes(["ACB", "FPT"])
+        self.assertEqual([proxy.index(row, 0).data() for row in range(proxy.rowCount())], ["ACB", "BID", "VCB"])
+
+        self.assertTrue(proxy.set_quote_accepted("FPT", True))
+        self.assertFalse(proxy.set_quote_accepted("FPT", True))
+        proxy.invalidateFilter()
+        self.assertEqual(proxy.rowCount(), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# t:\Work\xml_input_ui\tests\test_quote_model.py
+import copy
+import pickle
+import unittest
+from quote_model import QuoteModel, CompanyValue, EpsYear, EpsCompany, Report, Sector
+
+def _quote():
+    return QuoteModel({
+        "name": "VCB", "price": "90000",
+        "e_price": [{"name": "SSI", "value": "1"}, {"name": "VCSC", "value": "2"}],
+        "eps": [{"name": "2023", "companies": [{"name": "SSI", "value": "5", "growth": ""}]}],
+        "pe": [], "sectors": [{"name": "BANK", "type": "main"}],
+        "record": [{"company": "SSI", "date": "01/02/2024", "color": "red"},
+                   {"company": "SSI", "date": "01/02/2024", "color": "default"}],
+    })
+
+class TestQuoteModel(unittest.TestCase):
+    def test_behaves_as_the_plain_quote_dict(self):
+        quote = _quote()
+        self.assertEqual(quote, dict(quote))
+        self.assertEqual(pickle.loads(pickle.dumps(quote)), quote)
+        duplicate = copy.deepcopy(quote)
+        self.assertIsInstance(duplicate, QuoteModel)
+        self.assertIsNot(duplicate["e_price"], quote["e_price"])
+
+    def test_of_upgrades_plain_dicts_in_place(self):
+        all_quotes = {"date": "05/30/2025", "VCB": {"name": "VCB", "pe": []}}
+        quote = QuoteModel.of(all_quotes, "VCB")
+        self.assertIsInstance(quote, QuoteModel)
+        self.assertIs(all_quotes["VCB"], quote)
+        self.assertIs(QuoteModel.of(all_quotes, "VCB"), quote)
+        self.assertIsNone(QuoteModel.of(all_quotes, "date"))
+        self.assertIsNone(QuoteModel.of(all_quotes, "BID"))
+
+    def test_entries_by_name(self):
+        quote = _quote()
+        self.assertIs(quote.find_entry("e_price", "VCSC"), quote["e_price"][1])
+        self.assertIsNone(quote.find_entry("pe", "SSI"))
+        added = quote.ensure_entry("pe", "SSI", value="")
+        self.assertEqual(quote["pe"], [{"name": "SSI", "value": ""}])
+        self.assertIs(quote.ensure_entry("pe", "SSI"), added)
+
+        sector = quote.find_entry("sectors", "BANK")
+        quote.set_entry_field("sectors", sector, "name", "FINANCE")
+        self.assertIsNone(quote.find_entry("sectors", "BANK"))
+        self.assertIs(quote.find_entry("sectors", "FINANCE"), sector)
+        self.assertIs(quote.remove_entry("sectors", "FINANCE"), sector)
+        self.assertEqual(quote["sectors"], [])
+
+    def test_index_follows_lists_changed_outside_the_model(self):
+        quote = _quote()
+        self.assertIsNotNone(quote.find_entry("e_price", "SSI"))
+        quote["e_price"] = [{"name": "HSC", "value": "3"}] # e.g. written back from the widgets
+        self.assertIsNone(quote.find_entry("e_price", "SSI"))
+        self.assertEqual(quote.find_entry("e_price", "HSC")["value"], "3")
+        quote["e_price"].append({"name": "SSI", "value": "4"})
+        self.assertEqual(quote.find_entry("e_price", "SSI")["value"], "4")
+        quote["e_price"][0]["name"] = "BSC" # Renamed in place
+        self.assertIsNone(quote.find_entry("e_price", "HSC"))
+
+    def test_eps_years_and_companies(self):
+        quote = _quote()
+        self.assertEqual(quote.ensure_eps_company("2023", "SSI")["value"], "5")
+        new_company = quote.ensure_eps_company("2024", "VCSC")
+        self.assertEqual(quote["eps"][1], {"name": "2024", "companies": [new_company]})
+
+        quote.add_eps_year({"name": "2022", "companies": []}, sort_key=int)
+        self.assertEqual([year["name"] for year in quote["eps"]], ["2022", "2023", "2024"])
+        self.assertIs(quote.find_eps_year("2024"), quote["eps"][2])
+        removed = quote.remove_eps_year("2023")
+        self.assertEqual(removed["name"], "2023")
+        self.assertIsNone(quote.find_eps_year("2023"))
+        self.assertIsNone(quote.remove_eps_year("2023"))
+
+    def test_records_by_company_and_date(self):
+        quote = _quote()
+        red, default = quote["record"]
+        self.assertIs(quote.find_record("SSI", "01/02/2024"), red)
+        self.assertIs(quote.find_record("SSI", "01/02/2024", "default"), default)
+        self.assertIsNone(quote.find_record("SSI", "01/03/2024"))
+
+        quote.set_record_field(red, "date", "01/03/2024")
+        self.assertIs(quote.find_record("SSI", "01/03/2024", "red"), red)
+        self.assertIsNone(quote.find_record("SSI", "01/02/2024", "red"))
+
+        self.assertEqual(quote.remove_record(red), 0)
+        self.assertIsNone(quote.find_record("SSI", "01/03/2024"))
+        self.assertEqual(quote.remove_record(red), -1)
+        quote.insert_record(0, red)
+        self.assertEqual(quote.record_position(red), 0)
+        self.assertIs(quote.find_record("SSI", "01/03/2024"), red)
+
+    def test_value_changes_are_announced_to_section_observers(self):
+        quote = _quote()
+        events = []
+        record = lambda *event: events.append(event)
+        quote.observe("e_price", record)
+        quote.observe("eps", record)
+        quote.set_entry_value("e_price", "HSC", "12")
+        quote.set_eps_field("2024", "SSI", "growth", "7")
+        quote.set_detail("price", "30") # Not observed
+        self.assertEqual(events, [("HSC", "value", "12"), (("2024", "SSI"), "growth", "7")])
+        self.assertEqual(quote.find_entry("e_price", "HSC")["value"], "12")
+        self.assertEqual(quote.eps_growth_series("2024").values[-1], 7.0)
+
+        quote.unobserve("e_price", record)
+        quote.set_entry_value("e_price", "HSC", "13")
+        self.assertEqual(len(events), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(quote))._observers, {}) # Observers are not persisted
+
+class TestQuoteRecords(unittest.TestCase):
+    def test_records_read_and_write_like_dicts(self):
+        report = Report("SSI", "01/02/2024", "red")
+        self.assertEqual(report, {"company": "SSI", "date": "01/02/2024", "color": "red"})
+        self.assertEqual({"company": "SSI", "date": "01/02/2024", "color": "red"}, report)
+        self.assertEqual(report.get("color", "default"), "red")
+        self.assertIn("date", report)
+        report["color"] = "blue"
+        self.assertEqual(dict(report), {"company": "SSI", "date": "01/02/2024", "color": "blue"})
+        with self.assertRaises(KeyError):
+            report["note"] = "x"
+        self.assertIsNone(report.get("note"))
+        self.assertFalse(hasattr(report, "__dict__"))
+
+    def test_repeated_strings_are_interned(self):
+        name = "".join(["VC", "SC"]) # Built at runtime, so not interned by the compiler
+        self.assertIs(CompanyValue(name, "1").name, CompanyValue("VCSC", "2").name)
+        sector = Sector("BANK")
+        sector["name"] = "".join(["FIN", "ANCE"])
+        self.assertIs(sector.name, Sector("FINANCE").name)
+
+    def test_pickle_and_deepcopy_round_trip(self):
+        year = EpsYear("2024", [EpsCompany("SSI", "1", "5%")])
+        restored = pickle.loads(pickle.dumps(year))
+        self.assertEqual(restored, year)
+        self.assertIsInstance(restored.companies[0], EpsCompany)
+        duplicate = copy.deepcopy(year)
+        duplicate["companies"][0]["value"] = "2"
+        self.assertEqual(year.companies[0].value, "1")
+
+    def test_model_creates_record_entries(self):
+        quote = QuoteModel({"name": "VCB"})
+        self.assertIsInstance(quote.ensure_entry("pe", "SSI", value=""), CompanyValue)
+        self.assertIsInstance(quote.ensure_entry("sectors", "BANK", type="main"), Sector)
+        self.assertIsInstance(quote.ensure_eps_company("2024", "SSI"), EpsCompany)
+        self.assertIsInstance(quote.find_eps_year("2024"), EpsYear)
+
+if __name__ == '__main__':
+    unittest.main()
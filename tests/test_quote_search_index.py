@@ -0,0 +1,72 @@
+# t:\Work\xml_input_ui\tests\test_quote_search_index.py
+import unittest
+from PyQt6.QtWidgets import QApplication
+from quote_search_index import QuoteSearchIndex, normalize_search_text
+from ui_components.quote_selection_widget import QuoteSelectionWidget
+
+app = QApplication.instance() or QApplication([])
+
+def _quotes():
+    return {"date": "05/30/2025",
+            "VCB": {"name": "VCB", "price": "90000", "sectors": [{"name": "NGÂN HÀNG", "type": "main"}]},
+            "VCI": {"name": "VCI", "price": "35000", "sectors": [{"name": "CHỨNG KHOÁN", "type": "main"}]},
+            "BID": {"name": "BID", "price": "40001", "sectors": [{"name": "NGÂN HÀNG", "type": "sub"}]},
+            "HPG": {"name": "HPG", "price": "25000", "sectors": []}}
+
+class TestQuoteSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.quotes = _quotes()
+        self.index = QuoteSearchIndex()
+        self.index.rebuild(self.quotes)
+
+    def test_normalize_strips_case_and_diacritics(self):
+        self.assertEqual(normalize_search_text(" ngân hàng "), "NGAN HANG")
+        self.assertEqual(normalize_search_text("Đầu tư"), "DAU TU")
+
+    def test_name_prefix_ranks_before_sector_and_price(self):
+        self.assertEqual(self.index.search("vc"), ["VCB", "VCI"])
+        self.assertEqual(self.index.search("VCB"), ["VCB"])
+        self.assertEqual(self.index.search("ngan"), ["BID", "VCB"])
+        self.assertEqual(self.index.search("hang"), ["BID", "VCB"]) # Any word of a sector
+        self.assertEqual(self.index.search("4000"), ["BID"])
+        self.assertEqual(self.index.search("v", limit=1), ["VCB"])
+        self.assertEqual(self.index.search("  "), [])
+
+    def test_fuzzy_fallback_finds_typos(self):
+        self.assertEqual(self.index.search("HPGG"), ["HPG"])
+        self.assertEqual(self.index.search("XYZ"), [])
+
+    def test_update_quotes_handles_add_rename_and_remove(self):
+        self.quotes["ACB"] = {"name": "ACB", "price": "", "sectors": [{"name": "NGÂN HÀNG", "type": "main"}]}
+        self.index.update_quotes(["ACB"], self.quotes)
+        self.assertEqual(self.index.search("ngan"), ["ACB", "BID", "VCB"])
+
+        self.quotes["BIDV"] = self.quotes.pop("BID")
+        self.index.update_quotes(["BID", "BIDV"], self.quotes)
+        self.assertEqual(self.index.search("BI"), ["BIDV"])
+
+        del self.quotes["VCB"]
+        self.index.update_quotes(["VCB"], self.quotes)
+        self.assertEqual(self.index.search("VC"), ["VCI"])
+
+        self.quotes["VCI"]["price"] = "41000"
+        self.index.update_quotes(["VCI"], self.quotes)
+        self.assertEqual(self.index.search("35"), [])
+        self.assertEqual(self.index.search("41"), ["VCI"])
+
+class TestQuoteSelectionSearch(unittest.TestCase):
+    def test_typing_narrows_completer_to_ranked_matches(self):
+        quotes = _quotes()
+        index = QuoteSearchIndex()
+        index.rebuild(quotes)
+        widget = QuoteSelectionWidget(search_index=index)
+        widget.quote_list_model.reset_quotes(quotes)
+        completion_model = widget.completer.model()
+
+        widget._on_search_text_edited("ngan")
+        self.assertEqual([completion_model.index(row, 0).data() for row in range(completion_model.rowCount())], ["BID", "VCB"])
+        widget._on_search_text_edited("")
+        self.assertEqual(completion_model.rowCount(), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,251 @@
+# t:\Work\xml_input_ui\tests\test_section_widgets.py
+import unittest
+from PyQt6.QtWidgets import QApplication, QWidget
+from ui_components.eprice_section_widget import EPriceSectionWidget
+from ui_components.eps_section_widget import EPSSectionWidget
+from ui_components.record_report_section_widget import RecordReportSectionWidget
+from ui_components.sectors_section_widget import SectorsSectionWidget
+from ui_components.ui_utils import LayoutRefreshBatch
+from quote_model import QuoteModel
+
+app = QApplication.instance() or QApplication([])
+
+FIXED_COMPANIES = ["VCSC", "SSI"]
+
+def _widget_count(widget):
+    return len(widget.findChildren(QWidget))
+
+class TestSectionWidgetReuse(unittest.TestCase):
+    """Switching quotes rebinds pooled rows instead of creating new widgets."""
+
+    def test_eprice_refresh_keeps_boxes_when_company_list_is_unchanged(self):
+        widget = EPriceSectionWidget(lambda: FIXED_COMPANIES)
+        boxes = [e["widget"] for e in widget.eprice_entries]
+        widget.load_data([{"name": "SSI", "value": "10"}])
+        widget.clear_data()
+        widget.refresh_structure()
+        self.assertEqual([e["widget"] for e in widget.eprice_entries], boxes)
+        self.assertEqual(widget.get_data(), [])
+
+        widget.refresh_structure(["VCSC", "SSI", "HSC"])
+        self.assertEqual([e["name"] for e in widget.eprice_entries], ["VCSC", "SSI", "HSC"])
+
+    def test_eps_years_are_rebound_on_reload(self):
+        widget = EPSSectionWidget(FIXED_COMPANIES)
+        widget.load_data([{"name": "2023", "companies": [{"name": "SSI", "value": "1", "growth": "5%"}]},
+                          {"name": "2024", "companies": []}])
+        widget_count = _widget_count(widget)
+        boxes = {ye["widget"] for ye in widget.eps_year_entries}
+
+        widget.load_data([{"name": "2025", "companies": [{"name": "VCSC", "value": "2", "growth": ""}]}])
+        self.assertEqual(_widget_count(widget), widget_count)
+        self.assertIn(widget.eps_year_entries[0]["widget"], boxes)
+        self.assertEqual(widget.eps_year_entries[0]["widget"].title(), "EPS 2025")
+        self.assertEqual(widget.get_data(), [{"name": "2025", "companies": [
+            {"name": "VCSC", "value": "2", "growth": ""}, {"name": "SSI", "value": "", "growth": ""}]}])
+
+    def test_reused_eps_year_reports_edits_under_its_new_year(self):
+        widget = EPSSectionWidget(FIXED_COMPANIES)
+        widget.load_data([{"name": "2023", "companies": []}])
+        widget.load_data([{"name": "2024", "companies": []}])
+        emitted = []
+        widget.epsValueChanged.connect(lambda *args: emitted.append(args))
+        value_edit = widget.eps_year_entries[0]["company_entries"][0]["value_edit"]
+        value_edit.setText("3.5")
+        value_edit.editingFinished.emit()
+        self.assertEqual(emitted, [("2024", "VCSC", "value", "", "3.5")])
+
+    def test_hidden_eps_years_stay_plain_data_until_shown(self):
+        widget = EPSSectionWidget(FIXED_COMPANIES)
+        years = [{"name": str(year), "companies": [{"name": "SSI", "value": str(year - 2000), "growth": ""}]}
+                 for year in range(2015, 2025)]
+        widget.load_data(years)
+        self.assertEqual([ye["year_name"] for ye in widget.eps_year_entries if ye["widget"] is not None], ["2015", "2016"])
+        widget_count = _widget_count(widget)
+        self.assertEqual(widget.get_data()[-1], {"name": "2024", "companies": [
+            {"name": "VCSC", "value": "", "growth": ""}, {"name": "SSI", "value": "24", "growth": ""}]})
+
+        widget.update_company_eps_field("2024", "VCSC", "growth", "8", from_command=True) # Edited while hidden
+        widget.selected_eps_years_to_display = ["2023", "2024"]
+        widget._update_visible_eps_years()
+        shown = [ye for ye in widget.eps_year_entries if ye["widget"] is not None and ye["widget"].isVisibleTo(widget)]
+        self.assertEqual([ye["year_name"] for ye in shown], ["2023", "2024"])
+        self.assertEqual([ce["current_growth"] for ce in shown[1]["company_entries"]], ["8", ""])
+        self.assertEqual([ce["value_edit"].text() for ce in shown[0]["company_entries"]], ["", "23"])
+        self.assertGreater(_widget_count(widget), widget_count) # Only the two newly shown years were built
+        self.assertEqual(sum(ye["widget"] is not None for ye in widget.eps_year_entries), 4)
+
+    def test_eps_years_built_for_old_company_list_are_not_reused(self):
+        widget = EPSSectionWidget(FIXED_COMPANIES)
+        widget.load_data([{"name": "2023", "companies": []}])
+        widget.refresh_structure_with_new_fixed_companies(["VCSC", "SSI", "HSC"])
+        self.assertEqual([ce["name"] for ce in widget.eps_year_entries[0]["company_entries"]], ["VCSC", "SSI", "HSC"])
+
+    def test_fixed_company_change_only_touches_changed_boxes(self):
+        eprice_widget = EPriceSectionWidget(lambda: FIXED_COMPANIES)
+        eprice_widget.load_data([{"name": "SSI", "value": "10"}])
+        eprice_boxes = {e["name"]: e["widget"] for e in eprice_widget.eprice_entries}
+        eps_widget = EPSSectionWidget(FIXED_COMPANIES)
+        eps_widget.load_data([{"name": "2023", "companies": [{"name": "SSI", "value": "1", "growth": "5%"}]},
+                              {"name": "2024", "companies": []}, {"name": "2025", "companies": []}])
+        year_2023 = eps_widget.eps_year_entries[0]
+        eps_boxes = {ce["name"]: ce["widget"] for ce in year_2023["company_entries"]}
+
+        new_companies = ["SSI", "HSC"] # VCSC removed, SSI moved first, HSC added
+        eprice_widget.refresh_structure(new_companies)
+        eps_widget.refresh_structure_with_new_fixed_companies(new_companies)
+
+        self.assertEqual([e["name"] for e in eprice_widget.eprice_entries], new_companies)
+        self.assertIs(eprice_widget.eprice_entries[0]["widget"], eprice_boxes["SSI"])
+        self.assertEqual(eprice_widget.get_data(), [{"name": "SSI", "value": "10"}])
+        self.assertEqual([eprice_widget.eprice_items_layout.itemAt(i).widget() for i in range(2)],
+                         [e["widget"] for e in eprice_widget.eprice_entries])
+
+        self.assertIs(eps_widget.eps_year_entries[0], year_2023) # The year panel is updated in place
+        self.assertIs(year_2023["company_entries"][0]["widget"], eps_boxes["SSI"])
+        self.assertEqual([year_2023["companies_layout"].itemAt(i).widget() for i in range(2)],
+                         [ce["widget"] for ce in year_2023["company_entries"]])
+        self.assertEqual(year_2023["selected_companies_to_display_for_year"], ["SSI"]) # New companies start hidden, as before
+        self.assertEqual(eps_widget.get_data()[0]["companies"], [{"name": "SSI", "value": "1", "growth": "5%"},
+                                                                 {"name": "HSC", "value": "", "growth": ""}])
+        self.assertIsNone(eps_widget.eps_year_entries[2]["widget"]) # Unbuilt years stay plain data
+        self.assertEqual(eps_widget.get_data()[2]["companies"], [{"name": "SSI", "value": "", "growth": ""},
+                                                                 {"name": "HSC", "value": "", "growth": ""}])
+
+    def test_record_reports_reuse_boxes_with_fresh_entry_data(self):
+        widget = RecordReportSectionWidget(lambda: FIXED_COMPANIES)
+        records = [{"company": "SSI", "date": f"01/{day:02d}/2024", "color": "red"} for day in range(1, 9)]
+        widget.load_data(records)
+        self.assertEqual([e["current_date"] for e in widget.report_entries][:2], ["01/08/2024", "01/07/2024"])
+        self.assertEqual(len(widget.report_entries), widget.MAX_REPORTS_DISPLAYED)
+        widget_count = _widget_count(widget)
+        stale_entry = widget.report_entries[0]
+
+        widget.load_data([{"company": "VCSC", "date": "02/01/2024", "color": ""}])
+        self.assertEqual(_widget_count(widget), widget_count)
+        self.assertEqual(widget.get_data(), [{"company": "VCSC", "date": "02/01/2024", "color": "default"}])
+
+        # A command holding the entry of an earlier binding must not touch the reused box
+        widget.update_report_entry_detail(stale_entry, "company", "SSI", from_command=True)
+        self.assertEqual(widget.report_entries[0]["current_company"], "VCSC")
+
+    def test_older_record_reports_are_paged_in_on_demand(self):
+        widget = RecordReportSectionWidget(lambda: FIXED_COMPANIES)
+        records = [{"company": "SSI", "date": f"01/{day:02d}/2024", "color": ""} for day in range(1, 15)]
+        widget.load_data(records)
+        self.assertEqual(widget.page_count(), 3)
+        self.assertEqual(widget.report_page_label.text(), "1-6 of 14")
+        self.assertFalse(widget.newer_reports_button.isEnabled())
+        widget_count = _widget_count(widget)
+
+        widget.older_reports_button.click()
+        widget.older_reports_button.click()
+        self.assertEqual([e["current_date"] for e in widget.report_entries], ["01/02/2024", "01/01/2024"])
+        self.assertEqual(widget.report_page_label.text(), "13-14 of 14")
+        self.assertFalse(widget.older_reports_button.isEnabled())
+        self.assertEqual(_widget_count(widget), widget_count) # Boxes only for the shown page
+
+        records.pop() # A command changed the shown list: stay on the page that is still there
+        widget.load_data(records)
+        self.assertEqual([e["current_date"] for e in widget.report_entries], ["01/01/2024"])
+        widget.load_data(list(records)) # Another quote's list starts at the latest reports
+        self.assertEqual(widget.report_entries[0]["current_date"], "01/13/2024")
+
+        widget.load_data(records[:3])
+        self.assertTrue(widget.report_page_label.isHidden())
+
+    def test_record_report_insert_and_remove_touch_one_box(self):
+        widget = RecordReportSectionWidget(lambda: FIXED_COMPANIES)
+        records = [{"company": "SSI", "date": f"01/{day:02d}/2024", "color": ""} for day in range(1, 9)]
+        widget.load_data(records)
+        widget.show_report_page(1)
+        widget.show_report_page(0) # Full sort now maintained
+        kept_entries = list(widget.report_entries)
+        created = []
+        original_create = widget._create_single_report_entry_ui_data
+        widget._create_single_report_entry_ui_data = lambda *args, **kwargs: created.append(args or kwargs) or original_create(*args, **kwargs)
+
+        removed = records.pop(3) # 01/04/2024, fifth on the first page
+        widget.remove_report(records, removed)
+        self.assertEqual(len(created), 1) # Only 01/02/2024 moved up onto the page
+        self.assertEqual([e["current_date"] for e in widget.report_entries],
+                         ["01/08/2024", "01/07/2024", "01/06/2024", "01/05/2024", "01/03/2024", "01/02/2024"])
+        self.assertTrue(all(a is b for a, b in zip(widget.report_entries[:4], kept_entries[:4])))
+
+        records.insert(3, removed) # Undo
+        widget.insert_report(records, removed)
+        self.assertEqual(len(created), 2)
+        self.assertEqual([e["current_date"] for e in widget.report_entries], [e["current_date"] for e in kept_entries])
+
+        same_day = {"company": "VCSC", "date": "01/08/2024", "color": ""}
+        records.append(same_day) # Same date: after the existing report, as a full sort would place it
+        widget.insert_report(records, same_day)
+        self.assertEqual([e["current_company"] for e in widget.report_entries[:2]], ["SSI", "VCSC"])
+
+        untouched_list = [{"company": "SSI", "date": "03/01/2024"}]
+        widget.insert_report(untouched_list, untouched_list[0]) # Not the shown list: loaded instead
+        self.assertEqual(widget.get_data(), [{"company": "SSI", "date": "03/01/2024", "color": "default"}])
+
+    def test_rebinding_record_report_does_not_emit_changes(self):
+        widget = RecordReportSectionWidget(lambda: FIXED_COMPANIES)
+        widget.load_data([{"company": "SSI", "date": "01/01/2024"}])
+        emitted = []
+        widget.recordReportDetailChanged.connect(lambda *args: emitted.append(args))
+        widget.load_data([{"company": "VCSC", "date": "02/01/2024"}])
+        self.assertEqual(emitted, [])
+
+    def test_sector_rows_are_reused(self):
+        widget = SectorsSectionWidget(lambda: ["BANK", "STEEL"])
+        quotes = {"BID": {"sectors": [{"name": "BANK", "type": "main"}]},
+                  "HPG": {"sectors": [{"name": "STEEL", "type": "sub"}]}}
+        widget.load_sectors_from_db("BID", quotes)
+        widget_count = _widget_count(widget)
+        widget.load_sectors_from_db("HPG", quotes)
+        self.assertEqual(_widget_count(widget), widget_count)
+        self.assertEqual([(e["name"], e["type_combo"].currentText(), e["name_combo"].currentText())
+                          for e in widget.sectors_entries], [("STEEL", "sub", "STEEL")])
+
+class TestLayoutRefreshBatch(unittest.TestCase):
+    def test_sections_lay_out_once_when_the_batch_closes(self):
+        root = QWidget()
+        eps_widget = EPSSectionWidget(FIXED_COMPANIES)
+        record_widget = RecordReportSectionWidget(lambda: FIXED_COMPANIES)
+        eps_data = [{"name": str(year), "companies": [{"name": "SSI", "value": "1", "growth": ""}]} for year in (2023, 2024)]
+        records = [{"company": "SSI", "date": f"05/{day:02d}/2025", "color": "default"} for day in range(1, 5)]
+
+        with LayoutRefreshBatch(root) as batch:
+            with LayoutRefreshBatch(root) as joined: # A nested batch joins the open one
+                eps_widget.load_data(eps_data)
+            record_widget.load_data(records)
+            record_widget.load_data(records)
+            self.assertFalse(root.updatesEnabled())
+            self.assertEqual(batch.performed_count, 0)
+        self.assertTrue(root.updatesEnabled())
+        self.assertEqual(joined.performed_count, 0)
+        self.assertGreater(batch.requested_count, batch.performed_count)
+        self.assertEqual(batch.performed_count, 4) # Two EPS year boxes, the EPS group box and the record group
+        self.assertEqual(set(batch.stats()), {"requested", "performed", "layout_ms", "total_ms"})
+
+class TestSectionWidgetModelBinding(unittest.TestCase):
+    def test_sections_follow_only_the_bound_quote_model(self):
+        displayed = QuoteModel({"name": "VCB", "e_price": [], "eps": [{"name": "2024", "companies": []}]})
+        other = QuoteModel({"name": "BID", "e_price": []})
+        eprice_widget = EPriceSectionWidget(lambda: FIXED_COMPANIES)
+        eps_widget = EPSSectionWidget(FIXED_COMPANIES)
+        eps_widget.load_data(displayed["eps"])
+        eprice_widget.bind_quote_model(other)
+        eprice_widget.bind_quote_model(displayed) # Rebinding drops the previous quote
+        eps_widget.bind_quote_model(displayed)
+
+        displayed.set_entry_value("e_price", "SSI", "10")
+        other.set_entry_value("e_price", "SSI", "99")
+        displayed.set_eps_field("2024", "VCSC", "value", "1.5")
+        self.assertEqual(eprice_widget.get_data(), [{"name": "SSI", "value": "10"}])
+        self.assertEqual(eps_widget.eps_year_entries[0]["company_entries"][0]["current_value"], "1.5")
+
+        eprice_widget.bind_quote_model(None)
+        displayed.set_entry_value("e_price", "SSI", "11")
+        self.assertEqual(eprice_widget.get_data(), [{"name": "SSI", "value": "10"}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# t:\Work\xml_input_ui\tests\test_sector_index.py
+import unittest
+from sector_index import SectorIndex
+
+class TestSectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.quotes = {
+            "date": "05/30/2025",
+            "VCB": {"name": "VCB", "sectors": [{"name": "BANK", "type": "main"}]},
+            "BID": {"name": "BID", "sectors": [{"name": "BANK", "type": "main"}]},
+            "SSI": {"name": "SSI", "sectors": [{"name": "BROKER", "type": "main"}, {"name": "BANK", "type": "sub"}]},
+            "HPG": {"name": "HPG"},
+        }
+        self.index = SectorIndex()
+        self.index.rebuild(self.quotes)
+
+    def test_lookup_by_sector_and_type(self):
+        self.assertEqual(self.index.quotes_in_sector(), ["BID", "HPG", "SSI", "VCB"])
+        self.assertEqual(self.index.quotes_in_sector("BANK"), ["BID", "SSI", "VCB"])
+        self.assertEqual(self.index.quotes_in_sector("BANK", "main"), ["BID", "VCB"])
+        self.assertEqual(self.index.quotes_in_sector("BANK", "sub"), ["SSI"])
+        self.assertEqual(self.index.quotes_in_sector("STEEL"), [])
+
+    def test_results_are_copies(self):
+        self.index.quotes_in_sector("BANK").append("XXX")
+        self.assertEqual(self.index.quotes_in_sector("BANK"), ["BID", "SSI", "VCB"])
+
+    def test_sector_change_is_reindexed_per_quote(self):
+        self.quotes["HPG"]["sectors"] = [{"name": "STEEL", "type": "main"}]
+        self.quotes["BID"]["sectors"][0]["type"] = "sub"
+        self.index.update_quotes(("HPG", "BID"), self.quotes)
+        self.assertEqual(self.index.quotes_in_sector("STEEL"), ["HPG"])
+        self.assertEqual(self.index.quotes_in_sector("BANK", "main"), ["VCB"])
+        self.assertEqual(self.index.quotes_in_sector("BANK", "sub"), ["BID", "SSI"])
+
+    def test_added_removed_and_renamed_quotes(self):
+        self.quotes["ACB"] = {"name": "ACB", "sectors": [{"name": "BANK"}]} # Missing type counts as main
+        del self.quotes["VCB"]
+        self.quotes["BID2"] = self.quotes.pop("BID")
+        self.index.update_quotes(("ACB", "VCB", "BID", "BID2"), self.quotes)
+        self.assertEqual(self.index.quotes_in_sector("BANK", "main"), ["ACB", "BID2"])
+        self.assertEqual(self.index.quotes_in_sector(), ["ACB", "BID2", "HPG", "SSI"])
+        self.assertEqual(self.index.sectors_of("VCB"), set())
+
+    def test_removing_last_quote_of_a_sector_type(self):
+        del self.quotes["SSI"]
+        self.index.update_quotes(("SSI",), self.quotes)
+        self.assertEqual(self.index.quotes_in_sector("BROKER"), [])
+        self.assertEqual(self.index.quotes_in_sector("BANK"), ["BID", "VCB"])
+
+    def test_none_rebuilds(self):
+        self.quotes["VCB"]["sectors"] = []
+        self.index.update_quotes(None, self.quotes)
+        self.assertEqual(self.index.quotes_in_sector("BANK"), ["BID", "SSI"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+# t:\Work\xml_input_ui\tests\test_snapshot_cache.py
+import unittest
+import os
+import pickle
+import tempfile
+from unittest.mock import patch
+import data_utils
+import snapshot_cache
+
+REPORT_XML = """<root>
+    <date>05/30/2025</date>
+    <quotes>
+        <quote><name>BID</name><price>40001</price></quote>
+        <quote><name>VCB</name><price>90000</price></quote>
+    </quotes>
+</root>"""
+
+class _RemoveFileOnUnpickle:
+    """Payload of a crafted sidecar: unpickling it with plain pickle would delete path."""
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (os.remove, (self.path,))
+
+class TestSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.xml_path = os.path.join(self.temp_dir.name, "report.xml")
+        self._write_xml(REPORT_XML)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_xml(self, content):
+        with open(self.xml_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _save(self, payload, kind="test"):
+        return snapshot_cache.save_snapshot(self.xml_path, kind, payload, snapshot_cache.file_key(self.xml_path))
+
+    def test_round_trip_for_unchanged_file(self):
+        self.assertTrue(self._save({"a": [1, 2]}))
+        self.assertTrue(os.path.exists(self.xml_path + ".snapshot"))
+        self.assertEqual(snapshot_cache.load_snapshot(self.xml_path, "test"), {"a": [1, 2]})
+
+    def test_missing_snapshot_is_a_miss(self):
+        self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "test"))
+
+    def test_modified_file_invalidates_snapshot(self):
+        self._save({"a": 1})
+        self._write_xml(REPORT_XML.replace("40001", "40002")) # Same size, new content
+        stat_result = os.stat(self.xml_path)
+        os.utime(self.xml_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "test"))
+
+    def test_content_hash_catches_changes_with_same_size_and_mtime(self):
+        self._save({"a": 1})
+        stat_result = os.stat(self.xml_path)
+        self._write_xml(REPORT_XML.replace("40001", "40002"))
+        os.utime(self.xml_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+        self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "test"))
+
+    def test_other_kind_or_version_is_a_miss(self):
+        self._save({"a": 1})
+        self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "other"))
+        with patch('snapshot_cache.SNAPSHOT_FORMAT_VERSION', snapshot_cache.SNAPSHOT_FORMAT_VERSION + 1):
+            self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "test"))
+
+    @patch('builtins.print')
+    def test_corrupt_snapshot_falls_back(self, mock_print):
+        with open(self.xml_path + ".snapshot", "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "test"))
+        mock_print.assert_called_once()
+
+    @patch('builtins.print')
+    def test_save_failure_is_reported_and_leaves_no_temp_file(self, mock_print):
+        with patch('snapshot_cache.os.replace', side_effect=OSError("Read-only")):
+            self.assertFalse(self._save({"a": 1}))
+        mock_print.assert_called_once()
+        self.assertEqual(os.listdir(self.temp_dir.name), ["report.xml"])
+
+    def _write_records(self, records, kind="test"):
+        writer = snapshot_cache.SnapshotRecordWriter(self.xml_path, kind, snapshot_cache.file_key(self.xml_path))
+        for record in records:
+            writer.write(record)
+        return writer
+
+    def test_record_round_trip_for_unchanged_file(self):
+        self.assertTrue(self._write_records([("a", 1), ("b", 2)]).commit())
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ["report.xml", "report.xml.snapshot"])
+        self.assertEqual(list(snapshot_cache.load_snapshot_records(self.xml_path, "test")), [("a", 1), ("b", 2)])
+        self.assertIsNone(snapshot_cache.load_snapshot_records(self.xml_path, "other"))
+
+    def test_discarded_records_leave_no_snapshot(self):
+        self._write_records([("a", 1)]).discard()
+        self.assertEqual(os.listdir(self.temp_dir.name), ["report.xml"])
+        self.assertIsNone(snapshot_cache.load_snapshot_records(self.xml_path, "test"))
+
+    def test_truncated_record_stream_raises(self):
+        self._write_records([("a", 1), ("b", 2)]).commit()
+        cache_path = self.xml_path + ".snapshot"
+        with open(cache_path, "rb") as f:
+            content = f.read()
+        with open(cache_path, "wb") as f:
+            f.write(content[:-2]) # Drops the end marker
+        records = snapshot_cache.load_snapshot_records(self.xml_path, "test")
+        self.assertEqual(next(records), ("a", 1))
+        with self.assertRaises(Exception):
+            list(records)
+
+    def _write_crafted_snapshot(self, kind, records):
+        canary_path = os.path.join(self.temp_dir.name, "canary")
+        open(canary_path, "w").close()
+        with open(self.xml_path + ".snapshot", "wb") as f:
+            pickle.dump(snapshot_cache._snapshot_header(kind, snapshot_cache.file_key(self.xml_path)), f)
+            for record in records(canary_path):
+                pickle.dump(record, f)
+        return canary_path
+
+    @patch('builtins.print')
+    def test_snapshot_naming_other_classes_is_rejected_unexecuted(self, mock_print):
+        canary_path = self._write_crafted_snapshot("test", lambda path: [{"a": _RemoveFileOnUnpickle(path)}])
+        self.assertIsNone(snapshot_cache.load_snapshot(self.xml_path, "test"))
+        self.assertTrue(os.path.exists(canary_path))
+        mock_print.assert_called_once()
+
+    def test_record_stream_naming_other_classes_is_rejected_unexecuted(self):
+        canary_path = self._write_crafted_snapshot("test", lambda path: [("a", 1), _RemoveFileOnUnpickle(path), None])
+        records = snapshot_cache.load_snapshot_records(self.xml_path, "test")
+        self.assertEqual(next(records), ("a", 1))
+        with self.assertRaises(pickle.UnpicklingError):
+            next(records)
+        self.assertTrue(os.path.exists(canary_path))
+
+class TestIterCachedXmlQuotes(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.xml_path = os.path.join(self.temp_dir.name, "report.xml")
+        with open(self.xml_path, "w", encoding="utf-8") as f:
+            f.write(REPORT_XML)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_second_read_replays_snapshot_without_parsing(self):
+        first_events = list(data_utils.iter_cached_xml_quotes(self.xml_path))
+        with patch('data_utils.iter_xml_quotes') as mock_iter:
+            second_events = list(data_utils.iter_cached_xml_quotes(self.xml_path))
+            mock_iter.assert_not_called()
+        self.assertEqual(second_events, first_events)
+        self.assertEqual([kind for kind, _ in second_events], ["date", "quote", "quote"])
+        self.assertEqual(second_events[2][1]["name"], "VCB")
+
+    def test_snapshot_keeps_parsed_values_even_if_consumer_edits_them(self):
+        for kind, payload in data_utils.iter_cached_xml_quotes(self.xml_path):
+            if kind == "quote":
+                payload["price"] = "edited"
+        prices = [p["price"] for kind, p in data_utils.iter_cached_xml_quotes(self.xml_path) if kind == "quote"]
+        self.assertEqual(prices, ["40001", "90000"])
+
+    def test_partial_iteration_does_not_write_snapshot(self):
+        events = data_utils.iter_cached_xml_quotes(self.xml_path)
+        next(events)
+        events.close()
+        self.assertEqual(os.listdir(self.temp_dir.name), ["report.xml"]) # Neither a snapshot nor its temp file
+
+    @patch('builtins.print')
+    def test_truncated_snapshot_resumes_from_xml_without_repeating_events(self, mock_print):
+        first_events = list(data_utils.iter_cached_xml_quotes(self.xml_path))
+        cache_path = self.xml_path + ".snapshot"
+        with open(cache_path, "rb") as f:
+            content = f.read()
+        with open(cache_path, "wb") as f:
+            f.write(content[:-2])
+        self.assertEqual(list(data_utils.iter_cached_xml_quotes(self.xml_path)), first_events)
+        mock_print.assert_called_once()
+        self.assertEqual(list(snapshot_cache.load_snapshot_records(self.xml_path, data_utils.REPORT_SNAPSHOT_KIND)),
+                         first_events)
+
+    @patch('builtins.print')
+    def test_corrupt_snapshot_falls_back_to_xml(self, mock_print):
+        with open(self.xml_path + ".snapshot", "wb") as f:
+            f.write(pickle.dumps("garbage")[:-3])
+        _, root_date, quotes = data_utils.iterparse_xml_data(self.xml_path)
+        self.assertEqual(list(quotes), ["BID", "VCB"])
+        self.assertEqual(root_date.toString("MM/dd/yyyy"), "05/30/2025")
+        # The fallback parse rewrote a valid snapshot
+        self.assertIsNotNone(snapshot_cache.load_snapshot_records(self.xml_path, data_utils.REPORT_SNAPSHOT_KIND))
+
+if __name__ == '__main__':
+    unittest.main()
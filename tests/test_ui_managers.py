@@ -0,0 +1,58 @@
+# t:\Work\xml_input_ui\tests\test_ui_managers.py
+import unittest
+from PyQt6.QtWidgets import QApplication, QLineEdit
+from PyQt6.QtCore import QCoreApplication, QEvent
+from ui_components.eprice_section_widget import EPriceSectionWidget
+from ui_components.pe_section_widget import PESectionWidget
+from ui_components.eps_section_widget import EPSSectionWidget
+from ui_managers import GlobalHighlightManager
+
+app = QApplication.instance() or QApplication([])
+
+FIXED_COMPANIES = ["VCSC", "SSI"]
+
+def _highlighted(boxes):
+    return {box.property("highlighted") for box in boxes}
+
+def _process_deletions():
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+class TestGlobalHighlightManager(unittest.TestCase):
+    def setUp(self):
+        self.companies = list(FIXED_COMPANIES)
+        self.eprice_widget = EPriceSectionWidget(lambda: self.companies)
+        self.pe_widget = PESectionWidget(lambda: self.companies)
+        self.eps_widget = EPSSectionWidget(self.companies)
+        self.eps_widget.load_data([{"name": "2023", "companies": []}, {"name": "2024", "companies": []}])
+        self.manager = GlobalHighlightManager(self.eprice_widget, self.eps_widget, self.pe_widget)
+
+    def test_focus_highlights_the_company_in_every_section(self):
+        ssi_boxes = self.manager.company_boxes.boxes_of("SSI")
+        self.assertEqual(len(ssi_boxes), 4) # E-Price, PE and both EPS years
+        line_edit = QLineEdit()
+
+        self.manager.handle_company_widget_focus_gained("SSI", line_edit)
+        self.assertEqual(_highlighted(ssi_boxes), {True})
+        self.assertEqual(_highlighted(self.manager.company_boxes.boxes_of("VCSC")), {False})
+
+        self.manager.handle_company_widget_focus_lost("SSI", line_edit)
+        self.assertEqual(_highlighted(ssi_boxes), {False})
+
+    def test_registry_follows_boxes_as_they_are_built_and_destroyed(self):
+        self.companies[:] = ["VCSC", "HSC"]
+        self.eprice_widget.refresh_structure()
+        self.eps_widget.refresh_structure_with_new_fixed_companies(self.companies)
+        _process_deletions()
+        self.assertEqual(len(self.manager.company_boxes.boxes_of("SSI")), 1) # Only PE still shows it
+        self.assertEqual(len(self.manager.company_boxes.boxes_of("HSC")), 3) # E-Price and both rebuilt EPS years
+
+    def test_hidden_box_is_repolished_when_shown(self):
+        box = self.eprice_widget.eprice_entries[1]["widget"]
+        self.manager.handle_company_widget_focus_gained("SSI", QLineEdit())
+        self.assertTrue(box._style_stale) # Never shown, so nothing was repolished yet
+        self.eprice_widget.show()
+        self.assertFalse(box._style_stale)
+        self.eprice_widget.hide()
+
+if __name__ == '__main__':
+    unittest.main()
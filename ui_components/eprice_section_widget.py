@@ -6,9 +6,10 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from dialogs import EPriceCompanySelectionDialog
 from custom_widgets import FocusAwareLineEdit, HighlightableGroupBox
-from .ui_utils import _clear_qt_layout # Import from the new ui_utils
+from .ui_utils import _sync_named_layout_entries
 
 class EPriceSectionWidget(QWidget):
+    MODEL_SECTION = "e_price" # Quote model section whose value changes this widget follows
     companyFocusGained = pyqtSignal(str, QLineEdit)
     companyFocusLost = pyqtSignal(str, QLineEdit)
     ePriceValueChanged = pyqtSignal(str, str, str)
@@ -18,6 +19,8 @@ class EPriceSectionWidget(QWidget):
         self.fixed_companies_provider_func = fixed_companies_provider_func
         self.eprice_entries = []
         self.selected_eprice_companies_to_display = []
+        self._quote_model = None
+        self.highlight_registry = None # Set by GlobalHighlightManager; company boxes are registered as they are built
         self._init_ui()
 
     def _init_ui(self):
@@ -64,17 +67,22 @@ class EPriceSectionWidget(QWidget):
         gbox_layout.addLayout(form)
         self.eprice_items_layout.addWidget(company_gbox)
         self.eprice_entries.append(entry_data)
+        self._register_company_box(company_gbox)
+        return entry_data
 
     def refresh_structure(self, new_fixed_companies=None):
         fixed_companies = new_fixed_companies if new_fixed_companies is not None else self.fixed_companies_provider_func()
-        current_vals = {e["name"]: e["value_edit"].text() for e in self.eprice_entries}
-        _clear_qt_layout(self.eprice_items_layout)
-        self.eprice_entries.clear()
         self.selected_eprice_companies_to_display = list(fixed_companies)
-        for name in fixed_companies:
-            self._create_company_ui(name, current_vals.get(name, ""))
+        # Company boxes are keyed by name and rebound by load_data(); a changed fixed list only adds, removes and moves boxes
+        if [e["name"] for e in self.eprice_entries] != list(fixed_companies):
+            _sync_named_layout_entries(self.eprice_entries, list(fixed_companies), self.eprice_items_layout,
+                                       self._create_company_ui, self._release_company_entry)
         self._update_visible_companies()
 
+    def _release_company_entry(self, entry_data):
+        entry_data["widget"].hide()
+        entry_data["widget"].deleteLater()
+
     def _handle_eprice_value_changed(self, line_edit, entry_data):
         new_val = line_edit.text().strip()
         old_val = entry_data.get("current_value", "")
@@ -95,6 +103,17 @@ class EPriceSectionWidget(QWidget):
             entry["value_edit"].clear()
             entry["current_value"] = ""
 
+    def bind_quote_model(self, quote_model):
+        """Follows the value changes of the displayed quote's model (None stops following the previous one)."""
+        if self._quote_model is not None:
+            self._quote_model.unobserve(self.MODEL_SECTION, self._on_model_value_changed)
+        self._quote_model = quote_model
+        if quote_model is not None:
+            quote_model.observe(self.MODEL_SECTION, self._on_model_value_changed)
+
+    def _on_model_value_changed(self, company_name, field, value):
+        self.update_company_value(company_name, value, from_command=True)
+
     def update_company_value(self, company_name, value, from_command=False):
         for entry in self.eprice_entries:
             if entry["name"] == company_name:
@@ -118,11 +137,14 @@ class EPriceSectionWidget(QWidget):
             widget = entry.get("widget")
             if widget: widget.setVisible(entry["name"] in self.selected_eprice_companies_to_display)
 
-    def update_company_highlight_state(self, company_name, highlight_state):
+    def set_highlight_registry(self, registry):
+        self.highlight_registry = registry
         for entry in self.eprice_entries:
-            if entry.get("name") == company_name:
-                gbox = entry.get("widget")
-                if isinstance(gbox, HighlightableGroupBox): gbox.setHighlightedState(highlight_state)
+            self._register_company_box(entry["widget"])
+
+    def _register_company_box(self, company_gbox):
+        if self.highlight_registry is not None:
+            self.highlight_registry.register(company_gbox)
 
     def setEnabled(self, enabled):
         self.eprice_group.setEnabled(enabled)
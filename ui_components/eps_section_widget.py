@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from dialogs import EPSYearSelectionDialog, EPriceCompanySelectionDialog # Assuming dialogs.py remains separate
 from custom_widgets import FocusAwareLineEdit, HighlightableGroupBox
-from .ui_utils import _clear_qt_layout # Import from the new ui_utils
+from .ui_utils import _sync_named_layout_entries, request_layout_refresh
 
 class EPSSectionWidget(QWidget):
     companyLineEditFocusGained = pyqtSignal(str, QLineEdit)
@@ -24,6 +24,9 @@ class EPSSectionWidget(QWidget):
         self.eps_year_entries = []
         self.selected_eps_years_to_display = []
         self.fixed_companies_provider = fixed_companies_provider
+        self._spare_year_entries = [] # Detached year boxes, rebound by _add_eps_year_fields instead of rebuilt
+        self._quote_model = None # The displayed quote's model, whose EPS value/growth changes this widget follows
+        self.highlight_registry = None # Set by GlobalHighlightManager; company boxes are registered as they are built
         self._init_ui()
 
     def _init_ui(self):
@@ -60,47 +63,86 @@ class EPSSectionWidget(QWidget):
         self.clear_data()
         eps_data_list = eps_data_list or []
         for year_data in eps_data_list:
-            self._add_eps_year_fields(
-                year_name_str=year_data.get("name", ""),
-                companies_data_list=year_data.get("companies", [])
-            )
-        self._update_visible_eps_years()
+            self._append_eps_year_entry(year_data.get("name", ""), year_data.get("companies", []))
+        self._update_visible_eps_years() # Builds panels for the shown years only
 
     def get_data(self):
         return [
             {"name": ye.get("year_name",""),
              "companies": [{"name": ce.get("name",""), "value": ce["value_edit"].text(), "growth": ce["growth_edit"].text()}
-                           for ce in ye["company_entries"]]}
+                           for ce in ye["company_entries"]] if ye["widget"] is not None else
+                          [{"name": name, "value": ye["company_values"].get(name, {}).get("value", ""),
+                            "growth": ye["company_values"].get(name, {}).get("growth", "")}
+                           for name in self.fixed_companies_provider]}
             for ye in self.eps_year_entries
         ]
 
     def clear_data(self):
-        _clear_qt_layout(self.eps_items_layout)
+        for year_entry_data in self.eps_year_entries:
+            self._release_eps_year_entry(year_entry_data)
         self.eps_year_entries.clear()
         self.selected_eps_years_to_display.clear()
         self._update_visible_eps_years()
 
     def refresh_structure_with_new_fixed_companies(self, new_fixed_companies_list):
+        """Applies a changed fixed company list to every year: only added, removed and moved company boxes are touched."""
+        new_names = list(new_fixed_companies_list)
         self.fixed_companies_provider = new_fixed_companies_list
-        stored_selections = {e["year_name"]: list(e["selected_companies_to_display_for_year"]) for e in self.eps_year_entries}
-        current_data = self.get_data()
-        _clear_qt_layout(self.eps_items_layout)
-        self.eps_year_entries.clear()
-        self.load_data(current_data)
-        for ye in self.eps_year_entries:
-            if ye["year_name"] in stored_selections:
-                original_selection = stored_selections[ye["year_name"]]
-                ye["selected_companies_to_display_for_year"] = [c for c in original_selection if c in self.fixed_companies_provider]
-            self._update_visible_eps_companies_for_year(ye)
+        for ye in self.eps_year_entries + self._spare_year_entries:
+            ye["selected_companies_to_display_for_year"] = [c for c in ye["selected_companies_to_display_for_year"] if c in new_names]
+            if ye["widget"] is None: # Not built yet; its panel is built with the new list
+                ye["company_values"] = {name: values for name, values in ye["company_values"].items() if name in new_names}
+                continue
+            if [ce["name"] for ce in ye["company_entries"]] != new_names:
+                _sync_named_layout_entries(ye["company_entries"], new_names, ye["companies_layout"],
+                                           lambda name, ye=ye: self._add_eps_company_to_year_ui(ye, name),
+                                           self._release_eps_company_entry)
+            if ye in self.eps_year_entries:
+                self._update_visible_eps_companies_for_year(ye)
+
+    def _release_eps_company_entry(self, company_data):
+        company_data["widget"].hide()
+        company_data["widget"].deleteLater()
 
     def _add_eps_year_fields(self, year_name_str="", companies_data_list=None):
         if not year_name_str:
             QMessageBox.warning(self, "Input Error", "Year name is required for EPS entry.")
             return
-        companies_data_list = companies_data_list or []
-        selected_companies_for_this_year = list(self.fixed_companies_provider)
+        self._append_eps_year_entry(year_name_str, companies_data_list or [])
+        self._update_visible_eps_years()
+
+    def _append_eps_year_entry(self, year_name_str, companies_data_list):
+        """
+        Adds a year as plain data ({"widget": None, "company_values": {...}}); its panel is built by
+        _update_visible_eps_years() the first time the year is shown.
+        """
+        if not year_name_str:
+            return
+        self.eps_year_entries.append({
+            "year_name": year_name_str, "widget": None, "company_entries": [],
+            "company_values": {c.get("name"): {"value": c.get("value", ""), "growth": c.get("growth", "")} for c in companies_data_list},
+            "selected_companies_to_display_for_year": list(self.fixed_companies_provider),
+        })
+
+    def _build_eps_year_panel(self, year_data_entry):
+        """Returns a panel (a spare one rebound, or a new one) showing a year kept as plain data; it replaces that entry."""
+        year_entry_data = self._spare_year_entries.pop() if self._spare_year_entries else self._create_eps_year_entry()
+        year_name_str = year_data_entry["year_name"]
+        year_entry_data["year_name"] = year_name_str
+        year_entry_data["selected_companies_to_display_for_year"] = year_data_entry["selected_companies_to_display_for_year"]
+        year_entry_data["widget"].setTitle(f"EPS {year_name_str}")
+        year_entry_data["choose_companies_button"].setToolTip(f"Select which companies to display for EPS {year_name_str}")
+
+        company_values = year_data_entry["company_values"]
+        for company_data in year_entry_data["company_entries"]:
+            values = company_values.get(company_data["name"], {})
+            self._set_eps_company_values(company_data, values.get("value", ""), values.get("growth", ""))
+        self._update_visible_eps_companies_for_year(year_entry_data)
+        return year_entry_data
 
-        eps_year_group_box = QGroupBox(f"EPS {year_name_str}")
+    def _create_eps_year_entry(self):
+        """Builds an empty year box with one company box per fixed company; _add_eps_year_fields binds it to a year."""
+        eps_year_group_box = QGroupBox()
         year_main_layout = QVBoxLayout(eps_year_group_box)
         year_main_layout.setContentsMargins(2, 2, 2, 2)
         year_main_layout.setSpacing(3)
@@ -112,7 +154,6 @@ class EPSSectionWidget(QWidget):
         remove_year_button.setFixedSize(20, 20)
 
         choose_companies_button = QPushButton("Choose Companies")
-        choose_companies_button.setToolTip(f"Select which companies to display for EPS {year_name_str}")
         choose_companies_button.setFixedHeight(20)
         
         refresh_button = QPushButton(icon=QApplication.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload))
@@ -120,9 +161,9 @@ class EPSSectionWidget(QWidget):
         refresh_button.setFixedSize(20,20)
         
         year_entry_data = {
-            "year_name": year_name_str, "companies_layout": QHBoxLayout(),
+            "year_name": "", "companies_layout": QHBoxLayout(),
             "company_entries": [], "widget": eps_year_group_box,
-            "selected_companies_to_display_for_year": selected_companies_for_this_year,
+            "selected_companies_to_display_for_year": [],
             "choose_companies_button": choose_companies_button
         }
         year_entry_data["companies_layout"].setContentsMargins(0,0,0,0)
@@ -138,19 +179,32 @@ class EPSSectionWidget(QWidget):
         year_main_layout.addLayout(year_title_bar_layout)
         year_main_layout.addLayout(year_entry_data["companies_layout"])
 
-        self.eps_items_layout.addWidget(eps_year_group_box)
-        self.eps_year_entries.append(year_entry_data)
-
-        companies_data_dict = {c.get("name"): c for c in companies_data_list}
         for fixed_name in self.fixed_companies_provider:
-            xml_data = companies_data_dict.get(fixed_name, {})
-            self._add_eps_company_to_year_ui(year_entry_data, fixed_name, xml_data.get("value", ""), xml_data.get("growth", ""))
-        self._update_visible_eps_companies_for_year(year_entry_data)
-        self._update_visible_eps_years()
+            self._add_eps_company_to_year_ui(year_entry_data, fixed_name)
+        return year_entry_data
+
+    def _release_eps_year_entry(self, year_entry_data):
+        """Detaches a year box from the layout and keeps it for reuse, unless it was built for another company list."""
+        widget = year_entry_data.get("widget")
+        if not widget: return
+        self.eps_items_layout.removeWidget(widget)
+        widget.hide()
+        if [ce["name"] for ce in year_entry_data["company_entries"]] == list(self.fixed_companies_provider):
+            self._spare_year_entries.append(year_entry_data)
+        else:
+            widget.deleteLater()
+
+    def _discard_spare_eps_year_entries(self):
+        for year_entry_data in self._spare_year_entries:
+            year_entry_data["widget"].deleteLater()
+        self._spare_year_entries.clear()
 
     def _remove_dynamic_list_entry(self, entry_data_dict, entry_list):
         if entry_data_dict in entry_list:
             entry_list.remove(entry_data_dict)
+        if entry_list is self.eps_year_entries:
+            self._release_eps_year_entry(entry_data_dict)
+            return
         widget = entry_data_dict.get("widget")
         if widget: widget.deleteLater()
 
@@ -186,14 +240,25 @@ class EPSSectionWidget(QWidget):
         company_data = {"name": company_name_str, "value_edit": val_edit, "growth_edit": growth_edit,
                         "widget": company_gbox, "current_value": company_value_str, "current_growth": company_growth_str}
         
-        val_edit.editingFinished.connect(lambda le=val_edit, ed=company_data, yn=year_entry_data["year_name"], fn="value": self._handle_eps_value_changed(le, ed, yn, fn))
-        val_edit.returnPressed.connect(lambda le=val_edit, ed=company_data, yn=year_entry_data["year_name"], fn="value": self._handle_eps_value_changed(le, ed, yn, fn))
-        growth_edit.editingFinished.connect(lambda le=growth_edit, ed=company_data, yn=year_entry_data["year_name"], fn="growth": self._handle_eps_value_changed(le, ed, yn, fn))
-        growth_edit.returnPressed.connect(lambda le=growth_edit, ed=company_data, yn=year_entry_data["year_name"], fn="growth": self._handle_eps_value_changed(le, ed, yn, fn))
+        # The year is read when the edit happens, since a reused year box can be rebound to another year
+        val_edit.editingFinished.connect(lambda le=val_edit, ed=company_data, ye=year_entry_data, fn="value": self._handle_eps_value_changed(le, ed, ye["year_name"], fn))
+        val_edit.returnPressed.connect(lambda le=val_edit, ed=company_data, ye=year_entry_data, fn="value": self._handle_eps_value_changed(le, ed, ye["year_name"], fn))
+        growth_edit.editingFinished.connect(lambda le=growth_edit, ed=company_data, ye=year_entry_data, fn="growth": self._handle_eps_value_changed(le, ed, ye["year_name"], fn))
+        growth_edit.returnPressed.connect(lambda le=growth_edit, ed=company_data, ye=year_entry_data, fn="growth": self._handle_eps_value_changed(le, ed, ye["year_name"], fn))
 
         year_entry_data["companies_layout"].addWidget(company_gbox)
         year_entry_data["company_entries"].append(company_data)
+        if self.highlight_registry is not None:
+            self.highlight_registry.register(company_gbox)
         self._update_eps_year_companies_area_size(year_entry_data)
+        return company_data
+
+    def _set_eps_company_values(self, company_data, value_str, growth_str):
+        company_data["value_edit"].setText(value_str)
+        company_data["growth_edit"].setText(growth_str)
+        company_data["current_value"] = value_str
+        company_data["current_growth"] = growth_str
+        company_data["widget"].setHighlightedState(False) # May still be highlighted from the previous binding
 
     def _handle_choose_eps_companies_for_year(self, year_entry_data):
         if not year_entry_data: return
@@ -209,8 +274,24 @@ class EPSSectionWidget(QWidget):
         if new_val != old_val:
             self.epsValueChanged.emit(year_name, company_entry["name"], field_name, old_val, new_val)
 
+    def bind_quote_model(self, quote_model):
+        """Follows the EPS value/growth changes of quote_model (None stops following the previous one)."""
+        if self._quote_model is not None:
+            self._quote_model.unobserve("eps", self._on_model_eps_field_changed)
+        self._quote_model = quote_model
+        if quote_model is not None:
+            quote_model.observe("eps", self._on_model_eps_field_changed)
+
+    def _on_model_eps_field_changed(self, year_and_company, field_name, value):
+        self.update_company_eps_field(*year_and_company, field_name, value, from_command=True)
+
     def update_company_eps_field(self, year_name, company_name, field_name, value, from_command=False):
         for ye in self.eps_year_entries:
+            if ye["year_name"] == year_name and ye["widget"] is None: # Not built yet: keep the value for its panel
+                ye["company_values"].setdefault(company_name, {"value": "", "growth": ""})[field_name] = value
+                if field_name == "growth":
+                    self.epsGrowthDataPotentiallyChanged.emit(year_name)
+                return
             if ye["year_name"] == year_name:
                 for ce in ye["company_entries"]:
                     if ce["name"] == company_name:
@@ -225,7 +306,7 @@ class EPSSectionWidget(QWidget):
                         return
 
     def _update_visible_eps_companies_for_year(self, year_entry_data):
-        if not year_entry_data or "company_entries" not in year_entry_data: return
+        if not year_entry_data or year_entry_data.get("widget") is None: return # The selection is applied when the panel is built
         year_entry_data["choose_companies_button"].setEnabled(len(self.fixed_companies_provider) > 0)
         for ce in year_entry_data["company_entries"]:
             widget = ce.get("widget")
@@ -233,6 +314,11 @@ class EPSSectionWidget(QWidget):
         self._update_eps_year_companies_area_size(year_entry_data)
 
     def _update_eps_year_companies_area_size(self, year_entry_data):
+        year_gbox = year_entry_data.get("widget")
+        if year_gbox is not None: # Keyed by the box, so a pooled panel is refreshed with its current entry
+            request_layout_refresh((self, year_gbox), lambda: self._resize_eps_year_box(year_entry_data))
+
+    def _resize_eps_year_box(self, year_entry_data):
         companies_layout = year_entry_data.get("companies_layout")
         if companies_layout: companies_layout.activate()
         year_gbox = year_entry_data.get("widget")
@@ -247,36 +333,42 @@ class EPSSectionWidget(QWidget):
 
     def _update_visible_eps_years(self):
         self.eps_year_entries.sort(key=lambda e: self._get_eps_year_sort_key(e.get("year_name", "")))
-        while self.eps_items_layout.count():
-            item = self.eps_items_layout.takeAt(0)
-            if item.widget(): item.widget().setParent(None)
-        for ye_data in self.eps_year_entries:
-            widget = ye_data.get("widget")
-            if widget: self.eps_items_layout.addWidget(widget)
-        
         self.choose_year_button.setEnabled(len(self.eps_year_entries) > 0)
-        target_visible = [n for n in self.selected_eps_years_to_display if any(e.get("year_name") == n for e in self.eps_year_entries)][:2]
+        year_names = {e.get("year_name") for e in self.eps_year_entries}
+        target_visible = [n for n in self.selected_eps_years_to_display if n in year_names][:2]
         if len(target_visible) < 2:
             for ye_data in self.eps_year_entries:
                 if len(target_visible) >= 2: break
                 name = ye_data.get("year_name")
                 if name and name not in target_visible: target_visible.append(name)
+
+        # Years are built the first time they are shown; hidden ones stay plain data
+        for index, ye_data in enumerate(self.eps_year_entries):
+            if ye_data.get("widget") is None and ye_data.get("year_name") in target_visible:
+                self.eps_year_entries[index] = self._build_eps_year_panel(ye_data)
+
+        while self.eps_items_layout.count():
+            self.eps_items_layout.takeAt(0) # Only reorders; the boxes stay children of the group box
+        for ye_data in self.eps_year_entries:
+            widget = ye_data.get("widget")
+            if widget: self.eps_items_layout.addWidget(widget)
         
         for ye_data in self.eps_year_entries:
             widget, name = ye_data.get("widget"), ye_data.get("year_name")
             if widget and name: widget.setVisible(name in target_visible)
 
+        request_layout_refresh((self, "eps_group_box"), self._update_eps_group_box_size)
+
+    def _update_eps_group_box_size(self):
         if self.eps_group_box.layout():
             self.eps_group_box.layout().activate()
             self.eps_group_box.adjustSize()
 
-    def update_company_highlight_state(self, company_name, highlight_state):
-        for ye in self.eps_year_entries:
-            if ye.get("widget") and ye["widget"].isVisible():
-                for ce in ye.get("company_entries", []):
-                    if ce.get("name") == company_name:
-                        gbox = ce.get("widget")
-                        if isinstance(gbox, HighlightableGroupBox): gbox.setHighlightedState(highlight_state)
+    def set_highlight_registry(self, registry):
+        self.highlight_registry = registry
+        for ye in self.eps_year_entries + self._spare_year_entries:
+            for ce in ye.get("company_entries", []): # Empty for years not built yet
+                registry.register(ce["widget"])
 
     def _handle_choose_eps_year_dialog(self):
         if not self.eps_year_entries:
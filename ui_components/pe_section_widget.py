@@ -7,6 +7,7 @@ from .eprice_section_widget import EPriceSectionWidget # Import base class
 from custom_widgets import FocusAwareLineEdit, HighlightableGroupBox
 
 class PESectionWidget(EPriceSectionWidget):
+    MODEL_SECTION = "pe"
     peValueChanged = pyqtSignal(str, str, str)
     
     def __init__(self, fixed_companies_provider_func, parent=None):
@@ -40,6 +41,8 @@ class PESectionWidget(EPriceSectionWidget):
         gbox_layout.addLayout(form)
         self.eprice_items_layout.addWidget(company_gbox)
         self.eprice_entries.append(entry_data)
+        self._register_company_box(company_gbox)
+        return entry_data
 
     def _handle_pe_value_changed(self, line_edit, entry_data):
         new_val = line_edit.text().strip()
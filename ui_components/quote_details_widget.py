@@ -12,6 +12,7 @@ class QuoteDetailsWidget(QWidget):
         super().__init__(parent)
         self._current_name = ""
         self._current_price = ""
+        self._quote_model = None # The displayed quote's model, whose name/price changes this widget follows
         self._init_ui()
 
     def _init_ui(self):
@@ -65,6 +66,17 @@ class QuoteDetailsWidget(QWidget):
         self._current_price = ""
         self.details_group.setEnabled(False)
 
+    def bind_quote_model(self, quote_model):
+        """Follows name/price changes of quote_model (None stops following the previous one)."""
+        if self._quote_model is not None:
+            self._quote_model.unobserve("details", self._on_model_detail_changed)
+        self._quote_model = quote_model
+        if quote_model is not None:
+            quote_model.observe("details", self._on_model_detail_changed)
+
+    def _on_model_detail_changed(self, key, field_name, value):
+        self.update_field_value(field_name, value, from_command=True)
+
     def update_field_value(self, field_name, value, from_command=False):
         if field_name == "name":
             self.name_edit.blockSignals(True)
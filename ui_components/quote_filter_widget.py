@@ -1,20 +1,33 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QComboBox, QLabel, QListWidget
+    QComboBox, QLabel, QListView
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QObject
+from PyQt6.QtCore import pyqtSignal, Qt, QObject, QTimer
 from PyQt6.QtGui import QKeyEvent
+from .quote_list_model import QuoteListModel, QuoteFilterProxyModel
 
 
 class QuoteFilterWidget(QWidget):
+    NAVIGATION_IDLE_MS = 150 # Arrow-key selections are only emitted once the keys have been idle this long
     filterChanged = pyqtSignal(list)  # Signal now emits the filtered quote list
     quoteSelected = pyqtSignal(str)  # New signal for quote selection
 
-    def __init__(self, sectors_list_provider, all_quotes_data_provider, parent=None):  # Add callback
+    def __init__(self, sectors_list_provider, all_quotes_data_provider, parent=None, sector_index=None,
+                 quote_list_model=None):  # Add callback
         super().__init__(parent)
         self.sectors_list_provider = sectors_list_provider
         self.all_quotes_data_provider = all_quotes_data_provider
+        self.sector_index = sector_index # SectorIndex kept current by the editor; without it, filtering scans all quotes
+        # The editor shares one QuoteListModel between views; the list shows it through a sector filter proxy
+        self.quote_list_model = quote_list_model if quote_list_model is not None else QuoteListModel(self)
+        self.filter_proxy_model = QuoteFilterProxyModel(self)
+        self.filter_proxy_model.setSourceModel(self.quote_list_model)
         self.selected_sector = None  # Keep as None for "All Sectors"
+        self._pending_quote_name = None # Last arrow-key selection, emitted when the navigation timer fires
+        self._navigation_timer = QTimer(self)
+        self._navigation_timer.setSingleShot(True)
+        self._navigation_timer.setInterval(self.NAVIGATION_IDLE_MS)
+        self._navigation_timer.timeout.connect(self.flush_pending_navigation)
         self._init_ui()
         self._populate_sector_combo()
 
@@ -36,11 +49,18 @@ class QuoteFilterWidget(QWidget):
         
         filter_layout.addWidget(self.sector_combo)
 
-        # Add List Widget to display filtered quotes - Inside the group box, below the label and combo
-        self.filtered_quotes_list = QListWidget()
+        # Add List View to display filtered quotes - Inside the group box, below the label and combo
+        self.filtered_quotes_list = QListView()
+        self.filtered_quotes_list.setUniformItemSizes(True) # Lets the view skip measuring every row
+        self.filtered_quotes_list.setModel(self.filter_proxy_model)
         self.filtered_quotes_list.keyPressEvent = self.list_key_press_event
-        self.filtered_quotes_list.itemClicked.connect(self._on_filtered_quote_clicked) # Connect click signal
+        self.filtered_quotes_list.clicked.connect(self._on_filtered_quote_clicked) # Connect click signal
         filter_layout.addWidget(self.filtered_quotes_list)
+
+        # Name and price of the highlighted quote, shown at once while the full display waits for navigation to settle
+        self.preview_label = QLabel()
+        self.preview_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        filter_layout.addWidget(self.preview_label)
         layout.addWidget(filter_group)
 
     def _populate_sector_combo(self):
@@ -55,6 +75,8 @@ class QuoteFilterWidget(QWidget):
         self._populate_sector_combo()
 
     def _filter_quotes(self, selected_sector):
+        if self.sector_index is not None:
+            return self.sector_index.quotes_in_sector(selected_sector or None) # Already sorted
         all_quotes_data = self.all_quotes_data_provider
         if not all_quotes_data:
             return []
@@ -83,25 +105,92 @@ class QuoteFilterWidget(QWidget):
             self._update_filtered_quotes_list_ui(filtered_quotes)
     
     def list_key_press_event(self, event: QKeyEvent):
+        current_row = self.filtered_quotes_list.currentIndex().row() # -1 when nothing is current
         if event.key() == Qt.Key.Key_Up:
-            new_row = max(0, self.filtered_quotes_list.currentRow() - 1)
-            self.filtered_quotes_list.setCurrentRow(new_row)
-            if self.filtered_quotes_list.currentItem():
-                self._on_filtered_quote_clicked(self.filtered_quotes_list.currentItem())
+            self._move_to_row(max(0, current_row - 1))
         elif event.key() == Qt.Key.Key_Down:
-            new_row = min(self.filtered_quotes_list.count() - 1, self.filtered_quotes_list.currentRow() + 1)
-            self.filtered_quotes_list.setCurrentRow(new_row)
-            if self.filtered_quotes_list.currentItem():
-                self._on_filtered_quote_clicked(self.filtered_quotes_list.currentItem())
-
-    def _on_filtered_quote_clicked(self, item):
-        selected_quote = item.text()  # Get the text of the selected item (quote name)
+            self._move_to_row(min(self.filter_proxy_model.rowCount() - 1, current_row + 1))
+
+    def _move_to_row(self, row):
+        index = self.filter_proxy_model.index(row, 0)
+        if index.isValid():
+            self.filtered_quotes_list.setCurrentIndex(index)
+            self._schedule_quote_selection(index.data())
+
+    def _schedule_quote_selection(self, quote_name):
+        """
+        Arrow-key navigation: the highlight and preview move immediately, but quoteSelected (which triggers
+        the full quote display) is only emitted for the last quote once navigation pauses. Holding a key
+        therefore renders one quote instead of every quote passed on the way.
+        """
+        self._show_preview(quote_name)
+        self._pending_quote_name = quote_name
+        self._navigation_timer.start() # Restarts the idle interval
+
+    def flush_pending_navigation(self):
+        """Emits the pending arrow-key selection now, if there is one."""
+        self._navigation_timer.stop()
+        quote_name, self._pending_quote_name = self._pending_quote_name, None
+        if quote_name and quote_name in (self.all_quotes_data_provider or {}): # It may have been removed meanwhile
+            self.quoteSelected.emit(quote_name)
+
+    def cancel_pending_navigation(self):
+        self._navigation_timer.stop()
+        self._pending_quote_name = None
+
+    def _show_preview(self, quote_name):
+        quote_data = (self.all_quotes_data_provider or {}).get(quote_name)
+        price = quote_data.get("price", "") if isinstance(quote_data, dict) else ""
+        self.preview_label.setText(f"{quote_name}    Price: {price}" if price else quote_name)
+
+    def _on_filtered_quote_clicked(self, index):
+        selected_quote = index.data()  # Get the text of the selected row (quote name)
+        self.cancel_pending_navigation() # A click is deliberate, show it right away
+        self._show_preview(selected_quote)
         self.quoteSelected.emit(selected_quote)  # Emit the new signal
 
     def _update_filtered_quotes_list_ui(self, filtered_quotes):
-        self.filtered_quotes_list.clear()
-        for quote_name in filtered_quotes:
-            self.filtered_quotes_list.addItem(quote_name)
+        self.cancel_pending_navigation()
+        self.preview_label.clear()
+        # None (All Sectors) shows the whole model; otherwise only the listed quotes pass the proxy
+        self.filter_proxy_model.set_accepted_names(filtered_quotes if self._is_sector_selected() else None)
+
+    def _is_sector_selected(self):
+        return bool(self.selected_sector) and self.selected_sector != "All Sectors"
+
+    def _quote_matches_sector(self, quote_data, sector):
+        if not sector or sector == "All Sectors":
+            return True
+        return any(s.get("name") == sector for s in quote_data.get("sectors", []))
+
+    def quotes_changed(self, quote_names):
+        """
+        Keeps the sector filter in step after quotes were added, removed, renamed or had their sectors
+        changed (None means "any quote"). Call it before the shared QuoteListModel is updated, so
+        inserted rows are filtered with the new membership.
+        """
+        if not self._is_sector_selected():
+            return
+        if quote_names is None:
+            self.filter_proxy_model.set_accepted_names(self._filter_quotes(self.selected_sector))
+            return
+        all_quotes_data = self.all_quotes_data_provider or {}
+        listed_membership_changed = False
+        for quote_name in quote_names:
+            quote_data = all_quotes_data.get(quote_name)
+            accepted = (quote_name != "date" and isinstance(quote_data, dict)
+                        and self._quote_matches_sector(quote_data, self.selected_sector))
+            if self.filter_proxy_model.set_quote_accepted(quote_name, accepted):
+                # Only rows that stay in the model need re-filtering; removals and inserts are handled by the proxy
+                listed_membership_changed = (listed_membership_changed or quote_data is not None
+                                             and self.quote_list_model.row_of(quote_name) >= 0)
+        if listed_membership_changed:
+            self.filter_proxy_model.invalidateFilter()
+
+    def reset_navigation(self):
+        """Drops the pending selection and preview, e.g. when a new file replaces the listed quotes."""
+        self.cancel_pending_navigation()
+        self.preview_label.clear()
 
     def clear_filter(self):
         self.sector_combo.setCurrentIndex(0)  
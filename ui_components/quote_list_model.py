@@ -0,0 +1,145 @@
+# t:\Work\xml_input_ui\ui_components\quote_list_model.py
+import bisect
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+
+
+class QuoteListModel(QAbstractListModel):
+    """
+    Sorted list of the editor's quote names, shared by the quote completer and the filtered quote list.
+    Changes are applied as row inserts, removals and moves, so views keep their selection and scroll
+    position; only loading a whole file resets the model.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._quote_names = [] # Sorted
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._quote_names)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._quote_names):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._quote_names[index.row()]
+        return None
+
+    def quote_name_at(self, row):
+        return self._quote_names[row]
+
+    def quote_names(self):
+        return list(self._quote_names)
+
+    def row_of(self, quote_name):
+        """Returns the row of quote_name, or -1 if it is not listed."""
+        row = bisect.bisect_left(self._quote_names, quote_name)
+        if row < len(self._quote_names) and self._quote_names[row] == quote_name:
+            return row
+        return -1
+
+    def reset_quotes(self, quote_names):
+        """Replaces the whole list (loading or clearing a file)."""
+        self.beginResetModel()
+        self._quote_names = sorted(set(quote_names) - {"date"})
+        self.endResetModel()
+
+    def add_quotes(self, quote_names):
+        for quote_name in quote_names:
+            if quote_name == "date" or self.row_of(quote_name) >= 0:
+                continue
+            row = bisect.bisect_left(self._quote_names, quote_name)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._quote_names.insert(row, quote_name)
+            self.endInsertRows()
+
+    def remove_quote(self, quote_name):
+        row = self.row_of(quote_name)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._quote_names[row]
+        self.endRemoveRows()
+
+    def rename_quote(self, old_name, new_name):
+        """Renames a row in place (moving it to keep the list sorted), so views keep it selected."""
+        old_row = self.row_of(old_name)
+        if old_row < 0 or self.row_of(new_name) >= 0:
+            return
+        remaining_names = self._quote_names[:old_row] + self._quote_names[old_row + 1:]
+        new_row = bisect.bisect_left(remaining_names, new_name)
+        if new_row != old_row:
+            # Qt's destination row counts positions before the move
+            destination_row = new_row if new_row < old_row else new_row + 1
+            self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), destination_row)
+            remaining_names.insert(new_row, new_name)
+            self._quote_names = remaining_names
+            self.endMoveRows()
+        else:
+            self._quote_names[old_row] = new_name
+        changed_index = self.index(new_row)
+        self.dataChanged.emit(changed_index, changed_index)
+
+    def sync_quotes(self, quote_names, all_quotes_data):
+        """
+        Brings the given names in line with all_quotes_data (None means "any quote" and resets).
+        A call where exactly one listed name disappeared and one new name appeared is a rename.
+        """
+        if quote_names is None:
+            self.reset_quotes(all_quotes_data)
+            return
+        removed_names = [name for name in quote_names if name not in all_quotes_data and self.row_of(name) >= 0]
+        added_names = [name for name in quote_names if name in all_quotes_data and name != "date" and self.row_of(name) < 0]
+        if len(removed_names) == 1 and len(added_names) == 1:
+            self.rename_quote(removed_names[0], added_names[0])
+            return
+        for quote_name in removed_names:
+            self.remove_quote(quote_name)
+        self.add_quotes(added_names)
+
+
+class QuoteFilterProxyModel(QSortFilterProxyModel):
+    """Shows the quotes of a QuoteListModel whose names are in the accepted set (every quote when it is None)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._accepted_names = None
+
+    def set_accepted_names(self, quote_names):
+        self._accepted_names = set(quote_names) if quote_names is not None else None
+        self.invalidateFilter()
+
+    def set_quote_accepted(self, quote_name, accepted):
+        """Updates one quote's membership; returns True if it changed."""
+        if self._accepted_names is None or (quote_name in self._accepted_names) == accepted:
+            return False
+        if accepted:
+            self._accepted_names.add(quote_name)
+        else:
+            self._accepted_names.discard(quote_name)
+        return True
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._accepted_names is None:
+            return True
+        return self.sourceModel().quote_name_at(source_row) in self._accepted_names
+
+
+class QuoteSearchProxyModel(QuoteFilterProxyModel):
+    """Shows ranked search results (best first), or every quote in name order when there is no search."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ranks = {}
+
+    def set_ranked_names(self, quote_names):
+        if quote_names is None:
+            self._ranks = {}
+            self.set_accepted_names(None)
+            self.sort(-1) # Back to the source (name) order
+            return
+        self._ranks = {quote_name: rank for rank, quote_name in enumerate(quote_names)}
+        self.set_accepted_names(quote_names)
+        self.sort(0)
+
+    def lessThan(self, left, right):
+        return self._ranks.get(left.data(), len(self._ranks)) < self._ranks.get(right.data(), len(self._ranks))
@@ -3,17 +3,23 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton,
     QLineEdit, QApplication, QStyle, QCompleter
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QStringListModel
+from PyQt6.QtCore import pyqtSignal, Qt
+from .quote_list_model import QuoteListModel, QuoteSearchProxyModel
 
 class QuoteSelectionWidget(QWidget):
     selectQuoteClicked = pyqtSignal(str)
     addQuoteClicked = pyqtSignal(str)
     removeQuoteClicked = pyqtSignal()
+    SEARCH_RESULT_LIMIT = 20
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, quote_list_model=None, search_index=None):
         super().__init__(parent)
+        # Shared with the quote filter list when the editor passes its QuoteListModel
+        self.quote_list_model = quote_list_model if quote_list_model is not None else QuoteListModel(self)
+        self.search_index = search_index # QuoteSearchIndex; without one the completer lists every quote
+        self.search_proxy_model = QuoteSearchProxyModel(self)
+        self.search_proxy_model.setSourceModel(self.quote_list_model)
         self._init_ui()
-        self.update_quote_list([]) # Initialize with empty list
 
     def _init_ui(self):
         layout = QVBoxLayout(self)
@@ -30,8 +36,9 @@ class QuoteSelectionWidget(QWidget):
         self.quote_search_edit.setPlaceholderText("Enter Quote Name to Select/Add")
         self.completer = QCompleter()
         self.quote_search_edit.setCompleter(self.completer)
-        self.quote_list_model = QStringListModel()
-        self.completer.setModel(self.quote_list_model)
+        self.completer.setModel(self.search_proxy_model)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion) # Show all options
+        self.quote_search_edit.textEdited.connect(self._on_search_text_edited)
         search_actions_layout.addWidget(self.quote_search_edit, 1)
 
         self.select_quote_button = QPushButton(icon=QApplication.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogContentsView))
@@ -56,6 +63,15 @@ class QuoteSelectionWidget(QWidget):
         quote_selection_layout.addLayout(search_actions_layout)
         layout.addWidget(quote_selection_group)
 
+    def _on_search_text_edited(self, text):
+        """Narrows the completer to the index's matches for the typed text (names, sectors or price)."""
+        if self.search_index is None:
+            return
+        ranked_names = self.search_index.search(text, self.SEARCH_RESULT_LIMIT) if text.strip() else None
+        self.search_proxy_model.set_ranked_names(ranked_names)
+        if ranked_names:
+            self.completer.complete()
+
     def _on_select_clicked(self):
         self.selectQuoteClicked.emit(self.quote_search_edit.text().strip())
 
@@ -69,13 +85,13 @@ class QuoteSelectionWidget(QWidget):
         self.quote_search_edit.setText(name)
 
     def update_quote_list(self, quote_names):
-        """Updates the suggestions for quote names based on filtering."""
-        self.quote_list_model.setStringList(quote_names)
+        """Replaces the suggested quote names (resets the shared model)."""
+        self.quote_list_model.reset_quotes(quote_names)
         self.completer.popup().setMinimumWidth(self.quote_search_edit.width()) # Adjust popup width
-        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion) # Show all options
 
     def clear_input(self):
         self.quote_search_edit.clear()
+        self.search_proxy_model.set_ranked_names(None)
 
     def setEnabled(self, enabled):
         self.quote_search_edit.setEnabled(enabled)
@@ -1,11 +1,13 @@
 # t:\Work\xml_input_ui\ui_components\record_report_section_widget.py
+import bisect
+import heapq
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QPushButton,
-    QFormLayout, QComboBox, QDateEdit, QStyle, QApplication
+    QFormLayout, QComboBox, QDateEdit, QStyle, QApplication, QLabel
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QDate
 import data_utils # For default date and potentially other utilities
-from .ui_utils import _clear_qt_layout # Import from the new ui_utils
+from .ui_utils import request_layout_refresh
 
 class RecordReportSectionWidget(QWidget):
     MAX_REPORTS_DISPLAYED = 6 # Changed to 6
@@ -18,6 +20,13 @@ class RecordReportSectionWidget(QWidget):
         super().__init__(parent)
         self.fixed_companies_provider_func = fixed_companies_provider_func
         self.report_entries = []
+        self._spare_report_boxes = [] # Hidden report boxes (their widget dicts), rebound by load_data instead of rebuilt
+        self._bound_report_entries = {} # Report box -> entry_data it currently shows, read by the box's signal handlers
+        self._record_list = None # The quote's record list (from the data model) the pages are cut from
+        self._sorted_reports = None # _record_list sorted latest first; built when an older page is shown or a report is added/removed
+        self._sorted_report_keys = [] # Ascending sort keys parallel to _sorted_reports (see _display_date_key)
+        self._displayed_reports = [] # The records shown by report_entries, in the same order
+        self._page = 0
         self._init_ui()
 
     def _init_ui(self):
@@ -27,6 +36,20 @@ class RecordReportSectionWidget(QWidget):
         record_main_layout.setSpacing(3)
 
         actions_layout = QHBoxLayout()
+
+        # Older reports are paged in on demand; only the shown page has report boxes
+        self.newer_reports_button = QPushButton(icon=QApplication.style().standardIcon(QStyle.StandardPixmap.SP_ArrowLeft))
+        self.newer_reports_button.setToolTip("Show newer reports")
+        self.newer_reports_button.setFixedSize(20, 20)
+        self.newer_reports_button.clicked.connect(lambda: self.show_report_page(self._page - 1))
+        actions_layout.addWidget(self.newer_reports_button)
+        self.report_page_label = QLabel()
+        actions_layout.addWidget(self.report_page_label)
+        self.older_reports_button = QPushButton(icon=QApplication.style().standardIcon(QStyle.StandardPixmap.SP_ArrowRight))
+        self.older_reports_button.setToolTip("Show older reports")
+        self.older_reports_button.setFixedSize(20, 20)
+        self.older_reports_button.clicked.connect(lambda: self.show_report_page(self._page + 1))
+        actions_layout.addWidget(self.older_reports_button)
         actions_layout.addStretch()
 
         refresh_button = QPushButton(icon=QApplication.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload))
@@ -50,9 +73,15 @@ class RecordReportSectionWidget(QWidget):
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0,0,0,0)
         main_layout.addWidget(self.record_group)
+        self._update_page_controls()
 
-    # This method creates the UI and data for a single report entry.
+    # This method returns the UI data for a single report entry, reusing a spare report box when there is one.
     def _create_single_report_entry_ui_data(self, company_str="", date_str="", color_str=""):
+        report_box = self._spare_report_boxes.pop() if self._spare_report_boxes else self._create_report_box()
+        return self._bind_report_box(report_box, company_str, date_str, color_str)
+
+    def _create_report_box(self):
+        """Builds the widgets of one report entry; _bind_report_box() fills them for a specific report."""
         entry_gbox = QGroupBox()
         entry_gbox.setObjectName("recordReportEntryBox")
         entry_layout = QVBoxLayout(entry_gbox)
@@ -62,18 +91,13 @@ class RecordReportSectionWidget(QWidget):
         top_bar = QHBoxLayout()
         top_bar.addStretch()
         
-        # Initial entry_data structure
-        entry_data = {
-            "widget": entry_gbox,
-            "current_color": color_str or "default",
-            # current_company and current_date will be refined after widgets are created
-        }
-
+        # Handlers look up the entry_data the box is currently bound to, since boxes are reused across reports
+        bound_entries = self._bound_report_entries
         for btn_txt, c_name in [("R", "red"), ("G", "green"), ("Y", "yellow"), ("W", "white")]:
             c_btn = QPushButton(btn_txt)
             c_btn.setFixedSize(16, 16)
             c_btn.setToolTip(f"Set color to {c_name}")
-            c_btn.clicked.connect(lambda chk=False, ed=entry_data, cn=c_name: self._handle_report_color_change(ed, cn))
+            c_btn.clicked.connect(lambda chk=False, box=entry_gbox, cn=c_name: self._handle_report_color_change(bound_entries[box], cn))
             top_bar.addWidget(c_btn)
         
         top_bar.addSpacing(5)
@@ -86,54 +110,77 @@ class RecordReportSectionWidget(QWidget):
         form = QFormLayout()
         form.setContentsMargins(0,0,0,0)
         combo = QComboBox()
-        fixed_comps = self.fixed_companies_provider_func()
-        if fixed_comps: # Ensure fixed_comps is not None or empty before adding
-            combo.addItems(fixed_comps)
-        
-        if company_str and company_str in fixed_comps: 
-            combo.setCurrentText(company_str)
-        elif fixed_comps and combo.count() > 0: # If not found or empty, select first if available
-            combo.setCurrentIndex(0)
-
         date_edit = QDateEdit()
         date_edit.setDisplayFormat("MM/dd/yyyy")
         date_edit.setCalendarPopup(True)
-        q_date = QDate.fromString(date_str, "MM/dd/yyyy") if date_str else data_utils.get_default_working_date()
-        date_edit.setDate(q_date if q_date.isValid() else data_utils.get_default_working_date())
-        entry_data["current_date"] = date_edit.date().toString("MM/dd/yyyy")
-        entry_data["current_company"] = combo.currentText() # Get actual initial company from combo
-
         form.addRow("Company:", combo)
         form.addRow("Date:", date_edit)
         entry_layout.addLayout(form)
 
-        # Store all relevant widgets in entry_data for signal connection and access
-        entry_data.update({"company_combo": combo, "date_edit": date_edit, "remove_button": remove_btn})
-
         # Connect signals for this entry
-        combo.currentTextChanged.connect(lambda txt, ed=entry_data: self._handle_report_detail_change(ed, "company", txt))
-        date_edit.dateChanged.connect(lambda qd, ed=entry_data: self._handle_report_detail_change(ed, "date", qd.toString("MM/dd/yyyy")))
-        date_edit.editingFinished.connect(lambda ed=entry_data, de=date_edit: self._handle_report_detail_change(ed, "date", de.date().toString("MM/dd/yyyy")))
-        remove_btn.clicked.connect(lambda checked=False, ed=entry_data: self.recordReportRemoveRequested.emit(ed))
-        # Connect color buttons (assuming this was implicitly part of the original add_report_entry)
-        # This loop was already present, just ensuring it's clear it connects to _handle_report_color_change
-
-        self._apply_report_color_style(entry_gbox, entry_data["current_color"])
+        combo.currentTextChanged.connect(lambda txt, box=entry_gbox: self._handle_report_detail_change(bound_entries[box], "company", txt))
+        date_edit.dateChanged.connect(lambda qd, box=entry_gbox: self._handle_report_detail_change(bound_entries[box], "date", qd.toString("MM/dd/yyyy")))
+        date_edit.editingFinished.connect(lambda box=entry_gbox, de=date_edit: self._handle_report_detail_change(bound_entries[box], "date", de.date().toString("MM/dd/yyyy")))
+        remove_btn.clicked.connect(lambda checked=False, box=entry_gbox: self.recordReportRemoveRequested.emit(bound_entries[box]))
+        return {"widget": entry_gbox, "company_combo": combo, "date_edit": date_edit, "remove_button": remove_btn}
+
+    def _bind_report_box(self, report_box, company_str="", date_str="", color_str=""):
+        """
+        Shows one report in report_box and returns its new entry_data. Every binding gets a fresh dict, so a
+        command still holding the entry_data of an earlier binding no longer matches any displayed entry.
+        """
+        combo, date_edit = report_box["company_combo"], report_box["date_edit"]
+        combo.blockSignals(True)
+        date_edit.blockSignals(True)
+        fixed_comps = self.fixed_companies_provider_func() or []
+        if [combo.itemText(i) for i in range(combo.count())] != list(fixed_comps):
+            combo.clear()
+            combo.addItems(fixed_comps)
+        if company_str and company_str in fixed_comps: 
+            combo.setCurrentText(company_str)
+        elif combo.count() > 0: # If not found or empty, select first if available
+            combo.setCurrentIndex(0)
+
+        default_date = data_utils.get_default_working_date()
+        q_date = QDate.fromString(date_str, "MM/dd/yyyy") if date_str else default_date
+        date_edit.setDate(q_date if q_date.isValid() else default_date)
+        combo.blockSignals(False)
+        date_edit.blockSignals(False)
+
+        entry_data = dict(report_box)
+        entry_data.update({
+            "current_color": color_str or "default",
+            "current_date": date_edit.date().toString("MM/dd/yyyy"),
+            "current_company": combo.currentText(),
+        })
+        self._bound_report_entries[report_box["widget"]] = entry_data
+        self._apply_report_color_style(report_box["widget"], entry_data["current_color"])
         return entry_data
 
+    def _release_report_box(self, entry_data):
+        """Hides an entry's box and keeps its widgets for the next binding."""
+        widget = entry_data.get("widget")
+        if not widget: return
+        self.record_items_layout.removeWidget(widget)
+        widget.hide()
+        self._bound_report_entries.pop(widget, None)
+        self._spare_report_boxes.append({key: entry_data[key] for key in ("widget", "company_combo", "date_edit", "remove_button")})
+
     def _handle_report_detail_change(self, entry_data, field, new_val):
         old_val = entry_data.get(f"current_{field}", "")
         if new_val != old_val:
             self.recordReportDetailChanged.emit(entry_data, field, old_val, new_val)
 
     def _remove_report_entry(self, entry_data):
-        if entry_data in self.report_entries:
-            self.report_entries.remove(entry_data)
-            widget = entry_data.get("widget")
-            # Explicitly remove from layout before deleting, though _clear_qt_layout in refresh would also handle it.
-            if widget and self.record_items_layout:
-                self.record_items_layout.removeWidget(widget)
-            if widget: widget.deleteLater()
+        position = self._entry_position(entry_data)
+        if position >= 0:
+            del self._displayed_reports[position]
+            del self.report_entries[position]
+            self._release_report_box(entry_data)
+
+    def _entry_position(self, entry_data):
+        """Position of entry_data (by identity) in report_entries, or -1."""
+        return next((i for i, entry in enumerate(self.report_entries) if entry is entry_data), -1)
 
     def _handle_report_color_change(self, entry_data, color_name):
         old_color = entry_data.get("current_color", "default")
@@ -141,62 +188,155 @@ class RecordReportSectionWidget(QWidget):
             self.recordReportDetailChanged.emit(entry_data, "color", old_color, color_name)
 
     def _apply_report_color_style(self, gbox, color_name):
+        if gbox.property("report_color") == (color_name or "default"):
+            return # Re-polishing is costly and a reused box often keeps its color
         gbox.setProperty("report_color", color_name or "default")
         gbox.style().unpolish(gbox); gbox.style().polish(gbox); gbox.update()
 
     # _apply_report_display_limit is no longer needed as load_data handles the limit.
 
     def load_data(self, record_list_from_model):
-        self.clear_data()
-
-        all_created_ui_entries = []
-        for r_data in record_list_from_model: # Process all reports from the data model
-            entry_ui_data = self._create_single_report_entry_ui_data(
-                company_str=r_data.get("company",""), 
-                date_str=r_data.get("date",""), 
-                color_str=r_data.get("color","")
-            )
-            all_created_ui_entries.append(entry_ui_data)
-
-        # Sort all created UI entries by their date (latest first)
-        def get_date_key_for_ui_entry(ui_entry):
-            # Use the 'current_date' from the entry_data, which is derived from the QDateEdit widget
-            d = QDate.fromString(ui_entry.get("current_date", ""), "MM/dd/yyyy")
-            return d if d.isValid() else QDate(1900,1,1)
-        
-        all_created_ui_entries.sort(key=get_date_key_for_ui_entry, reverse=True)
-
-        # Now, populate self.report_entries with the top MAX_REPORTS_DISPLAYED
-        # and schedule deletion for widgets of entries that won't be displayed.
-        for i, entry_to_process in enumerate(all_created_ui_entries):
-            if i < self.MAX_REPORTS_DISPLAYED:
-                self.report_entries.append(entry_to_process) # Add to the list of entries to be displayed
-            else:
-                # This entry won't be displayed, so clean up its widget
-                if entry_to_process.get("widget"):
-                    entry_to_process["widget"].deleteLater()
-        
+        """
+        Shows the latest reports of record_list_from_model. Reloading the list already shown (after a
+        command changed it) stays on the current page; another quote's list starts at the first page.
+        """
+        same_list = record_list_from_model is self._record_list
+        self._release_report_entries() # Every shown report is re-read from the data
+        self._record_list = record_list_from_model
+        self._sorted_reports = None
+        self.show_report_page(self._page if same_list else 0)
+
+    def page_count(self):
+        if not self._record_list:
+            return 0
+        return (len(self._record_list) + self.MAX_REPORTS_DISPLAYED - 1) // self.MAX_REPORTS_DISPLAYED
+
+    def show_report_page(self, page):
+        """Shows one page of MAX_REPORTS_DISPLAYED reports (page 0 holds the latest)."""
+        self._page = page
+        self._sync_displayed_page()
+
+    def insert_report(self, record_list, r_data):
+        """
+        Shows r_data, just added to record_list by a command, by binding at most one box (and releasing the
+        one it pushes off the page). A list other than the shown one is loaded instead.
+        """
+        if record_list is not self._record_list:
+            self.load_data(record_list)
+            return
+        if self._sorted_reports is None:
+            self._build_sorted_reports() # Already includes r_data
+        else:
+            self._insert_sorted_report(r_data)
+        self._sync_displayed_page()
+
+    def remove_report(self, record_list, r_data):
+        """Drops r_data, just removed from record_list by a command, releasing only its box."""
+        if record_list is not self._record_list:
+            self.load_data(record_list)
+            return
+        if self._sorted_reports is None:
+            self._build_sorted_reports() # Already without r_data
+        else:
+            self._remove_sorted_report(r_data)
+        self._sync_displayed_page()
+
+    def _sync_displayed_page(self):
+        """
+        Brings the boxes in line with the current page: reports still on it keep their box and entry_data,
+        reports that left release theirs, and only reports new to the page bind a box.
+        """
+        self._page = max(0, min(self._page, self.page_count() - 1))
+        page_reports = self._reports_on_page(self._page)
+        kept_entries = {id(r_data): entry_data for r_data, entry_data in zip(self._displayed_reports, self.report_entries)}
+        page_ids = {id(r_data) for r_data in page_reports}
+        for r_data, entry_data in zip(self._displayed_reports, self.report_entries):
+            if id(r_data) not in page_ids:
+                self._release_report_box(entry_data)
+        self.report_entries[:] = [kept_entries.get(id(r_data)) or self._create_single_report_entry_ui_data(
+                                      company_str=r_data.get("company",""), 
+                                      date_str=r_data.get("date",""), 
+                                      color_str=r_data.get("color","")
+                                  ) for r_data in page_reports]
+        self._displayed_reports = page_reports
         self._refresh_report_grid_layout()
+        self._update_page_controls()
+
+    def _reports_on_page(self, page):
+        """
+        Picks the page's reports from the data model, latest first. The first page needs only the top
+        reports; the full sort is done once, the first time an older page or an incremental change needs it.
+        """
+        if not self._record_list:
+            return []
+        count = self.MAX_REPORTS_DISPLAYED
+        if page == 0 and self._sorted_reports is None:
+            default_day = data_utils.get_default_working_date().toJulianDay()
+            # Same order as the full sort: nlargest keeps ties in list order, like a stable sort
+            return heapq.nlargest(count, self._record_list, key=lambda r_data: -_display_date_key(r_data, default_day))
+        if self._sorted_reports is None:
+            self._build_sorted_reports()
+        return self._sorted_reports[page * count:(page + 1) * count]
+
+    def _build_sorted_reports(self):
+        default_day = data_utils.get_default_working_date().toJulianDay()
+        keyed = sorted(((_display_date_key(r_data, default_day), r_data) for r_data in self._record_list or []),
+                       key=lambda pair: pair[0]) # Stable: equal dates keep their list order
+        self._sorted_report_keys = [key for key, _ in keyed]
+        self._sorted_reports = [r_data for _, r_data in keyed]
+
+    def _insert_sorted_report(self, r_data):
+        key = _display_date_key(r_data, data_utils.get_default_working_date().toJulianDay())
+        low = bisect.bisect_left(self._sorted_report_keys, key)
+        position = bisect.bisect_right(self._sorted_report_keys, key)
+        if low < position: # Among reports of the same date, keep the data model's order
+            list_positions = {id(report): index for index, report in enumerate(self._record_list)}
+            new_position = list_positions[id(r_data)]
+            position = low + sum(1 for report in self._sorted_reports[low:position] if list_positions[id(report)] < new_position)
+        self._sorted_report_keys.insert(position, key)
+        self._sorted_reports.insert(position, r_data)
+
+    def _remove_sorted_report(self, r_data):
+        """Removes r_data by identity; its date may have changed since it was sorted, so this does not bisect."""
+        for position, report in enumerate(self._sorted_reports):
+            if report is r_data:
+                del self._sorted_reports[position]
+                del self._sorted_report_keys[position]
+                return True
+        return False
+
+    def _update_page_controls(self):
+        page_count = self.page_count()
+        paged = page_count > 1
+        self.newer_reports_button.setVisible(paged)
+        self.older_reports_button.setVisible(paged)
+        self.report_page_label.setVisible(paged)
+        if not paged:
+            return
+        first = self._page * self.MAX_REPORTS_DISPLAYED + 1
+        self.report_page_label.setText(f"{first}-{first + len(self.report_entries) - 1} of {len(self._record_list)}")
+        self.newer_reports_button.setEnabled(self._page > 0)
+        self.older_reports_button.setEnabled(self._page < page_count - 1)
 
     def _refresh_report_grid_layout(self):
         # 1. Remove all widgets currently in the layout without deleting them.
-        #    The widgets in self.report_entries are new, so old ones in layout can be cleared.
-        #    self.clear_data() (called by load_data) should have already invoked _clear_qt_layout.
+        #    Boxes no longer displayed were already hidden by clear_data()/_remove_report_entry().
         #    This loop ensures the layout is empty before repopulating.
         while self.record_items_layout.count():
-            item = self.record_items_layout.takeAt(0) # takeAt(0) removes the item from layout
-            if item and item.widget():
-                # Set parent to None to detach; actual deletion is handled by clear_data or if widget is no longer needed
-                item.widget().setParent(None) 
+            self.record_items_layout.takeAt(0) # Only detaches from the grid; the boxes stay children of the group box
 
         # 2. Re-add widgets from self.report_entries (which is the source of truth)
-        for idx, entry_data in enumerate(self.report_entries): # self.report_entries is already sorted and limited
+        for idx, entry_data in enumerate(self.report_entries): # self.report_entries is the shown page, already sorted
             widget = entry_data.get("widget")
             if widget: # Ensure widget exists in the entry_data
                 row, col = divmod(idx, 2) # 2 columns
                 self.record_items_layout.addWidget(widget, row, col)
+                widget.show()
         
-        # Force layout update and parent resizing
+        # Force layout update and parent resizing (once per refresh batch)
+        request_layout_refresh((self, "record_group"), self._update_record_group_size)
+
+    def _update_record_group_size(self):
         self.record_items_layout.activate() # Activate the grid layout
         if self.record_group.layout():
             self.record_group.layout().activate() # Activate the group box's main layout
@@ -209,10 +349,20 @@ class RecordReportSectionWidget(QWidget):
                  "color": e.get("current_color", "default")} for e in self.report_entries]
 
     def clear_data(self):
-        _clear_qt_layout(self.record_items_layout)
-        self.report_entries.clear()
+        self._release_report_entries()
+        self._record_list = None
+        self._sorted_reports = None
+        self._sorted_report_keys = []
+        self._page = 0
+        self._update_page_controls()
         # self._refresh_report_grid_layout() # Optionally call to ensure grid is visually empty
 
+    def _release_report_entries(self):
+        for entry_data in self.report_entries:
+            self._release_report_box(entry_data)
+        self.report_entries.clear()
+        self._displayed_reports = []
+
     def update_company_dropdowns(self):
         fixed_comps = self.fixed_companies_provider_func()
         for entry in self.report_entries:
@@ -227,7 +377,9 @@ class RecordReportSectionWidget(QWidget):
     def update_report_entry_detail(self, entry_data, field, new_val, from_command=False):
         # Signals are now connected in add_report_entry.
         # This method only updates the UI and internal 'current_whatever' values.
-        if entry_data not in self.report_entries: return
+        # Identity check: an entry_data from an earlier binding of a reused box must not update it
+        position = self._entry_position(entry_data)
+        if position < 0: return
         if field == "company":
             entry_data["company_combo"].blockSignals(True)
             entry_data["company_combo"].setCurrentText(new_val)
@@ -240,10 +392,20 @@ class RecordReportSectionWidget(QWidget):
                 entry_data["date_edit"].setDate(q_date)
                 entry_data["date_edit"].blockSignals(False)
                 entry_data["current_date"] = new_val
+                # Re-sort the report; its box stays in place until the page is next synced
+                r_data = self._displayed_reports[position]
+                if self._sorted_reports is not None and self._remove_sorted_report(r_data):
+                    self._insert_sorted_report(r_data)
         elif field == "color":
             entry_data["current_color"] = new_val
             self._apply_report_color_style(entry_data["widget"], new_val)
 
     def setEnabled(self, enabled):
         self.record_group.setEnabled(enabled)
-        super().setEnabled(enabled)
\ No newline at end of file
+        super().setEnabled(enabled)
+
+
+def _display_date_key(r_data, default_day):
+    """Sort key of a report, ascending from the latest: its date as the date edit shows it (missing or invalid dates show the default working date)."""
+    d = QDate.fromString(r_data.get("date", ""), "MM/dd/yyyy")
+    return -(d.toJulianDay() if d.isValid() else default_day)
@@ -6,7 +6,6 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from custom_widgets import HighlightableGroupBox
-from .ui_utils import _clear_qt_layout
 from typing import List, Dict
 import data_utils
 
@@ -18,6 +17,7 @@ class SectorsSectionWidget(QWidget):
         super().__init__(parent)
         self.sectors_provider_func = sectors_provider_func
         self.sectors_entries = []
+        self._spare_sector_entries = [] # Hidden sector rows, rebound by _create_sector_ui instead of rebuilt
         self.MAX_SECTORS_DISPLAYED = 5
         # self.selected_sectors_to_display = []  # Initially display all sectors - Not needed with the new design
         self._init_ui()
@@ -48,7 +48,37 @@ class SectorsSectionWidget(QWidget):
         self.refresh_structure()
     
     def _create_sector_ui(self, sector_name_str="", sector_type_str="main"): # Allow empty sector name initially
-        sector_gbox = HighlightableGroupBox(title="", company_name=sector_name_str)
+        entry_data = self._spare_sector_entries.pop() if self._spare_sector_entries else self._build_sector_entry()
+        type_combo, name_combo = entry_data["type_combo"], entry_data["name_combo"]
+        # Signals stay blocked while the row is bound, so rebinding never reports a value change
+        type_combo.blockSignals(True)
+        name_combo.blockSignals(True)
+        type_index = type_combo.findText(sector_type_str)
+        type_combo.setCurrentIndex(type_index if type_index >= 0 else 0)
+        all_sectors = self.sectors_provider_func() or []
+        if [name_combo.itemText(i) for i in range(name_combo.count())] != list(all_sectors):
+            name_combo.clear()
+            name_combo.addItems(all_sectors)
+        if sector_name_str in all_sectors:
+            name_combo.setCurrentText(sector_name_str)
+        elif name_combo.count() > 0:
+            name_combo.setCurrentIndex(0)
+        type_combo.blockSignals(False)
+        name_combo.blockSignals(False)
+
+        # Entry data - Initialize with the provided name, even if empty
+        entry_data["name"] = sector_name_str
+        entry_data["current_type"] = sector_type_str
+        sector_gbox = entry_data["widget"]
+        sector_gbox.company_name = sector_name_str
+        sector_gbox.setHighlightedState(False)
+        self.sectors_entries.append(entry_data)
+        self.sectors_items_layout.addWidget(sector_gbox)  # Add directly to vertical layout
+        sector_gbox.show() # If this is a new sector (empty name), it needs to be visible.
+
+    def _build_sector_entry(self):
+        """Builds the widgets of one sector row; _create_sector_ui binds them to a sector."""
+        sector_gbox = HighlightableGroupBox(title="")
         sector_gbox.setMinimumHeight(25)
         gbox_layout = QFormLayout(sector_gbox)
         gbox_layout.setContentsMargins(5, 2, 5, 2) # Reduced margins for tighter packing
@@ -56,42 +86,37 @@ class SectorsSectionWidget(QWidget):
         
         type_combo = QComboBox()
         type_combo.addItems(["main", "sub"])
-        type_combo.setCurrentText(sector_type_str)
         type_combo.setFixedWidth(55)
 
         name_combo = QComboBox()  # Replace label with combo
 
-        # Entry data - Initialize with the provided name, even if empty
         entry_data = {
-            "name": sector_name_str,
+            "name": "",
             "type_combo": type_combo,
+            "name_combo": name_combo,
             "widget": sector_gbox,
-            "current_type": sector_type_str,
+            "current_type": "main",
         }
-        self.sectors_entries.append(entry_data)
-        # Populate the name combo box *after* entry_data is created to use _handle_sector_value_changed.
-        # (Otherwise, lambda will capture the combo rather than its current value.)
-        all_sectors = self.sectors_provider_func()
-        if all_sectors:
-            name_combo.addItems(all_sectors)
-            if sector_name_str in all_sectors:
-                name_combo.setCurrentText(sector_name_str)
+        # The lambdas capture entry_data (not the combo values), which is rebound in place when the row is reused.
         name_combo.currentTextChanged.connect(lambda new_name, ed=entry_data: self._handle_sector_value_changed(ed, "name", new_name))
         type_combo.currentTextChanged.connect(lambda new_type, ed=entry_data: self._handle_sector_value_changed(ed, "type", new_type))
 
         h_layout = self._create_sector_entry_layout(type_combo, name_combo)
-
         gbox_layout.addRow(h_layout)
-        self.sectors_items_layout.addWidget(sector_gbox)  # Add directly to vertical layout
+        return entry_data
 
-        # If this is a new sector (empty name), it needs to be visible.
+    def _release_sector_entry(self, entry_data):
+        """Hides a sector row and keeps it for the next _create_sector_ui call."""
+        widget = entry_data["widget"]
+        self.sectors_items_layout.removeWidget(widget)
+        widget.hide()
+        self._spare_sector_entries.append(entry_data)
 
     def refresh_structure(self, new_sectors=None):
         all_sectors = new_sectors if new_sectors is not None else self.sectors_provider_func()
         current_data = {e["name"]: e["type_combo"].currentText() for e in self.sectors_entries if "type_combo" in e}
 
-        _clear_qt_layout(self.sectors_items_layout)
-        self.sectors_entries.clear()
+        self.clear_sectors()
         
         if not all_sectors:
             return  # Exit if there are no sectors to display, preventing errors
@@ -140,8 +165,9 @@ class SectorsSectionWidget(QWidget):
             self.refresh_structure(new_sectors=[])
 
     def clear_sectors(self):
-        """Clears all existing sector entries from the UI."""
-        _clear_qt_layout(self.sectors_items_layout)
+        """Clears all existing sector entries from the UI, keeping their rows for reuse."""
+        for entry in self.sectors_entries:
+            self._release_sector_entry(entry)
         self.sectors_entries.clear()
 
 
@@ -198,10 +224,7 @@ class SectorsSectionWidget(QWidget):
         """Removes the sector entry from the UI."""
         for entry in list(self.sectors_entries):  # Iterate over a copy
             if entry["name"] == sector_name:
-                widget = entry.get("widget")
-                if widget:
-                    self.sectors_items_layout.removeWidget(widget)
-                    widget.deleteLater()
+                self._release_sector_entry(entry)
                 self.sectors_entries.remove(entry)
                 break  # Assuming sector names are unique, so we can stop after removing
     
@@ -1,4 +1,8 @@
 # t:\Work\xml_input_ui\ui_components\ui_utils.py
+import time
+
+_open_layout_refresh = None # The outermost LayoutRefreshBatch still open, if any
+
 
 def _clear_qt_layout(layout):
     """Recursively clears all widgets and sub-layouts from a given layout."""
@@ -11,4 +15,98 @@ def _clear_qt_layout(layout):
             else:
                 sub_layout = item.layout()
                 if sub_layout is not None:
-                    _clear_qt_layout(sub_layout) # Recursive call
\ No newline at end of file
+                    _clear_qt_layout(sub_layout) # Recursive call
+
+
+def _sync_named_layout_entries(entries, names, layout, create_entry, release_entry):
+    """
+    Brings entries (dicts with "name" and "widget", laid out in that order in layout) in line with names
+    by applying only the differences: entries whose name is gone are taken out of layout and passed to
+    release_entry, missing names get create_entry(name), and kept entries are moved into place with their widgets.
+    """
+    wanted_names = set(names)
+    kept = {}
+    for entry in entries:
+        if entry["name"] in wanted_names and entry["name"] not in kept:
+            kept[entry["name"]] = entry
+        else:
+            layout.removeWidget(entry["widget"])
+            release_entry(entry)
+    new_entries = [kept.pop(name, None) or create_entry(name) for name in names]
+    for index, entry in enumerate(new_entries):
+        item = layout.itemAt(index)
+        if item is None or item.widget() is not entry["widget"]: # Earlier positions are already in order
+            layout.removeWidget(entry["widget"])
+            layout.insertWidget(index, entry["widget"])
+    entries[:] = new_entries
+
+
+def request_layout_refresh(key, refresh):
+    """
+    Runs refresh (a section's activate()/adjustSize() pass) now, or, while a LayoutRefreshBatch is open,
+    once when it closes; later requests with the same key replace earlier ones.
+    """
+    if _open_layout_refresh is None:
+        refresh()
+        return
+    _open_layout_refresh.requested_count += 1
+    _open_layout_refresh._pending.pop(key, None) # Re-queue at the end, after whatever it depends on
+    _open_layout_refresh._pending[key] = refresh
+
+
+class LayoutRefreshBatch:
+    """
+    Refresh transaction for several sections at once (e.g. displaying a quote). While open, updates on
+    root_widget are suspended and layout refreshes requested through request_layout_refresh() are
+    collected; closing it runs each distinct one once, activates root_widget's layout and repaints.
+    A batch opened inside another one joins it. Counts and timings are kept for inspection.
+    """
+
+    def __init__(self, root_widget=None):
+        self.root_widget = root_widget
+        self._pending = {}
+        self._joined = False
+        self._updates_were_enabled = False
+        self._started_at = None
+        self.requested_count = 0 # Layout refreshes asked for by the sections
+        self.performed_count = 0 # Layout refreshes actually run
+        self.layout_ms = 0.0 # Time spent in the final layout pass
+        self.total_ms = 0.0 # Time from opening to closing the batch
+
+    def __enter__(self):
+        global _open_layout_refresh
+        self._started_at = time.perf_counter()
+        if _open_layout_refresh is not None:
+            self._joined = True
+            return self
+        _open_layout_refresh = self
+        if self.root_widget is not None:
+            self._updates_were_enabled = self.root_widget.updatesEnabled()
+            self.root_widget.setUpdatesEnabled(False)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _open_layout_refresh
+        if self._joined:
+            self.total_ms = (time.perf_counter() - self._started_at) * 1000
+            return False
+        _open_layout_refresh = None # Refreshes requested from here on run immediately
+        layout_started_at = time.perf_counter()
+        try:
+            pending, self._pending = self._pending, {}
+            for refresh in pending.values():
+                refresh()
+                self.performed_count += 1
+            if self.root_widget is not None and self.root_widget.layout():
+                self.root_widget.layout().activate()
+        finally:
+            if self.root_widget is not None and self._updates_were_enabled:
+                self.root_widget.setUpdatesEnabled(True) # Schedules one repaint of root_widget
+            finished_at = time.perf_counter()
+            self.layout_ms = (finished_at - layout_started_at) * 1000
+            self.total_ms = (finished_at - self._started_at) * 1000
+        return False
+
+    def stats(self):
+        return {"requested": self.requested_count, "performed": self.performed_count,
+                "layout_ms": self.layout_ms, "total_ms": self.total_ms}
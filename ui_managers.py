@@ -1,4 +1,39 @@
 # t:\Work\xml_input_ui\ui_managers.py
+from functools import partial
+
+class CompanyHighlightRegistry:
+    """
+    Company name -> the HighlightableGroupBox instances showing it, across all sections. Sections
+    register their company boxes as they build them; a box drops out when it is destroyed.
+    """
+
+    def __init__(self):
+        self._boxes_by_company = {}
+
+    def register(self, box):
+        company_name = box.company_name
+        boxes = self._boxes_by_company.setdefault(company_name, set())
+        if box in boxes:
+            return
+        boxes.add(box)
+        # The name is bound here, since only the Python side of the box is left when this fires
+        box.destroyed.connect(partial(self._on_box_destroyed, box, company_name))
+
+    def _on_box_destroyed(self, box, company_name, *_):
+        self.unregister(box, company_name)
+
+    def unregister(self, box, company_name=None):
+        company_name = box.company_name if company_name is None else company_name
+        boxes = self._boxes_by_company.get(company_name)
+        if boxes is None:
+            return
+        boxes.discard(box)
+        if not boxes:
+            del self._boxes_by_company[company_name]
+
+    def boxes_of(self, company_name):
+        return set(self._boxes_by_company.get(company_name, ()))
+
 
 class GlobalHighlightManager:
     def __init__(self, eprice_widget, eps_widget, pe_widget):
@@ -6,6 +41,11 @@ class GlobalHighlightManager:
         self.eps_section_widget = eps_widget
         self.pe_section_widget = pe_widget
 
+        self.company_boxes = CompanyHighlightRegistry()
+        for section_widget in (eprice_widget, eps_widget, pe_widget):
+            if section_widget:
+                section_widget.set_highlight_registry(self.company_boxes)
+
         self.globally_focused_company_widgets = {}  # {company_name: set(QLineEdit_widgets)}
         self.active_highlighted_company = None
 
@@ -38,12 +78,8 @@ class GlobalHighlightManager:
             self.active_highlighted_company = None
 
     def _update_highlight_for_company(self, company_name_to_update, highlight_state):
-        if self.eprice_section_widget:
-            self.eprice_section_widget.update_company_highlight_state(company_name_to_update, highlight_state)
-        if self.eps_section_widget:
-            self.eps_section_widget.update_company_highlight_state(company_name_to_update, highlight_state)
-        if self.pe_section_widget:
-            self.pe_section_widget.update_company_highlight_state(company_name_to_update, highlight_state)
+        for company_box in self.company_boxes.boxes_of(company_name_to_update):
+            company_box.setHighlightedState(highlight_state)
 
     def clear_active_highlight(self):
         if self.active_highlighted_company:
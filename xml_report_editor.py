@@ -4,7 +4,7 @@ import os # Keep os for os.path.basename and os.getcwd
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QInputDialog, QMenu, QTextEdit,
     QFormLayout, QLineEdit, QPushButton, QLabel, QScrollArea, QDateEdit, QDialog, QComboBox,
-    QGroupBox, QMessageBox, QFileDialog, QStyle)
+    QGroupBox, QMessageBox, QFileDialog, QStyle, QProgressBar)
 from PyQt6.QtGui import QIcon, QAction, QKeySequence
 from PyQt6.QtCore import Qt, QDate, QPoint
 from dialogs import ManageEPriceCompaniesDialog, ManageSectorsDialog
@@ -17,17 +17,23 @@ from ui_components.sectors_section_widget import SectorsSectionWidget
 from ui_components.record_report_section_widget import RecordReportSectionWidget
 from ui_components.eps_growth_chart_widget import EPSGrowthChartWidget
 from custom_widgets import FocusAwareLineEdit, HighlightableGroupBox  # Import custom widgets
-from commands import (Command, ChangeRootDateCommand, ChangeQuoteDetailCommand, 
+from commands import (Command, MacroCommand, ChangeRootDateCommand, ChangeQuoteDetailCommand, 
                       ChangeEPriceValueCommand, ChangePEValueCommand, AddQuoteCommand, RemoveQuoteCommand,
                       ChangeEPSValueCommand, AddEPSYearCommand, RemoveEPSYearCommand,
                       ChangeEPSYearDisplayCommand, ChangeEPSCompaniesForYearDisplayCommand,
                       AddRecordReportCommand, RemoveRecordReportCommand, ChangeRecordReportDetailCommand,
                       ChangeEPriceFixedCompaniesCommand, ChangeSectorsListCommand)
 from ui_components.quote_filter_widget import QuoteFilterWidget
+from ui_components.quote_list_model import QuoteListModel
+from ui_components.ui_utils import LayoutRefreshBatch
 from command_manager import CommandManager
 from editor_action_handler import EditorActionHandler # Import the new handler class
 from ui_managers import GlobalHighlightManager # Import the new manager
 from file_manager import FileManager # Import the new FileManager
+from quote_fragment_cache import QuoteFragmentCache
+from quote_model import QuoteModel
+from sector_index import SectorIndex
+from quote_search_index import QuoteSearchIndex, normalize_search_text
 from chart_sub_window import ChartSubWindow  # Import the sub window
 import data_utils 
 
@@ -47,6 +53,25 @@ class XmlReportEditor(QMainWindow):
         self.EPRICE_FIXED_COMPANIES = ["VCSC", "SSI", "MBS", "AGR", "BSC", "FPT", "CTG"] 
 
         self.file_manager = FileManager(self) # Instantiate FileManager
+        self.file_manager.saveFinished.connect(self._on_background_save_finished)
+        self.file_manager.saveFailed.connect(self._on_background_save_failed)
+        self._modification_count = 0 # Bumped on every change; lets background saves detect edits made meanwhile
+        self._background_save_modification_count = None
+        self._document_dirty = False
+        self.quote_fragment_cache = QuoteFragmentCache() # Serialized quotes reused by the next save
+        self.sector_index = SectorIndex() # Sector -> quotes lookup for the quote filter
+        self.quote_search_index = QuoteSearchIndex() # Type-ahead search for the quote selection box
+        self.quote_list_model = QuoteListModel(self) # Quote names shown by the completer and the filter list
+        self.last_display_refresh_stats = None # Layout refreshes requested/performed and timings of the last _display_quote
+        self.file_manager.loadStarted.connect(self._on_background_load_started)
+        self.file_manager.loadRootDateLoaded.connect(self._on_background_load_root_date)
+        self.file_manager.loadQuotesBatchLoaded.connect(self._on_background_load_quotes_batch)
+        self.file_manager.loadProgressChanged.connect(self._on_background_load_progress)
+        self.file_manager.loadFinished.connect(self._on_background_load_finished)
+        self.file_manager.loadFailed.connect(self._on_background_load_failed)
+        self._load_in_progress = False # True from loadStarted until the load ends or is cancelled
+        self._load_modification_count = None
+        self._document_before_load = None # Document restored if a background load fails or is cancelled
         self.SECTOR_LIST = []  # Initialize SECTOR_LIST before it's used
         self.command_manager = CommandManager(self) # Instantiate CommandManager
         self.action_handler = EditorActionHandler(self)  # Instantiate ActionHandler
@@ -128,7 +153,8 @@ class XmlReportEditor(QMainWindow):
         self.main_layout.addWidget(date_group)
 
         # Instantiate section widgets
-        self.quote_selection_widget = QuoteSelectionWidget(self)
+        self.quote_selection_widget = QuoteSelectionWidget(self, quote_list_model=self.quote_list_model,
+                                                           search_index=self.quote_search_index)
         self.quote_selection_widget.selectQuoteClicked.connect(self.handle_select_quote_button) # Stays in editor
         self.quote_selection_widget.addQuoteClicked.connect(self.handle_add_new_quote_button)   # Stays in editor
         self.quote_selection_widget.removeQuoteClicked.connect(self.handle_remove_displayed_quote_button) # Stays in editor
@@ -154,10 +180,12 @@ class XmlReportEditor(QMainWindow):
         self.sectors_section_widget = SectorsSectionWidget(lambda: self.SECTOR_LIST, self) # Now SECTOR_LIST is initialized
         self.sectors_section_widget.sectorValueChanged.connect(self.action_handler.handle_sector_value_changed)
         self.eps_growth_chart_widget = EPSGrowthChartWidget(self) # Instantiate the chart widget
+        self.eps_growth_chart_widget.set_growth_series_provider(self._eps_growth_series_for_chart)
         self.sectors_section_widget.sectorRemoved.connect(self.action_handler.handle_remove_sector)
 
         # Instantiate Quote Filter Widget
-        self.quote_filter_widget = QuoteFilterWidget(lambda: self.SECTOR_LIST, self.all_quotes_data)
+        self.quote_filter_widget = QuoteFilterWidget(lambda: self.SECTOR_LIST, self.all_quotes_data, sector_index=self.sector_index,
+                                                     quote_list_model=self.quote_list_model)
         self.quote_filter_widget.quoteSelected.connect(self.handle_filtered_quote_selected)  # Connect to new signal
         
         self.record_report_section_widget.recordReportAddRequested.connect(self.action_handler.handle_record_report_add_requested)
@@ -221,6 +249,19 @@ class XmlReportEditor(QMainWindow):
         column1_layout.addStretch() # Ensure it doesn't take too much space initially
 
         self.new_window_button.clicked.connect(self.open_chart_sub_window)
+
+        # Background open progress, only visible while a file is loading
+        self.load_progress_bar = QProgressBar()
+        self.load_progress_bar.setRange(0, 100)
+        self.load_progress_bar.setMaximumWidth(200)
+        self.load_progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.load_progress_bar)
+        self.cancel_load_button = QPushButton("Cancel")
+        self.cancel_load_button.setToolTip("Stop loading and discard the partially loaded file")
+        self.cancel_load_button.clicked.connect(self.cancel_open_xml_file)
+        self.cancel_load_button.setVisible(False)
+        self.statusBar().addPermanentWidget(self.cancel_load_button)
+
         self._set_displayed_quote_ui_enabled(False) 
         self._create_menu_bar()
         self._load_sectors_config_and_update_ui()
@@ -251,6 +292,10 @@ class XmlReportEditor(QMainWindow):
         save_as_action.setShortcut(QKeySequence.StandardKey.SaveAs)
         save_as_action.triggered.connect(self.save_xml_file_as)
         file_menu.addAction(save_as_action)
+        self.background_save_action = QAction("Save in &Background", self)
+        self.background_save_action.setCheckable(True)
+        self.background_save_action.setToolTip("Write the XML on a worker thread so editing can continue while saving")
+        file_menu.addAction(self.background_save_action)
         file_menu.addSeparator()
         exit_action = QAction("E&xit", self)
         exit_action.triggered.connect(self.close) 
@@ -301,7 +346,29 @@ class XmlReportEditor(QMainWindow):
         self.quote_selection_widget.set_quote_name_input(quote_name)
         self.handle_select_quote_button(quote_name)
     
+    def _mark_quotes_modified(self, quote_names):
+        """
+        Post-command hook: quote_names (or None for "any quote") changed, so they must be re-serialized
+        on the next save and re-indexed.
+        """
+        self.quote_fragment_cache.mark_dirty(quote_names)
+        self._sync_quote_indexes(quote_names)
+
+    def _first_quote_name(self):
+        """The first quote in all_quotes_data, skipping the global "date" entry, or None if there is none."""
+        return next((name for name in self.all_quotes_data if name != "date"), None)
+
+    def _sync_quote_indexes(self, quote_names):
+        """Updates the quote indexes, the filter and the shared quote list for added/removed/renamed/edited quotes."""
+        self.sector_index.update_quotes(quote_names, self.all_quotes_data)
+        self.quote_search_index.update_quotes(quote_names, self.all_quotes_data)
+        self.quote_filter_widget.quotes_changed(quote_names) # Before the model, so inserted rows are filtered correctly
+        self.quote_list_model.sync_quotes(quote_names, self.all_quotes_data)
+
     def _set_dirty_flag(self, dirty):
+        self._document_dirty = dirty
+        if dirty:
+            self._modification_count += 1
         title = "XML Report Editor"
         if self.file_manager.get_current_file_path():
             title += f" - {os.path.basename(self.file_manager.get_current_file_path())}"
@@ -314,11 +381,12 @@ class XmlReportEditor(QMainWindow):
         # Load the shared list of companies.  EPRICE_FIXED_COMPANIES here is the default.
         self.EPRICE_FIXED_COMPANIES = data_utils.load_eprice_config(self.EPRICE_FIXED_COMPANIES)
 
-        # Update all sections that depend on the fixed company list
-        self.eprice_section_widget.refresh_structure(self.EPRICE_FIXED_COMPANIES)
-        self.pe_section_widget.refresh_structure(self.EPRICE_FIXED_COMPANIES) # PE uses the same list
-        self.eps_section_widget.refresh_structure_with_new_fixed_companies(self.EPRICE_FIXED_COMPANIES)
-        self.record_report_section_widget.update_company_dropdowns()
+        # Update all sections that depend on the fixed company list; each applies only the added/removed/moved companies
+        with LayoutRefreshBatch(self.centralWidget()):
+            self.eprice_section_widget.refresh_structure(self.EPRICE_FIXED_COMPANIES)
+            self.pe_section_widget.refresh_structure(self.EPRICE_FIXED_COMPANIES) # PE uses the same list
+            self.eps_section_widget.refresh_structure_with_new_fixed_companies(self.EPRICE_FIXED_COMPANIES)
+            self.record_report_section_widget.update_company_dropdowns()
 
     def _load_sectors_config_and_update_ui(self):
         """Loads sector configuration and refreshes the UI."""
@@ -368,28 +436,21 @@ class XmlReportEditor(QMainWindow):
         Helper to find the corresponding data model dictionary for a record report UI entry.
         This is used when a detail of a record report is changed.
         Args:
-            quote_data: The data dictionary for the current quote from self.all_quotes_data.
+            quote_data: The QuoteModel of the current quote from self.all_quotes_data.
             ui_entry_data_ref: The dictionary from RecordReportSectionWidget.report_entries.
             field_name_being_changed: The name of the field that was just changed ("company", "date", or "color").
             old_value_of_field: The value of the field *before* it was changed.
         Returns:
             The matching dictionary from quote_data["record"] or None if not found.
         """
-        for idx, data_model_entry in enumerate(quote_data["record"]):
-            # Match based on old values to find the correct model entry
-            # The ui_entry_data_ref.get("current_...") holds the state *before* the current change was applied to it by the widget.
-            # So, if field_name_being_changed is "company", its old value is old_value_of_field.
-            # The other fields in ui_entry_data_ref.get("current_...") are their original values.
-
-            original_ui_company = old_value_of_field if field_name_being_changed == "company" else ui_entry_data_ref.get("current_company")
-            original_ui_date = old_value_of_field if field_name_being_changed == "date" else ui_entry_data_ref.get("current_date")
-            original_ui_color = old_value_of_field if field_name_being_changed == "color" else ui_entry_data_ref.get("current_color", "default")
-            
-            if (data_model_entry.get("company") == original_ui_company and
-                data_model_entry.get("date") == original_ui_date and
-                data_model_entry.get("color", "default") == original_ui_color):
-                return data_model_entry
-        return None
+        # Match based on old values to find the correct model entry
+        # The ui_entry_data_ref.get("current_...") holds the state *before* the current change was applied to it by the widget.
+        # So, if field_name_being_changed is "company", its old value is old_value_of_field.
+        # The other fields in ui_entry_data_ref.get("current_...") are their original values.
+        original_ui_company = old_value_of_field if field_name_being_changed == "company" else ui_entry_data_ref.get("current_company")
+        original_ui_date = old_value_of_field if field_name_being_changed == "date" else ui_entry_data_ref.get("current_date")
+        original_ui_color = old_value_of_field if field_name_being_changed == "color" else ui_entry_data_ref.get("current_color", "default")
+        return quote_data.find_record(original_ui_company, original_ui_date, original_ui_color)
 
     def _update_undo_redo_actions_state(self):
         self.undo_action.setEnabled(self.command_manager.can_undo())
@@ -403,6 +464,9 @@ class XmlReportEditor(QMainWindow):
 
         self._clear_displayed_quote_ui() 
         self.all_quotes_data.clear()
+        self.quote_fragment_cache.invalidate_all()
+        self._sync_quote_indexes(None) # Empties the sector index and the quote lists
+        self.quote_filter_widget.reset_navigation()
         self.selected_quote_name = None
         
         self.quote_selection_widget.clear_input()
@@ -421,10 +485,22 @@ class XmlReportEditor(QMainWindow):
         self.pe_section_widget.refresh_structure() # Rebuild with fixed companies, clear values
         self.eps_growth_chart_widget.clear_data()
         self.record_report_section_widget.clear_data()
+        self._bind_section_widgets(None)
         if hasattr(self, 'highlight_manager'): # Clear any active highlight
             self.highlight_manager.clear_active_highlight()
 
+    def _bind_section_widgets(self, quote_model):
+        """Makes the value sections follow quote_model's change events (None: follow no quote)."""
+        for widget in (self.quote_details_widget, self.eprice_section_widget, self.pe_section_widget, self.eps_section_widget):
+            widget.bind_quote_model(quote_model)
+
     def _display_quote(self, quote_name, is_new_quote=False):
+        # All sections are refreshed under one batch: a single layout pass and repaint at the end
+        with LayoutRefreshBatch(self.centralWidget()) as refresh_batch:
+            self._display_quote_sections(quote_name, is_new_quote)
+        self.last_display_refresh_stats = refresh_batch.stats()
+
+    def _display_quote_sections(self, quote_name, is_new_quote):
         # _save_displayed_quote_data() should ideally not be needed here if all changes
         # are immediately captured by commands. If there are pending uncommitted changes
         # (e.g. from a line edit that hasn't lost focus), they should be committed first.
@@ -442,7 +518,7 @@ class XmlReportEditor(QMainWindow):
             return
 
         self.selected_quote_name = quote_name
-        quote_data = self.all_quotes_data[quote_name]
+        quote_data = QuoteModel.of(self.all_quotes_data, quote_name)
 
         self.quote_details_widget.load_data(quote_data.get("name", ""), quote_data.get("price", ""), is_new_quote)
         self.eprice_section_widget.load_data(quote_data.get("e_price", []))
@@ -450,38 +526,56 @@ class XmlReportEditor(QMainWindow):
         self.pe_section_widget.load_data(quote_data.get("pe", []))
         self.eps_growth_chart_widget.load_data(quote_data.get("eps", [])) # Load data into chart
         self.record_report_section_widget.load_data(quote_data.get("record", []))
+        self._bind_section_widgets(quote_data) # Commands now update these sections through the model
         
         self.quote_selection_widget.set_quote_name_input(quote_name)        
         # Load sectors from the quote data in XML.
         self.sectors_section_widget.load_sectors_from_db(quote_name, self.all_quotes_data)
         self._set_displayed_quote_ui_enabled(True)
 
+    def _eps_growth_series_for_chart(self, year_name):
+        """Growth series of the displayed quote's EPS year, from the quote model's cache."""
+        quote_model = QuoteModel.of(self.all_quotes_data, self.selected_quote_name) if self.selected_quote_name else None
+        return quote_model.eps_growth_series(year_name) if quote_model is not None else None
+
     def _save_displayed_quote_data(self):
+        """
+        Commits an edit still pending in a focused section field (e.g. saving with Ctrl+S while typing)
+        through its usual command. Everything else already reached the quote model through commands,
+        which the displayed sections observe, so nothing is read back from the widgets here.
+        """
         if not self.selected_quote_name or self.selected_quote_name not in self.all_quotes_data:
             return 
-        current_quote_data_entry = self.all_quotes_data[self.selected_quote_name]
-        
-        name, price = self.quote_details_widget.get_data()
-        current_quote_data_entry["name"] = name
-        current_quote_data_entry["price"] = price
-        current_quote_data_entry["e_price"] = self.eprice_section_widget.get_data()
-        current_quote_data_entry["eps"] = self.eps_section_widget.get_data()
-        current_quote_data_entry["pe"] = self.pe_section_widget.get_data()
-        # For "record" data, current_quote_data_entry["record"] (which is a reference to
-        # self.all_quotes_data[self.selected_quote_name]["record"]) should already contain
-        # the complete list of records managed by Add/RemoveRecordReportCommands.
-        # The RecordReportSectionWidget.get_data() only returns the displayed subset.
-        # So, we don't overwrite current_quote_data_entry["record"] here.
+        focus_widget = QApplication.focusWidget()
+        if not isinstance(focus_widget, QLineEdit):
+            return
+        for section_widget in (self.quote_details_widget, self.eprice_section_widget, self.pe_section_widget, self.eps_section_widget):
+            if section_widget.isAncestorOf(focus_widget):
+                focus_widget.editingFinished.emit() # The section compares it with its current value
+                return
+        # For "record" and "sectors" data, the Add/Remove/Change commands keep
+        # self.all_quotes_data[self.selected_quote_name] complete; their widgets only show a subset.
 
     def handle_select_quote_button(self, quote_name_to_select): # Parameter from signal
         if not quote_name_to_select:
             QMessageBox.information(self, "Info", "Please enter a quote name to select.")
             return
         if quote_name_to_select == self.selected_quote_name: return
-        if quote_name_to_select in self.all_quotes_data:
+        if quote_name_to_select not in self.all_quotes_data:
+            # Fall back to the search index: only a case/diacritic-insensitive exact name is selected,
+            # fuzzy, sector or price matches are offered as suggestions
+            matches = self.quote_search_index.search(quote_name_to_select, limit=5)
+            exact_key = normalize_search_text(quote_name_to_select)
+            exact_match = next((name for name in matches if normalize_search_text(name) == exact_key), None)
+            if exact_match is not None:
+                quote_name_to_select = exact_match
+                self.quote_selection_widget.set_quote_name_input(quote_name_to_select)
+            else:
+                suggestion = f"\nDid you mean: {', '.join(matches)}?" if matches else ""
+                QMessageBox.warning(self, "Not Found", f"Quote '{quote_name_to_select}' not found. Use 'Add New Quote' to create it.{suggestion}")
+                return
+        if quote_name_to_select != self.selected_quote_name:
             self._display_quote(quote_name_to_select, is_new_quote=False) # Not a new quote, just selecting existing
-        else:
-            QMessageBox.warning(self, "Not Found", f"Quote '{quote_name_to_select}' not found. Use 'Add New Quote' to create it.")
 
     def handle_add_new_quote_button(self, new_quote_name): # Parameter from signal
         if not new_quote_name:
@@ -497,10 +591,10 @@ class XmlReportEditor(QMainWindow):
 
         self._save_displayed_quote_data() 
         
-        quote_data_to_add = {
+        quote_data_to_add = QuoteModel({
             "name": new_quote_name, "price": "",
             "e_price": [], "eps": [], "pe": [], "record": []
-        }
+        })
         
         cmd = AddQuoteCommand(self.all_quotes_data, new_quote_name, quote_data_to_add, self)
         self.execute_command(cmd)
@@ -538,8 +632,8 @@ class XmlReportEditor(QMainWindow):
             QMessageBox.information(self, "Removed", f"The quote '{quote_to_remove}' has been removed.")
 
             # Optionally, display the first remaining quote
-            if self.all_quotes_data:
-                first_remaining_quote = next(iter(self.all_quotes_data))
+            first_remaining_quote = self._first_quote_name()
+            if first_remaining_quote is not None:
                 self._display_quote(first_remaining_quote, is_new_quote=False)
             else:
                 self._set_displayed_quote_ui_enabled(False) # Ensure UI is disabled if no quotes left
@@ -554,6 +648,10 @@ class XmlReportEditor(QMainWindow):
                 self.all_quotes_data["date"] = self._current_root_date_str
 
     def closeEvent(self, event):
+        if self._load_in_progress:
+            self.cancel_open_xml_file()
+        self.file_manager.wait_for_pending_load()
+        self.file_manager.wait_for_pending_save()
         if self.command_manager.can_undo(): # Check if there are unsaved changes by checking the undo stack
             reply = QMessageBox.question(self, "Unsaved Changes",
                                          "There are unsaved changes. Do you want to save before exiting?",
@@ -561,7 +659,8 @@ class XmlReportEditor(QMainWindow):
                                          QMessageBox.StandardButton.Discard | 
                                          QMessageBox.StandardButton.Cancel)
             if reply == QMessageBox.StandardButton.Save:
-                if not self.save_xml_file(): # If save fails (e.g., user cancels Save As)
+                # Always save synchronously here; the window is about to close
+                if not self._perform_save_operation(self.file_manager.save_file): # If save fails (e.g., user cancels Save As)
                     event.ignore()
                     return
             elif reply == QMessageBox.StandardButton.Cancel:
@@ -572,14 +671,130 @@ class XmlReportEditor(QMainWindow):
         super().closeEvent(event)
 
 
-    def open_xml_file(self): # sourcery skip: extract-method
-        file_path, root_date_qdate, all_quotes_data_dict = self.file_manager.open_file()
-        if file_path:
-            self._load_data_into_ui(root_date_qdate, all_quotes_data_dict)
-            self._set_dirty_flag(False) # Freshly loaded file is not dirty
+    def open_xml_file(self):
+        """Opens a file in the background; quotes become available as they are parsed."""
+        if self._load_in_progress:
+            self.statusBar().showMessage("A file is already being loaded.", 3000)
+            return False
+        if self.file_manager.is_save_in_progress():
+            self.statusBar().showMessage("Please wait for the current save to finish.", 3000)
+            return False
+        return self.file_manager.open_file_async()
+
+    def cancel_open_xml_file(self):
+        if not self._load_in_progress:
+            return
+        self.file_manager.cancel_open()
+        # Batches already queued by the worker are ignored from here on
+        self._end_background_load()
+        self._discard_partial_load()
+        self.statusBar().showMessage("Loading cancelled.", 5000)
+
+    def _on_background_load_started(self, file_path):
+        # Keep the open document (and its history) until the new file is known to load
+        self._save_displayed_quote_data()
+        self._document_before_load = {
+            "quotes_data": self.all_quotes_data,
+            "root_date": self._current_root_date_str,
+            "selected_quote_name": self.selected_quote_name,
+            "dirty": self._document_dirty,
+            "history": self.command_manager.take_history(), # Only edits made during the load stay undoable
+        }
+        self.all_quotes_data = {}
+        self.selected_quote_name = None
+        self.clear_all_fields()
+        self.all_quotes_data["date"] = self._current_root_date_str
+        self.quote_filter_widget.all_quotes_data_provider = self.all_quotes_data
+        self._sync_quote_indexes(None)
+        self._load_in_progress = True
+        self._load_modification_count = self._modification_count
+        self.load_progress_bar.setValue(0)
+        self.load_progress_bar.setVisible(True)
+        self.cancel_load_button.setVisible(True)
+        self.statusBar().showMessage(f"Loading {os.path.basename(file_path)}...")
+
+    def _on_background_load_root_date(self, root_date_qdate):
+        if not self._load_in_progress:
+            return
+        # Update the tracked date first so setDate() is not recorded as a user edit
+        self._current_root_date_str = root_date_qdate.toString("MM/dd/yyyy")
+        self.all_quotes_data["date"] = self._current_root_date_str
+        self.root_date_edit.setDate(root_date_qdate)
+
+    def _on_background_load_quotes_batch(self, quotes_batch):
+        if not self._load_in_progress:
+            return
+        new_quote_names = []
+        for quote_data in quotes_batch:
+            quote_name = quote_data["name"]
+            if not isinstance(quote_data, QuoteModel):
+                quote_data = QuoteModel(quote_data)
+            if quote_name in self.all_quotes_data:
+                # Later duplicates win, as with a blocking load
+                self.all_quotes_data[quote_name] = quote_data
+                self._mark_quotes_modified((quote_name,))
+                if quote_name == self.selected_quote_name:
+                    self.selected_quote_name = None # Do not write the stale widgets into the new entry
+                    self._display_quote(quote_name, is_new_quote=False)
+                continue
+            self.all_quotes_data[quote_name] = quote_data
+            new_quote_names.append(quote_name)
+        self._sync_quote_indexes(new_quote_names)
+        if self.selected_quote_name is None and new_quote_names:
+            self._display_quote(new_quote_names[0], is_new_quote=False) # Editable before the rest arrives
+
+    def _on_background_load_progress(self, percent):
+        if self._load_in_progress:
+            self.load_progress_bar.setValue(percent)
+
+    def _on_background_load_finished(self, file_path):
+        if not self._load_in_progress:
+            return
+        edited_while_loading = self._modification_count != self._load_modification_count
+        self._end_background_load()
+        self._document_before_load = None
+        # Edits made while loading stay undoable and keep the document dirty
+        if not edited_while_loading:
             self.command_manager.clear_stacks()
-            self.quote_filter_widget.all_quotes_data_provider = all_quotes_data_dict
-            self.quote_filter_widget._on_sector_changed(None) # Refresh sectors in the filter widget
+            self._set_dirty_flag(False) # Freshly loaded file is not dirty
+        else:
+            self._set_dirty_flag(True)
+        self.statusBar().showMessage(f"Loaded {os.path.basename(file_path)}", 5000)
+
+    def _on_background_load_failed(self, file_path, error_message):
+        if not self._load_in_progress:
+            return
+        self._end_background_load()
+        self._discard_partial_load()
+        self.statusBar().showMessage(f"Loading {os.path.basename(file_path)} failed", 5000)
+
+    def _end_background_load(self):
+        self._load_in_progress = False
+        self._load_modification_count = None
+        self.load_progress_bar.setVisible(False)
+        self.cancel_load_button.setVisible(False)
+
+    def _discard_partial_load(self):
+        """Drops the partially loaded data and puts back the document that was open before the load."""
+        previous_document, self._document_before_load = self._document_before_load, None
+        self.selected_quote_name = None # The displayed quote belongs to the discarded data
+        self.clear_all_fields()
+        if previous_document is None:
+            self._set_dirty_flag(False)
+            return
+        self.all_quotes_data = previous_document["quotes_data"]
+        self.quote_filter_widget.all_quotes_data_provider = self.all_quotes_data
+        self._sync_quote_indexes(None)
+        # Update the tracked date first so setDate() is not recorded as a user edit
+        self._current_root_date_str = previous_document["root_date"]
+        self.root_date_edit.setDate(QDate.fromString(self._current_root_date_str, "MM/dd/yyyy"))
+        quote_to_display = previous_document["selected_quote_name"]
+        if quote_to_display not in self.all_quotes_data:
+            quote_to_display = self._first_quote_name()
+        if quote_to_display is not None:
+            self._display_quote(quote_to_display, is_new_quote=False)
+        self.command_manager.restore_history(previous_document["history"])
+        self._set_dirty_flag(previous_document["dirty"])
 
     def _load_data_into_ui(self, root_date_qdate, all_quotes_data_dict):
         """Helper to load parsed data into the UI elements."""
@@ -591,11 +806,13 @@ class XmlReportEditor(QMainWindow):
         # Ensure global date is in all_quotes_data if not present from XML
         if "date" not in self.all_quotes_data:
             self.all_quotes_data["date"] = self._current_root_date_str
+        for quote_name, quote_data in self.all_quotes_data.items():
+            if quote_name != "date" and not isinstance(quote_data, QuoteModel):
+                self.all_quotes_data[quote_name] = QuoteModel(quote_data)
+        self.quote_filter_widget.all_quotes_data_provider = self.all_quotes_data
+        self._sync_quote_indexes(None)
 
-        first_quote_name_loaded = None
-        if self.all_quotes_data:
-            first_quote_name_loaded = next(iter(self.all_quotes_data), None) 
-        
+        first_quote_name_loaded = self._first_quote_name()
         if first_quote_name_loaded:
             self._display_quote(first_quote_name_loaded, is_new_quote=False) # Display the first quote
         else: 
@@ -633,6 +850,28 @@ class XmlReportEditor(QMainWindow):
                 
         return xml_output_data
     
+    def collect_xml_fragments_for_save(self):
+        """
+        Incremental counterpart of collect_data_for_xml: returns {"date", "quote_fragments"}, where
+        only quotes changed since the last save are re-serialized and the rest come from the cache.
+        """
+        self._save_displayed_quote_data()
+        quotes_in_order = []
+        for quote_name, quote_data in self.all_quotes_data.items():
+            if quote_name == "date":
+                continue
+            if not isinstance(quote_data, dict):
+                print(f"Warning: Skipping unexpected data type for key '{quote_name}' in collect_xml_fragments_for_save. Found type: {type(quote_data)}")
+                continue
+            if not quote_data.get("name"):
+                quote_data["name"] = quote_name # Ensure consistency
+                self._mark_quotes_modified((quote_name,))
+            quotes_in_order.append((quote_name, quote_data))
+        return {
+            "date": self.root_date_edit.date().toString("MM/dd/yyyy"),
+            "quote_fragments": self.quote_fragment_cache.fragments_for(quotes_in_order),
+        }
+
     def _perform_save_operation(self, save_function_callable):
         """
         Helper method to perform a save operation (save or save as)
@@ -642,22 +881,70 @@ class XmlReportEditor(QMainWindow):
         Returns:
             bool: True if save was successful, False otherwise.
         """
-        if save_function_callable(self.collect_data_for_xml):
+        if save_function_callable(self.collect_xml_fragments_for_save):
             self.command_manager.clear_stacks() # Consider saved state as clean for undo
             self._set_dirty_flag(False)
             return True
         return False # Return False if save_function_callable failed
 
     def save_xml_file(self):
+        if self._load_in_progress:
+            self.statusBar().showMessage("Please wait for the file to finish loading.", 3000)
+            return False
+        if self.background_save_action.isChecked():
+            return self._perform_background_save_operation(self.file_manager.save_file_async)
         return self._perform_save_operation(self.file_manager.save_file)
 
     def save_xml_file_as(self):
+        if self._load_in_progress:
+            self.statusBar().showMessage("Please wait for the file to finish loading.", 3000)
+            return False
+        if self.background_save_action.isChecked():
+            return self._perform_background_save_operation(self.file_manager.save_file_as_async)
         return self._perform_save_operation(self.file_manager.save_file_as)
 
+    def _perform_background_save_operation(self, save_function_callable):
+        """
+        Starts a background save. The data model is snapshotted here on the GUI thread;
+        the UI stays editable while the worker builds and writes the XML.
+        Returns:
+            bool: True if the background save was started, False otherwise.
+        """
+        if self.file_manager.is_save_in_progress():
+            self.statusBar().showMessage("A save is already in progress.", 3000)
+            return False
+        modification_count_at_snapshot = self._modification_count
+        if not save_function_callable(self.collect_xml_fragments_for_save):
+            return False
+        self._background_save_modification_count = modification_count_at_snapshot
+        self.statusBar().showMessage("Saving in background...")
+        return True
+
+    def _on_background_save_finished(self, file_path):
+        self.statusBar().showMessage(f"XML saved to {file_path}", 5000)
+        # Only mark clean if nothing was edited while the worker was writing the snapshot
+        if self._modification_count == self._background_save_modification_count:
+            self.command_manager.clear_stacks() # Consider saved state as clean for undo
+            self._set_dirty_flag(False)
+        else:
+            self._set_dirty_flag(True)
+        self._background_save_modification_count = None
+
+    def _on_background_save_failed(self, file_path, error_message):
+        self.statusBar().showMessage(f"Saving {file_path} failed", 5000)
+        self._background_save_modification_count = None
+
     def undo(self):
         command = self.command_manager.undo()
         if not command:
             return
+        self._update_ui_after_undo(command)
+
+    def _update_ui_after_undo(self, command):
+        if isinstance(command, MacroCommand):
+            for sub_command in reversed(command.commands): # Sub-commands were unexecuted in reverse
+                self._update_ui_after_undo(sub_command)
+            return
 
         # CommandManager has already called command.unexecute() and updated stacks/dirty flag/log.
         # Now, handle editor-specific UI updates based on the command type.
@@ -670,23 +957,14 @@ class XmlReportEditor(QMainWindow):
         # For quote name changes, the command itself handles the key change in all_quotes_data.
         # We now need to update the editor's selected_quote_name if it was affected.
         if isinstance(command, ChangeQuoteDetailCommand):
-            # command.unexecute() already called quote_details_widget.update_field_value
+            # The details widget followed the model's name change
             if command.field_name == "name":
                 # If the selected quote was the one whose name was 'command.new_value' (before unexecute),
                 # it means its name has now been reverted to 'command.old_value'.
                 if self.selected_quote_name == command.new_value:
                     self.selected_quote_name = command.old_value
                     self.quote_selection_widget.set_quote_name_input(command.old_value)
-        elif isinstance(command, ChangeEPriceValueCommand):
-            # Ensure the EPriceSectionWidget's internal state and UI are correct
-            command.eprice_section_widget.update_company_value(command.company_name, command.old_value, from_command=True)
-        elif isinstance(command, ChangePEValueCommand):
-            # Ensure the PESectionWidget's internal state and UI are correct
-            command.pe_section_widget.update_company_value(command.company_name, command.old_value, from_command=True)
-        elif isinstance(command, ChangeEPSValueCommand):
-            command.eps_section_widget.update_company_eps_field(
-                command.year_name, command.company_name, command.field_name, command.old_value, from_command=True
-            )
+        # E-Price, PE and EPS values: the displayed sections observe the quote model that unexecute() reverted
         elif isinstance(command, AddQuoteCommand):
             # Quote was removed by unexecute. If it was the selected one, clear UI.
             if self.selected_quote_name == command.quote_name:
@@ -694,8 +972,9 @@ class XmlReportEditor(QMainWindow):
                 self._clear_displayed_quote_ui()
                 self.quote_selection_widget.clear_input()
                 self._set_displayed_quote_ui_enabled(False)
-                if self.all_quotes_data: # Optionally, select another quote
-                    self._display_quote(next(iter(self.all_quotes_data)), is_new_quote=False)
+                first_remaining_quote = self._first_quote_name() # Optionally, select another quote
+                if first_remaining_quote is not None:
+                    self._display_quote(first_remaining_quote, is_new_quote=False)
         elif isinstance(command, RemoveQuoteCommand):
             # Quote was re-added by unexecute. Display it.
             self._display_quote(command.quote_name_to_remove, is_new_quote=False) # is_new_quote=False as it's restored
@@ -707,10 +986,10 @@ class XmlReportEditor(QMainWindow):
             # Command's unexecute handles data model and UI
             pass
         elif isinstance(command, AddRecordReportCommand):
-            # Command's unexecute handles data model and UI removal
+            # Command's unexecute removes the report from the model and calls remove_report on the record_widget
             pass
         elif isinstance(command, RemoveRecordReportCommand): # Undo a remove = re-add
-            # Command's unexecute calls load_data on the record_widget, so UI is updated.
+            # Command's unexecute calls insert_report on the record_widget, so only that row is re-created.
             pass
         elif isinstance(command, ChangeRecordReportDetailCommand):
             # Command's unexecute calls update_report_entry_detail on the widget
@@ -727,10 +1006,17 @@ class XmlReportEditor(QMainWindow):
             pass
         # _update_undo_redo_actions_state, _log_history, _set_dirty_flag already called by command_manager
 
-    def redo(self): # sourcery skip: extract-method
+    def redo(self):
         command = self.command_manager.redo()
         if not command:
             return
+        self._update_ui_after_redo(command)
+
+    def _update_ui_after_redo(self, command): # sourcery skip: extract-method
+        if isinstance(command, MacroCommand):
+            for sub_command in command.commands:
+                self._update_ui_after_redo(sub_command)
+            return
         
         # CommandManager has already called command.execute() and updated stacks/dirty flag/log.
         # Now, handle editor-specific UI updates based on the command type.
@@ -739,23 +1025,14 @@ class XmlReportEditor(QMainWindow):
         if isinstance(command, ChangeRootDateCommand):
             self._current_root_date_str = command.new_date_qdate.toString("MM/dd/yyyy")
         if isinstance(command, ChangeQuoteDetailCommand):
-            # command.execute() already called quote_details_widget.update_field_value
+            # The details widget followed the model's name change
             if command.field_name == "name":
                 # If the selected quote was the one whose name was 'command.old_value' (before execute),
                 # it means its name has now been changed to 'command.new_value'.
                 if self.selected_quote_name == command.old_value:
                     self.selected_quote_name = command.new_value
                     self.quote_selection_widget.set_quote_name_input(command.new_value)
-        elif isinstance(command, ChangeEPriceValueCommand):
-            # Ensure the EPriceSectionWidget's internal state and UI are correct
-            command.eprice_section_widget.update_company_value(command.company_name, command.new_value, from_command=True)
-        elif isinstance(command, ChangePEValueCommand):
-            # Ensure the PESectionWidget's internal state and UI are correct
-            command.pe_section_widget.update_company_value(command.company_name, command.new_value, from_command=True)
-        elif isinstance(command, ChangeEPSValueCommand):
-            command.eps_section_widget.update_company_eps_field(
-                command.year_name, command.company_name, command.field_name, command.new_value, from_command=True
-            )
+        # E-Price, PE and EPS values: the displayed sections observe the quote model that execute() updated
         elif isinstance(command, AddQuoteCommand):
             # Quote was re-added by execute. Display it.
             self._display_quote(command.quote_name, is_new_quote=True) # is_new_quote=True as it's newly added by redo
@@ -766,8 +1043,9 @@ class XmlReportEditor(QMainWindow):
                 self._clear_displayed_quote_ui()
                 self.quote_selection_widget.clear_input()
                 self._set_displayed_quote_ui_enabled(False)
-                if self.all_quotes_data: # Optionally, select another quote
-                    self._display_quote(next(iter(self.all_quotes_data)), is_new_quote=False)
+                first_remaining_quote = self._first_quote_name() # Optionally, select another quote
+                if first_remaining_quote is not None:
+                    self._display_quote(first_remaining_quote, is_new_quote=False)
         
         elif isinstance(command, AddEPSYearCommand): # Redo an add
             # Command's execute handles data model and UI
@@ -776,10 +1054,10 @@ class XmlReportEditor(QMainWindow):
             # Command's execute handles data model and UI
             pass
         elif isinstance(command, AddRecordReportCommand):
-            # Command's execute calls load_data on the record_widget, so UI is updated.
+            # Command's execute calls insert_report on the record_widget, so only that row is created.
             pass
         elif isinstance(command, RemoveRecordReportCommand):
-            # Command's execute handles data model and UI removal.
+            # Command's execute removes the report from the model and calls remove_report on the record_widget
             pass # UI is handled by command
         elif isinstance(command, ChangeRecordReportDetailCommand):
             # Command's execute calls update_report_entry_detail on the widget